@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 import uvicorn
@@ -6,10 +7,49 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from core.config.app import AppSettings
 from core.container import Container
+from infra.concurrency.static_analysis import warm_up_process_pool
+from presentation.api.metrics import (
+    record_request_time,
+    register_service_stats,
+)
+from presentation.api.metrics import router as metrics_router
 from presentation.api.router import setup_routes
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container: Container | None = getattr(app.state, "container", None)
+    if container is not None:
+        register_service_stats(container)
+        if not container.llm_service().is_direct:
+            container.agent_runtime().build()
+        batch_settings = container.batch_settings()
+        if batch_settings.warm_up:
+            warm_up_process_pool(
+                container.batch_process_pool(), batch_settings.process_workers
+            )
+        if container.analyzer_settings().executor_mode == "process":
+            container.process_code_analyzer().warm_up()
+        container.review_job_workers().start()
+    yield
+    if container is not None:
+        await container.review_job_workers().stop()
+        container.job_store().close()
+        container.analysis_executor().shutdown()
+        container.batch_process_pool().shutdown(wait=False, cancel_futures=True)
+        if container.analyzer_settings().executor_mode == "process":
+            container.process_code_analyzer().close()
+        if container.analyzer_settings().style_backend == "pool":
+            container.style_worker_pool().close()
+        await container.webhook_http_client().aclose()
+        await container.http_client_pool().aclose()
+
+
 app = FastAPI(
-    title="AI Code Reviewer", description="API для ревью Python кода", version="1.0.0"
+    title="AI Code Reviewer",
+    description="API для ревью Python кода",
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -19,6 +59,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.middleware("http")(record_request_time)
 
 router = setup_routes()
 
@@ -35,11 +76,15 @@ async def root():
 
 
 app.include_router(router=router)
+app.include_router(router=metrics_router)
 
 
 if __name__ == "__main__":
     container = Container()
-    container.wire(modules=["presentation.api.v1.code_review"])
+    container.wire(
+        modules=["presentation.api.v1.code_review", "presentation.api.metrics"]
+    )
+    app.state.container = container
     app_settings = AppSettings()
     uvicorn.run(
         app=app,
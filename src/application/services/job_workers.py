@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Set
+
+from application.use_cases.review_code import (
+    FullReviewCodeCommand,
+    FullReviewCodeUseCase,
+)
+from core.interfaces.job_store import IJobStore
+from domain.entities.review_job import ReviewJob
+from infra.concurrency.llm_scheduler import AdmissionRejected
+from infra.jobs.webhook import WebhookNotifier
+
+logger = logging.getLogger(__name__)
+
+
+class ReviewJobWorkers:
+    """Пул воркеров, забирающих задачи ревью из очереди"""
+
+    def __init__(
+        self,
+        job_store: IJobStore,
+        review_code_use_case: FullReviewCodeUseCase,
+        notifier: WebhookNotifier,
+        workers: int = 2,
+        poll_interval_seconds: float = 1.0,
+        max_attempts: int = 3,
+        retry_backoff_seconds: float = 5.0,
+        lease_seconds: float = 60.0,
+    ):
+        self._job_store = job_store
+        self._review_code_use_case = review_code_use_case
+        self._notifier = notifier
+        self._workers = workers
+        self._poll_interval_seconds = poll_interval_seconds
+        self._max_attempts = max_attempts
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self._lease_seconds = lease_seconds
+        self._tasks: List[asyncio.Task] = []
+        self._notifications: Set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._busy = 0
+        self._processed = 0
+        self._failed = 0
+        self._deferred = 0
+
+    def start(self) -> None:
+        """Возвращает в очередь задачи упавших воркеров и запускает своих"""
+        if self._tasks or self._workers <= 0:
+            return
+        recovered = self._job_store.recover()
+        if recovered:
+            logger.info("Возвращено в очередь прерванных задач: %d", recovered)
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self._workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def wake(self) -> None:
+        """Будит воркеров сразу после постановки задачи"""
+        self._wakeup.set()
+
+    def notify_later(self, job: ReviewJob, urls: List[str]) -> None:
+        """Отправляет результат уже завершенной задачи, не задерживая ответ"""
+        task = asyncio.create_task(self._notify(job, urls))
+        self._notifications.add(task)
+        task.add_done_callback(self._notifications.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._tasks),
+            "busy": self._busy,
+            "processed": self._processed,
+            "failed": self._failed,
+            "deferred": self._deferred,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            job = await asyncio.to_thread(self._job_store.claim)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self._poll_interval_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._busy += 1
+            heartbeat = asyncio.create_task(self._heartbeat(job.id))
+            try:
+                await self._process(job)
+            except Exception:
+                logger.exception("Воркер не смог обработать задачу %s", job.id)
+            finally:
+                heartbeat.cancel()
+                self._busy -= 1
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Продлевает аренду, пока задача выполняется"""
+        while True:
+            await asyncio.sleep(self._lease_seconds / 3)
+            if not await asyncio.to_thread(self._job_store.renew, job_id):
+                logger.warning("Аренда задачи %s перешла другому воркеру", job_id)
+                return
+
+    async def _process(self, job: ReviewJob) -> None:
+        try:
+            result = await self._review_code_use_case.review(
+                FullReviewCodeCommand(code=job.code)
+            )
+        except AdmissionRejected as e:
+            # Перегрузка не ошибка задачи: она подождет своей очереди
+            self._deferred += 1
+            await asyncio.to_thread(self._job_store.defer, job.id, e.retry_after)
+            return
+        except Exception as e:
+            if job.attempts < self._max_attempts:
+                logger.warning("Задача %s, попытка %d: %s", job.id, job.attempts, e)
+                await asyncio.to_thread(
+                    self._job_store.retry_later,
+                    job.id,
+                    self._retry_backoff_seconds * 2 ** (job.attempts - 1),
+                )
+                return
+            self._failed += 1
+            owned = await asyncio.to_thread(
+                self._job_store.fail, job.id, f"{type(e).__name__}: {e}"
+            )
+        else:
+            self._processed += 1
+            owned = await asyncio.to_thread(self._job_store.complete, job.id, result)
+
+        if not owned:
+            # Клиентов оповестит воркер, которому перешла задача
+            return
+        finished = await asyncio.to_thread(self._job_store.get, job.id)
+        if finished is not None:
+            await self._notify(finished, finished.callback_urls)
+
+    async def _notify(self, job: ReviewJob, urls: List[str]) -> None:
+        payload = job.model_dump(mode="json")
+        await asyncio.gather(*(self._notifier.notify(url, payload) for url in urls))
@@ -0,0 +1,55 @@
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+def flight_key(operation: str, *parts: str) -> str:
+    """Ключ запроса: операция плюс хеш входных данных"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return f"{operation}:{digest.hexdigest()}"
+
+
+class SingleFlight:
+    """Объединяет одновременные одинаковые запросы в одно вычисление"""
+
+    def __init__(self, enabled: bool = True):
+        self._enabled = enabled
+        self._flights: Dict[str, asyncio.Future] = {}
+        self._leaders = 0
+        self._joined = 0
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Ждет уже идущее вычисление с тем же ключом или запускает новое"""
+        if not self._enabled:
+            return await factory()
+
+        flight = self._flights.get(key)
+        if flight is None:
+            self._leaders += 1
+            flight = asyncio.ensure_future(factory())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self._joined += 1
+        # Отмена одного ожидающего не должна прерывать вычисление для остальных
+        return await asyncio.shield(flight)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self._enabled,
+            "in_flight": len(self._flights),
+            "leaders": self._leaders,
+            "joined": self._joined,
+        }
+
+    def _finish(self, key: str, flight: asyncio.Future) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # Помечаем ошибку прочитанной, даже если все ожидающие ушли
+            flight.exception()
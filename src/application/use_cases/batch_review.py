@@ -0,0 +1,177 @@
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import AsyncIterator, List, Optional
+
+from pydantic import BaseModel, Field
+
+from core.config.batch import BatchSettings
+from core.interfaces.llm_service import ILLMService
+from domain.entities.code_review import (
+    AnalysisMode,
+    FullReviewResult,
+    Improvement,
+    Issue,
+)
+from domain.entities.review_stream import ReviewStreamEvent, ReviewStreamEventType
+from infra.concurrency.static_analysis import run_full_review
+
+
+class BatchFile(BaseModel):
+    path: str
+    code: str
+
+
+class BatchReviewCommand(BaseModel):
+    files: List[BatchFile]
+    mode: AnalysisMode = AnalysisMode.STATIC
+    llm_concurrency: Optional[int] = None
+
+
+class FileReviewResult(BaseModel):
+    index: int
+    path: str
+    score: Optional[int] = None
+    status: Optional[str] = None
+    critical_issues_count: int = 0
+    issues: List[Issue] = Field(default_factory=list)
+    improvements: List[Improvement] = Field(default_factory=list)
+    answer: Optional[str] = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+
+class BatchReviewSummary(BaseModel):
+    files: int
+    failed: int
+    total_issues: int
+    critical_issues: int
+    average_score: Optional[float]
+    elapsed_ms: float
+
+
+class BatchReviewResult(BaseModel):
+    files: List[FileReviewResult]
+    summary: BatchReviewSummary
+
+
+class BatchReviewUseCase:
+    """Пакетное ревью файлов
+
+    Use case — синглтон контейнера, поэтому settings.llm_concurrency
+    ограничивает вызовы LLM всех пакетов процесса вместе;
+    llm_concurrency команды лишь сужает долю одного пакета.
+    """
+
+    def __init__(
+        self,
+        llm_service: ILLMService,
+        process_pool: Executor,
+        settings: BatchSettings,
+    ):
+        self._llm_service = llm_service
+        self._process_pool = process_pool
+        self._settings = settings
+        self._llm_slots = asyncio.Semaphore(settings.llm_concurrency)
+
+    async def execute(self, command: BatchReviewCommand) -> BatchReviewResult:
+        started = time.perf_counter()
+        results = [result async for result in self.stream(command)]
+        results.sort(key=lambda r: r.index)
+        return BatchReviewResult(
+            files=results, summary=self.summarize(results, started)
+        )
+
+    async def stream(
+        self, command: BatchReviewCommand
+    ) -> AsyncIterator[FileReviewResult]:
+        """Отдает результаты файлов по мере готовности"""
+        if len(command.files) > self._settings.max_files:
+            raise ValueError(
+                f"Слишком много файлов: {len(command.files)} "
+                f"(максимум {self._settings.max_files})"
+            )
+
+        semaphore = asyncio.Semaphore(
+            command.llm_concurrency or self._settings.llm_concurrency
+        )
+        tasks = [
+            asyncio.create_task(self._review_file(index, file, command.mode, semaphore))
+            for index, file in enumerate(command.files)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream_events(
+        self, command: BatchReviewCommand
+    ) -> AsyncIterator[ReviewStreamEvent]:
+        started = time.perf_counter()
+        results: List[FileReviewResult] = []
+        try:
+            async for result in self.stream(command):
+                results.append(result)
+                yield ReviewStreamEvent(
+                    event=ReviewStreamEventType.FILE,
+                    data=result.model_dump(mode="json"),
+                )
+        except Exception as e:
+            yield ReviewStreamEvent(
+                event=ReviewStreamEventType.ERROR,
+                data={"error": f"Ошибка пакетного ревью: {str(e)}"},
+            )
+            return
+
+        yield ReviewStreamEvent(
+            event=ReviewStreamEventType.SUMMARY,
+            data=self.summarize(results, started).model_dump(mode="json"),
+        )
+
+    @staticmethod
+    def summarize(
+        results: List[FileReviewResult], started: float
+    ) -> BatchReviewSummary:
+        scores = [r.score for r in results if r.score is not None]
+        return BatchReviewSummary(
+            files=len(results),
+            failed=sum(1 for r in results if r.error),
+            total_issues=sum(len(r.issues) for r in results),
+            critical_issues=sum(r.critical_issues_count for r in results),
+            average_score=round(sum(scores) / len(scores), 2) if scores else None,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+
+    async def _review_file(
+        self,
+        index: int,
+        file: BatchFile,
+        mode: AnalysisMode,
+        semaphore: asyncio.Semaphore,
+    ) -> FileReviewResult:
+        started = time.perf_counter()
+        result = FileReviewResult(index=index, path=file.path)
+        try:
+            loop = asyncio.get_running_loop()
+            raw = await loop.run_in_executor(
+                self._process_pool, run_full_review, file.code
+            )
+            review = FullReviewResult.model_validate(raw)
+            result.score = review.score
+            result.status = review.status
+            result.critical_issues_count = review.critical_issues_count
+            result.issues = review.issues
+            result.improvements = review.improvements
+
+            if mode == AnalysisMode.LLM:
+                async with semaphore, self._llm_slots:
+                    result.answer = await self._llm_service.afull_code_review_response(
+                        file.code
+                    )
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+
+        result.elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        return result
@@ -1,18 +1,55 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
+from application.services.single_flight import SingleFlight, flight_key
+from domain.entities.code_review import AnalysisMode
+from domain.entities.version_delta import VersionDelta
 from domain.services.llm_service import LLMService
+from domain.services.version_comparator import VersionComparator
+from infra.concurrency.analysis_executor import AnalysisExecutor
 
 
 class CompareVersionsCommand(BaseModel):
     original_code: str
     improved_code: str
+    mode: AnalysisMode = AnalysisMode.LLM
+
+
+class CompareVersionsResult(BaseModel):
+    delta: VersionDelta
+    comparison: Optional[str] = None
 
 
 class CompareVersionsUseCase:
-    def __init__(self, llm_service: LLMService):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        version_comparator: VersionComparator,
+        analysis_executor: AnalysisExecutor,
+        single_flight: Optional[SingleFlight] = None,
+    ):
         self._llm_service = llm_service
+        self._version_comparator = version_comparator
+        self._analysis_executor = analysis_executor
+        self._single_flight = single_flight or SingleFlight()
+
+    async def execute(self, command: CompareVersionsCommand) -> CompareVersionsResult:
+        """Сначала дельта статического анализа, затем при необходимости LLM"""
+        original, improved = command.original_code, command.improved_code
+        delta = await self._single_flight.run(
+            flight_key("compare_static", original, improved),
+            lambda: self._analysis_executor.run(
+                self._version_comparator.compare, original, improved
+            ),
+        )
+        if command.mode == AnalysisMode.STATIC:
+            return CompareVersionsResult(delta=delta)
 
-    def execute(self, command: CompareVersionsCommand) -> str:
-        return self._llm_service.compare_versions_response(
-            original=command.original_code, improved=command.improved_code
+        comparison = await self._single_flight.run(
+            flight_key("compare_versions", original, improved),
+            lambda: self._llm_service.acompare_versions_response(
+                original=original, improved=improved
+            ),
         )
+        return CompareVersionsResult(delta=delta, comparison=comparison)
@@ -1,5 +1,8 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
+from application.services.single_flight import SingleFlight, flight_key
 from domain.services.llm_service import LLMService
 
 
@@ -9,10 +12,16 @@ class ExplainIssueCommand(BaseModel):
 
 
 class ExplainIssueUseCase:
-    def __init__(self, llm_service: LLMService):
+    def __init__(
+        self, llm_service: LLMService, single_flight: Optional[SingleFlight] = None
+    ):
         self._llm_service = llm_service
+        self._single_flight = single_flight or SingleFlight()
 
-    def execute(self, command: ExplainIssueCommand) -> str:
-        return self._llm_service.explain_issue_response(
-            code=command.code, issue=command.issue_description
+    async def execute(self, command: ExplainIssueCommand) -> str:
+        return await self._single_flight.run(
+            flight_key("explain_issue", command.code, command.issue_description),
+            lambda: self._llm_service.aexplain_issue_response(
+                code=command.code, issue=command.issue_description
+            ),
         )
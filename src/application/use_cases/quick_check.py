@@ -1,15 +1,78 @@
+import logging
+import time
+from typing import Optional, Union
+
 from pydantic import BaseModel
 
+from application.services.single_flight import SingleFlight, flight_key
+from core.config.quick_check import QuickCheckSettings
+from domain.entities.code_review import AnalysisMode, QuickCheckResult
 from domain.services.llm_service import LLMService
+from infra.concurrency.analysis_executor import AnalysisExecutor
+from infra.langchain.tools.quick_check_code import QuickCheckCodeTool
+
+logger = logging.getLogger(__name__)
 
 
 class QuickCheckCommand(BaseModel):
     code: str
+    mode: Optional[AnalysisMode] = None
+
+
+class StaticQuickCheckResult(BaseModel):
+    result: QuickCheckResult
+    elapsed_ms: float
+    slo_ms: float
+    within_slo: bool
 
 
 class QuickCheckUseCase:
-    def __init__(self, llm_service: LLMService):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        quick_check_code_tool: QuickCheckCodeTool,
+        analysis_executor: AnalysisExecutor,
+        settings: QuickCheckSettings,
+        single_flight: Optional[SingleFlight] = None,
+    ):
         self._llm_service = llm_service
+        self._quick_check_code_tool = quick_check_code_tool
+        self._analysis_executor = analysis_executor
+        self._settings = settings
+        self._single_flight = single_flight or SingleFlight()
+
+    async def execute(
+        self, command: QuickCheckCommand
+    ) -> Union[str, StaticQuickCheckResult]:
+        mode = command.mode or self._settings.mode
+        if mode == AnalysisMode.STATIC:
+            return await self._single_flight.run(
+                flight_key("quick_check_static", command.code),
+                lambda: self._execute_static(command.code),
+            )
+        return await self._single_flight.run(
+            flight_key("quick_check", command.code),
+            lambda: self._llm_service.aquick_check_response(code=command.code),
+        )
+
+    async def _execute_static(self, code: str) -> StaticQuickCheckResult:
+        """Проверка без LLM: только статический анализ"""
+        started = time.perf_counter()
+        result = await self._analysis_executor.run(
+            self._quick_check_code_tool.analyze, code
+        )
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
 
-    def execute(self, command: QuickCheckCommand) -> str:
-        return self._llm_service.quick_check_response(code=command.code)
+        within_slo = elapsed_ms <= self._settings.static_slo_ms
+        if not within_slo:
+            logger.warning(
+                "Статическая быстрая проверка заняла %.1f мс (SLO %.1f мс)",
+                elapsed_ms,
+                self._settings.static_slo_ms,
+            )
+        return StaticQuickCheckResult(
+            result=result,
+            elapsed_ms=elapsed_ms,
+            slo_ms=self._settings.static_slo_ms,
+            within_slo=within_slo,
+        )
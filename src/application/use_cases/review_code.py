@@ -1,5 +1,8 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
+from application.services.single_flight import SingleFlight, flight_key
 from core.interfaces.llm_service import ILLMService
 
 
@@ -8,8 +11,21 @@ class FullReviewCodeCommand(BaseModel):
 
 
 class FullReviewCodeUseCase:
-    def __init__(self, llm_service: ILLMService):
+    def __init__(
+        self, llm_service: ILLMService, single_flight: Optional[SingleFlight] = None
+    ):
         self._llm_service = llm_service
+        self._single_flight = single_flight or SingleFlight()
+
+    async def execute(self, command: FullReviewCodeCommand) -> str:
+        return await self._single_flight.run(
+            flight_key("full_review", command.code),
+            lambda: self._llm_service.afull_code_review_response(code=command.code),
+        )
 
-    def execute(self, command: FullReviewCodeCommand) -> str:
-        return self._llm_service.full_code_review_response(code=command.code)
+    async def review(self, command: FullReviewCodeCommand) -> str:
+        """Как execute, но сбой LLM поднимается исключением, а не текстом ответа"""
+        return await self._single_flight.run(
+            flight_key("full_review_strict", command.code),
+            lambda: self._llm_service.afull_code_review(code=command.code),
+        )
@@ -0,0 +1,101 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from application.services.single_flight import SingleFlight, flight_key
+from core.config.diff_review import DiffReviewSettings
+from core.interfaces.code_analyzer import ICodeAnalyzer
+from core.interfaces.llm_service import ILLMService
+from domain.entities.code_review import AnalysisMode, Issue
+from domain.services.diff_scope import build_excerpt, issues_in_scope
+from domain.services.scoring import calculate_score, determine_status
+from domain.services.unified_diff import apply_patch
+from infra.concurrency.analysis_executor import AnalysisExecutor
+
+
+class DiffReviewCommand(BaseModel):
+    diff: str
+    base_code: str = ""
+    mode: AnalysisMode = AnalysisMode.LLM
+
+
+class DiffReviewResult(BaseModel):
+    path: Optional[str] = None
+    issues: List[Issue]
+    changed_lines: List[int]
+    total_lines: int
+    score: int
+    status: str
+    excerpt: str
+    answer: Optional[str] = None
+
+
+class DiffReviewUseCase:
+    def __init__(
+        self,
+        llm_service: ILLMService,
+        code_analyzer: ICodeAnalyzer,
+        analysis_executor: AnalysisExecutor,
+        settings: DiffReviewSettings,
+        single_flight: Optional[SingleFlight] = None,
+    ):
+        self._llm_service = llm_service
+        self._code_analyzer = code_analyzer
+        self._analysis_executor = analysis_executor
+        self._settings = settings
+        self._single_flight = single_flight or SingleFlight()
+
+    async def execute(self, command: DiffReviewCommand) -> DiffReviewResult:
+        if len(command.diff.encode("utf-8")) > self._settings.max_diff_bytes:
+            raise ValueError(f"Diff больше {self._settings.max_diff_bytes} байт")
+
+        return await self._single_flight.run(
+            flight_key(
+                f"diff_review_{command.mode.value}", command.base_code, command.diff
+            ),
+            lambda: self._review(command),
+        )
+
+    async def _review(self, command: DiffReviewCommand) -> DiffReviewResult:
+        result = await self._analysis_executor.run(
+            self.analyze, command.base_code, command.diff
+        )
+        if command.mode == AnalysisMode.LLM and result.changed_lines:
+            result.answer = await self._llm_service.areview_diff_response(
+                excerpt=result.excerpt, findings=self._findings_text(result.issues)
+            )
+        return result
+
+    def analyze(self, base_code: str, diff: str) -> DiffReviewResult:
+        """Применяет diff в памяти и оставляет проблемы изменённых строк"""
+        patched = apply_patch(base_code, diff)
+        source = self._code_analyzer.parse(patched.code)
+
+        issues: List[Issue] = []
+        issues.extend(self._code_analyzer.analyze_syntax(source))
+        issues.extend(self._code_analyzer.check_style(source))
+        issues.extend(self._code_analyzer.detect_smells(source))
+        scoped = issues_in_scope(source, issues, patched.changed_lines)
+
+        score = calculate_score(scoped)
+        return DiffReviewResult(
+            path=patched.path,
+            issues=scoped,
+            changed_lines=sorted(patched.changed_lines),
+            total_lines=source.line_count,
+            score=score,
+            status=determine_status(score, scoped),
+            excerpt=build_excerpt(
+                source, patched.changed_lines, self._settings.context_lines
+            ),
+        )
+
+    @staticmethod
+    def _findings_text(issues: List[Issue]) -> str:
+        if not issues:
+            return "Проблем в изменённых строках не найдено."
+        return "\n".join(
+            f"- строка {issue.line_number}: [{issue.severity.value}] "
+            f"{issue.description}"
+            for issue in issues
+        )
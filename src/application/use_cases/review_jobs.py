@@ -0,0 +1,48 @@
+import asyncio
+from typing import Optional
+
+from pydantic import BaseModel
+
+from application.services.job_workers import ReviewJobWorkers
+from application.services.single_flight import flight_key
+from core.interfaces.job_store import IJobStore
+from domain.entities.review_job import ReviewJob
+from infra.jobs.webhook import WebhookNotifier
+
+
+class SubmitReviewJobCommand(BaseModel):
+    code: str
+    callback_url: Optional[str] = None
+
+
+class ReviewJobUseCase:
+    def __init__(
+        self,
+        job_store: IJobStore,
+        job_workers: ReviewJobWorkers,
+        notifier: WebhookNotifier,
+    ):
+        self._job_store = job_store
+        self._job_workers = job_workers
+        self._notifier = notifier
+
+    async def submit(self, command: SubmitReviewJobCommand) -> ReviewJob:
+        """Ставит ревью в очередь; одинаковый код дает ту же задачу"""
+        if command.callback_url and not self._notifier.is_allowed(command.callback_url):
+            raise ValueError("callback_url не входит в список разрешенных адресов")
+        # SQLite блокирует поток: запрос к очереди не должен держать event loop
+        job = await asyncio.to_thread(
+            self._job_store.submit,
+            content_hash=flight_key("full_review", command.code),
+            code=command.code,
+            callback_url=command.callback_url,
+        )
+        if job.finished and command.callback_url:
+            # Дубликат готовой задачи: ее воркер уже никого не оповестит
+            self._job_workers.notify_later(job, [command.callback_url])
+        else:
+            self._job_workers.wake()
+        return job
+
+    async def get(self, job_id: str) -> Optional[ReviewJob]:
+        return await asyncio.to_thread(self._job_store.get, job_id)
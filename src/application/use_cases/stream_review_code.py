@@ -0,0 +1,69 @@
+import time
+from typing import AsyncIterator
+
+from pydantic import BaseModel
+
+from core.interfaces.llm_service import ILLMService
+from domain.entities.review_stream import ReviewStreamEvent, ReviewStreamEventType
+from infra.concurrency.analysis_executor import AnalysisExecutor
+from infra.concurrency.llm_scheduler import AdmissionRejected
+from infra.langchain.tools.full_review_code import FullReviewCodeTool
+
+
+class StreamReviewCodeCommand(BaseModel):
+    code: str
+
+
+class StreamReviewCodeUseCase:
+    def __init__(
+        self,
+        llm_service: ILLMService,
+        full_review_code_tool: FullReviewCodeTool,
+        analysis_executor: AnalysisExecutor,
+    ):
+        self._llm_service = llm_service
+        self._full_review_code_tool = full_review_code_tool
+        self._analysis_executor = analysis_executor
+
+    async def execute(
+        self, command: StreamReviewCodeCommand
+    ) -> AsyncIterator[ReviewStreamEvent]:
+        started = time.perf_counter()
+        try:
+            report = await self._analysis_executor.run(
+                self._full_review_code_tool.execute, command.code
+            )
+            yield ReviewStreamEvent(
+                event=ReviewStreamEventType.REPORT,
+                data={"report": report, "elapsed_ms": _elapsed_ms(started)},
+            )
+
+            async for token in self._llm_service.astream_full_code_review(command.code):
+                yield ReviewStreamEvent(
+                    event=ReviewStreamEventType.TOKEN, data={"text": token}
+                )
+        except AdmissionRejected as e:
+            yield ReviewStreamEvent(
+                event=ReviewStreamEventType.ERROR,
+                data={
+                    "error": str(e),
+                    "status": e.status_code,
+                    "retry_after": round(e.retry_after, 1),
+                },
+            )
+            return
+        except Exception as e:
+            yield ReviewStreamEvent(
+                event=ReviewStreamEventType.ERROR,
+                data={"error": f"Ошибка анализа: {str(e)}"},
+            )
+            return
+
+        yield ReviewStreamEvent(
+            event=ReviewStreamEventType.DONE,
+            data={"elapsed_ms": _elapsed_ms(started)},
+        )
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
@@ -0,0 +1,122 @@
+"""Пропускная способность статического анализа в режимах inline/thread/process
+
+Запуск: PYTHONPATH=src python -m benchmarks.analysis_executor
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+from core.interfaces.code_analyzer import ICodeAnalyzer
+from domain.services.code_analyzer import CodeAnalyzerService
+from infra.concurrency.analysis_executor import EXECUTOR_MODES, AnalysisExecutor
+from infra.concurrency.process_analyzer import ProcessPoolCodeAnalyzer
+from infra.langchain.tools.full_review_code import FullReviewCodeTool
+from infra.style.inprocess import InProcessStyleChecker
+
+FUNCTION_TEMPLATE = '''
+def handler_{i}(request, session, config, logger, retries, timeout):
+    """Обработчик {i}"""
+    result = []
+    for item in request.items:
+        if item.value > {i}:
+            result.append(item.value * {i})
+        else:
+            result.append(eval(item.expr))
+    try:
+        session.commit()
+    except:
+        pass
+    return result
+'''
+
+
+def make_source(functions: int, seed: int) -> str:
+    """Синтетический модуль; seed делает файлы разными для честного замера"""
+    header = f"import os\nimport sys\n\nSEED = {seed}\n"
+    return header + "".join(FUNCTION_TEMPLATE.format(i=i) for i in range(functions))
+
+
+def build_analyzer(mode: str, workers: int) -> ICodeAnalyzer:
+    if mode == "process":
+        return ProcessPoolCodeAnalyzer(max_workers=workers)
+    return CodeAnalyzerService(style_checker=InProcessStyleChecker())
+
+
+async def _measure_loop_lag(stop: asyncio.Event, samples: List[float]) -> None:
+    """Насколько event loop опаздывает на тик в 1 мс во время анализа"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        samples.append((time.perf_counter() - started - 0.001) * 1000)
+
+
+async def _run_mode(
+    mode: str, sources: List[str], workers: int, warmup: int
+) -> Dict[str, Any]:
+    analyzer = build_analyzer(mode, workers)
+    tool = FullReviewCodeTool(code_analyzer=analyzer)
+    executor = AnalysisExecutor(max_workers=workers, mode=mode)
+    try:
+        for source in sources[:warmup]:
+            await executor.run(tool.analyze, source + "\n# warmup\n")
+
+        stop = asyncio.Event()
+        lag: List[float] = []
+        ticker = asyncio.create_task(_measure_loop_lag(stop, lag))
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(executor.run(tool.analyze, source) for source in sources)
+        )
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await ticker
+    finally:
+        executor.shutdown()
+        if isinstance(analyzer, ProcessPoolCodeAnalyzer):
+            analyzer.close()
+
+    return {
+        "mode": mode,
+        "files": len(sources),
+        "elapsed_s": round(elapsed, 3),
+        "files_per_s": round(len(sources) / elapsed, 2),
+        "max_loop_lag_ms": round(max(lag, default=elapsed * 1000), 2),
+    }
+
+
+def run(
+    modes: List[str], files: int, functions: int, workers: int
+) -> List[Dict[str, Any]]:
+    sources = [make_source(functions, seed) for seed in range(files)]
+    return [
+        asyncio.run(_run_mode(mode, sources, workers, warmup=workers)) for mode in modes
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=list(EXECUTOR_MODES))
+    parser.add_argument("--files", type=int, default=16)
+    parser.add_argument("--functions", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.modes, args.files, args.functions, args.workers)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    print(f"{'mode':<8} {'files/s':>10} {'elapsed, s':>11} {'max lag, ms':>12}")
+    for r in results:
+        print(
+            f"{r['mode']:<8} {r['files_per_s']:>10} "
+            f"{r['elapsed_s']:>11} {r['max_loop_lag_ms']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
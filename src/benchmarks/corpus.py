@@ -0,0 +1,86 @@
+"""Синтетические корпуса Python-кода для бенчмарков"""
+
+import random
+from typing import Dict, Iterator, Tuple
+
+SIZES = (100, 1_000, 10_000, 50_000)
+SHAPES = ("many_small", "few_large")
+
+SMALL_FUNCTION = '''
+def handler_{i}(request, session):
+    """Обработчик {i}"""
+    value = request.get("value", {i})
+    if value > {threshold}:
+        return value * {i}
+    return eval(request["expr"])
+'''
+
+LARGE_HEADER = '''
+def process_batch_{i}(items, session, config, logger, retries, timeout):
+    """Пакетная обработка {i}"""
+    result = []
+'''
+LARGE_STEP = """    for item in items[{j}:]:
+        if item.value > {threshold}:
+            result.append(item.value * {j})
+        elif item.value < 0:
+            result.append(-item.value)
+        else:
+            result.append(0)
+"""
+LARGE_FOOTER = """    try:
+        session.commit()
+    except:
+        pass
+    return result
+"""
+
+
+def make_corpus(lines: int, shape: str, seed: int = 0) -> str:
+    """Модуль примерно из lines строк заданной формы
+
+    many_small — много коротких функций, few_large — четыре функции с длинными
+    телами. seed меняет константы, чтобы кэши не сглаживали замер.
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Неизвестная форма корпуса: {shape}")
+    rng = random.Random(seed)
+    parts = [f"import os\nimport sys\n\nSEED = {seed}\n"]
+    produced = 4
+
+    if shape == "many_small":
+        i = 0
+        while produced < lines:
+            chunk = SMALL_FUNCTION.format(i=i, threshold=rng.randint(1, 1000))
+            parts.append(chunk)
+            produced += chunk.count("\n")
+            i += 1
+        return "".join(parts)
+
+    functions = 4
+    per_function = max(1, (lines - produced) // functions)
+    for i in range(functions):
+        body = [LARGE_HEADER.format(i=i)]
+        size = LARGE_HEADER.count("\n") + LARGE_FOOTER.count("\n")
+        j = 0
+        while size < per_function:
+            step = LARGE_STEP.format(j=j, threshold=rng.randint(1, 1000))
+            body.append(step)
+            size += step.count("\n")
+            j += 1
+        body.append(LARGE_FOOTER)
+        parts.extend(body)
+    return "".join(parts)
+
+
+def corpora(
+    sizes: Tuple[int, ...] = SIZES, shapes: Tuple[str, ...] = SHAPES, seed: int = 0
+) -> Iterator[Tuple[str, str]]:
+    """Пары (имя корпуса, код) по всем размерам и формам"""
+    for lines in sizes:
+        for shape in shapes:
+            yield f"{shape}_{lines}", make_corpus(lines, shape, seed)
+
+
+def describe(code: str) -> Dict[str, int]:
+    return {"lines": code.count("\n") + 1, "bytes": len(code.encode("utf-8"))}
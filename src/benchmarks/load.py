@@ -0,0 +1,310 @@
+"""Нагрузочный тест: /review, /quick-check, /explain и /compare с заданным RPS
+
+Генератор открытого цикла: запросы уходят по расписанию независимо от того,
+успели ли ответить предыдущие, поэтому перегрузка видна как рост задержки
+и ошибок, а не как скрытое падение нагрузки. Отчет — пропускная способность
+и p50/p95/p99 по каждому эндпоинту.
+
+Против запущенного сервиса (OPENAI_BASE_URL указывает на benchmarks.openai_stub):
+    PYTHONPATH=src python -m benchmarks.load --base-url http://127.0.0.1:8000 --rps 20
+Все в одном процессе, заглушка поднимается сама:
+    PYTHONPATH=src python -m benchmarks.load --in-process --rps 5 --latency-ms 300
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.corpus import SHAPES, make_corpus
+from benchmarks.openai_stub import add_stub_arguments, stub_config
+from benchmarks.suite import STUB_PORT, api_client, stubbed_api_env, unique_payload
+
+PREFIX = "/api/v1/code-review"
+ENDPOINTS = ("review", "quick-check", "explain", "compare")
+DEFAULT_MIX = "review=1,quick-check=2,explain=1,compare=1"
+ISSUE = "Использование eval с пользовательскими данными"
+# Код ответа для запросов, не дошедших до ответа (таймаут, обрыв соединения)
+TRANSPORT_ERROR = 0
+# Сбой LLM сервис отдает кодом 200 с текстом ошибки вместо ответа модели
+ANSWER_ERROR_PREFIX = "Ошибка"
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    status: int
+    latency_ms: float
+    lag_ms: float
+    answer_error: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300 and not self.answer_error
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Неизвестный эндпоинт в --mix: {name}")
+        weights[name] = float(weight or 1)
+    if not any(weights.values()):
+        raise ValueError("В --mix нет ни одного эндпоинта с ненулевым весом")
+    return weights
+
+
+def build_requests(code: str, mode: str) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    improved = code.replace("eval(", "int(")
+    return {
+        "review": (f"{PREFIX}/review", {"code": code}),
+        "quick-check": (f"{PREFIX}/quick-check", {"code": code, "mode": mode}),
+        "explain": (
+            f"{PREFIX}/explain",
+            {"code": code, "issue_description": ISSUE},
+        ),
+        "compare": (
+            f"{PREFIX}/compare",
+            {"original_code": code, "improved_code": improved, "mode": mode},
+        ),
+    }
+
+
+def arrivals(
+    rps: float, duration: float, poisson: bool, rng: random.Random
+) -> List[float]:
+    """Смещения отправки от начала теста в секундах"""
+    times: List[float] = []
+    at = 0.0
+    while True:
+        at += rng.expovariate(rps) if poisson else 1 / rps
+        if at >= duration:
+            return times
+        times.append(at)
+
+
+async def generate(
+    client: httpx.AsyncClient,
+    requests: Dict[str, Tuple[str, Dict[str, Any]]],
+    weights: Dict[str, float],
+    schedule: List[float],
+    max_in_flight: int,
+    unique: bool,
+    rng: random.Random,
+) -> Tuple[List[Sample], int, float]:
+    """Отправляет запросы по расписанию; лишние сверх max_in_flight отбрасывает"""
+    names = list(weights)
+    picks = rng.choices(names, weights=[weights[n] for n in names], k=len(schedule))
+    samples: List[Sample] = []
+    tasks: List[asyncio.Task] = []
+    in_flight = 0
+    dropped = 0
+
+    async def send(i: int, endpoint: str, lag_ms: float) -> None:
+        nonlocal in_flight
+        path, payload = requests[endpoint]
+        started = time.perf_counter()
+        try:
+            response = await client.post(
+                path, json=unique_payload(payload, i) if unique else payload
+            )
+            status = response.status_code
+            failed = response.is_success and is_error_answer(response)
+        except httpx.HTTPError:
+            status, failed = TRANSPORT_ERROR, False
+        finally:
+            in_flight -= 1
+        latency = (time.perf_counter() - started) * 1000
+        samples.append(Sample(endpoint, status, latency, lag_ms, failed))
+
+    start = time.perf_counter()
+    for i, (offset, endpoint) in enumerate(zip(schedule, picks)):
+        delay = start + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if in_flight >= max_in_flight:
+            dropped += 1
+            continue
+        in_flight += 1
+        lag_ms = (time.perf_counter() - start - offset) * 1000
+        tasks.append(asyncio.create_task(send(i, endpoint, lag_ms)))
+    await asyncio.gather(*tasks)
+    return samples, dropped, time.perf_counter() - start
+
+
+def is_error_answer(response: httpx.Response) -> bool:
+    """Ответ 2xx, в котором вместо результата сообщение об ошибке"""
+    try:
+        body = response.json()
+    except ValueError:
+        return True
+    if not isinstance(body, dict) or not body.get("success", True):
+        return True
+    data = body.get("data")
+    values = data.values() if isinstance(data, dict) else [data]
+    return any(
+        isinstance(value, str) and value.startswith(ANSWER_ERROR_PREFIX)
+        for value in values
+    )
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Перцентиль по ближайшему рангу"""
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Any]:
+    ok = sorted(s.latency_ms for s in samples if s.ok)
+    statuses = Counter(str(s.status) for s in samples)
+    summary: Dict[str, Any] = {
+        "sent": len(samples),
+        "ok": len(ok),
+        "errors": len(samples) - len(ok),
+        "answer_errors": sum(s.answer_error for s in samples),
+        "statuses": dict(sorted(statuses.items())),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+    }
+    if ok:
+        summary.update(
+            {
+                "p50_ms": round(percentile(ok, 50), 1),
+                "p95_ms": round(percentile(ok, 95), 1),
+                "p99_ms": round(percentile(ok, 99), 1),
+                "max_ms": round(ok[-1], 1),
+            }
+        )
+    return summary
+
+
+def report(
+    samples: List[Sample], dropped: int, elapsed: float, args: argparse.Namespace
+) -> Dict[str, Any]:
+    by_endpoint = {
+        name: summarize([s for s in samples if s.endpoint == name], elapsed)
+        for name in ENDPOINTS
+        if any(s.endpoint == name for s in samples)
+    }
+    lags = sorted(s.lag_ms for s in samples)
+    return {
+        "config": {
+            "target_rps": args.rps,
+            "duration_seconds": args.duration,
+            "arrivals": "poisson" if args.poisson else "constant",
+            "mix": args.mix,
+            "mode": args.mode,
+            "lines": args.lines,
+            "in_process": args.in_process,
+        },
+        "elapsed_seconds": round(elapsed, 2),
+        "dropped": dropped,
+        # Отставание отправки от расписания: если велико, упирается сам генератор
+        "send_lag_p99_ms": round(percentile(lags, 99), 1) if lags else None,
+        "total": summarize(samples, elapsed),
+        "endpoints": by_endpoint,
+    }
+
+
+def print_table(result: Dict[str, Any]) -> None:
+    rows = [("total", result["total"]), *result["endpoints"].items()]
+    print(
+        f"{'endpoint':<12} {'sent':>6} {'ok':>6} {'err':>5} {'rps':>7} "
+        f"{'p50':>8} {'p95':>8} {'p99':>8}",
+        file=sys.stderr,
+    )
+    for name, row in rows:
+        print(
+            f"{name:<12} {row['sent']:>6} {row['ok']:>6} {row['errors']:>5} "
+            f"{row['throughput_rps']:>7} {row.get('p50_ms', '-'):>8} "
+            f"{row.get('p95_ms', '-'):>8} {row.get('p99_ms', '-'):>8}",
+            file=sys.stderr,
+        )
+    if result["dropped"]:
+        print(f"Отброшено сверх --max-in-flight: {result['dropped']}", file=sys.stderr)
+
+
+async def run(args: argparse.Namespace, client: httpx.AsyncClient) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    requests = build_requests(make_corpus(args.lines, args.shape), args.mode)
+    schedule = arrivals(args.rps, args.duration, args.poisson, rng)
+    samples, dropped, elapsed = await generate(
+        client,
+        requests,
+        parse_mix(args.mix),
+        schedule,
+        args.max_in_flight,
+        args.unique,
+        rng,
+    )
+    return report(samples, dropped, elapsed, args)
+
+
+async def run_remote(args: argparse.Namespace) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.max_in_flight)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        return await run(args, client)
+
+
+async def run_in_process(args: argparse.Namespace) -> Dict[str, Any]:
+    async with api_client(timeout=args.timeout) as client:
+        return await run(args, client)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Поднять заглушку и приложение в этом процессе вместо --base-url",
+    )
+    parser.add_argument("--stub-port", type=int, default=STUB_PORT)
+    parser.add_argument("--rps", type=float, default=5.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument(
+        "--poisson", action="store_true", help="Пуассоновский поток вместо равномерного"
+    )
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--mode", choices=("static", "llm"), default="llm")
+    parser.add_argument("--lines", type=int, default=100)
+    parser.add_argument("--shape", choices=SHAPES, default="many_small")
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument(
+        "--unique",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Делать каждый запрос уникальным, чтобы не попадать в кэш",
+    )
+    parser.add_argument("--output", help="Куда записать JSON с результатами")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    if args.in_process:
+        with stubbed_api_env(args.stub_port, stub_config(args)):
+            result = asyncio.run(run_in_process(args))
+    else:
+        result = asyncio.run(run_remote(args))
+
+    print_table(result)
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""Локальный OpenAI-совместимый сервер для бенчмарков и нагрузочных тестов
+
+Отвечает на /v1/chat/completions как провайдер для ChatOpenAI: на первый ход
+агента вызывает инструмент, названный в запросе, на следующий — возвращает
+итоговый ответ. Поддерживает stream, распределения задержки и внедрение
+ошибок 429/5xx; счетчики ответов доступны на GET /stub/stats.
+
+Запуск: PYTHONPATH=src python -m benchmarks.openai_stub --port 8911 \
+    --latency lognormal --latency-ms 800 --error-rate-429 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, fields
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+SOURCE_ID = re.compile(r"source_id=(src-[0-9a-f]+)")
+TOOL_HINT = re.compile(r"инструмент (\w+)")
+ANSWER = "Ревью готово.\n```python\ndef handler(request):\n    return request\n```\n"
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+SERVER_ERRORS = (500, 502, 503)
+
+
+@dataclass
+class StubConfig:
+    """Поведение заглушки
+
+    latency_ms — центр распределения задержки до первого байта: значение
+    для fixed, середина для uniform, среднее для normal и медиана для
+    lognormal. latency_jitter_ms — полуширина uniform и σ для normal,
+    latency_sigma — σ логарифма для lognormal.
+    """
+
+    latency: str = "fixed"
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    latency_sigma: float = 0.5
+    chunk_delay_ms: float = 0.0
+    error_rate_429: float = 0.0
+    error_rate_5xx: float = 0.0
+    retry_after_seconds: float = 1.0
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if self.latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Неизвестное распределение задержки: {self.latency}")
+        if self.error_rate_429 + self.error_rate_5xx > 1:
+            raise ValueError("Суммарная доля ошибок больше 1")
+
+
+class LatencySampler:
+    def __init__(self, config: StubConfig, rng: random.Random):
+        self._config = config
+        self._rng = rng
+
+    def sample_ms(self) -> float:
+        c = self._config
+        if c.latency == "uniform":
+            value = self._rng.uniform(
+                c.latency_ms - c.latency_jitter_ms, c.latency_ms + c.latency_jitter_ms
+            )
+        elif c.latency == "normal":
+            value = self._rng.gauss(c.latency_ms, c.latency_jitter_ms)
+        elif c.latency == "lognormal" and c.latency_ms > 0:
+            value = self._rng.lognormvariate(math.log(c.latency_ms), c.latency_sigma)
+        else:
+            value = c.latency_ms
+        return max(0.0, value)
+
+
+class FaultInjector:
+    """Решает, ответить ли на запрос ошибкой провайдера"""
+
+    def __init__(self, config: StubConfig, rng: random.Random):
+        self._config = config
+        self._rng = rng
+
+    def pick(self) -> Optional[int]:
+        roll = self._rng.random()
+        if roll < self._config.error_rate_429:
+            return 429
+        if roll < self._config.error_rate_429 + self._config.error_rate_5xx:
+            return self._rng.choice(SERVER_ERRORS)
+        return None
+
+
+def create_app(config: Optional[StubConfig] = None) -> FastAPI:
+    config = config or StubConfig()
+    rng = random.Random(config.seed)
+    latency = LatencySampler(config, rng)
+    faults = FaultInjector(config, rng)
+    counters: Counter = Counter()
+    app = FastAPI(title="OpenAI stub")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        counters["requests"] += 1
+        delay_ms = latency.sample_ms()
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+
+        status = faults.pick()
+        if status is not None:
+            counters[f"status_{status}"] += 1
+            return _error(status, config.retry_after_seconds)
+
+        message, finish_reason = _reply(body)
+        counters["tool_calls" if message.get("tool_calls") else "answers"] += 1
+        usage = _usage(body["messages"], message)
+        counters["prompt_tokens"] += usage["prompt_tokens"]
+        counters["completion_tokens"] += usage["completion_tokens"]
+        if body.get("stream"):
+            counters["streamed"] += 1
+            return StreamingResponse(
+                _stream(body, message, finish_reason, usage, config.chunk_delay_ms),
+                media_type="text/event-stream",
+            )
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [
+                {"index": 0, "message": message, "finish_reason": finish_reason}
+            ],
+            "usage": usage,
+        }
+
+    @app.get("/stub/stats")
+    async def stub_stats():
+        return dict(counters)
+
+    return app
+
+
+def _error(status: int, retry_after: float) -> JSONResponse:
+    """Ответ в формате ошибок OpenAI, чтобы клиент применил свои повторы"""
+    error: Dict[str, Optional[str]]
+    if status == 429:
+        error = {
+            "message": "Rate limit reached (stub)",
+            "type": "requests",
+            "code": "rate_limit_exceeded",
+        }
+        headers = {"retry-after": str(retry_after)}
+    else:
+        error = {
+            "message": "The server had an error (stub)",
+            "type": "server_error",
+            "code": None,
+        }
+        headers = {}
+    return JSONResponse(
+        {"error": {**error, "param": None}}, status_code=status, headers=headers
+    )
+
+
+def _reply(body: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
+    """Первый ход агента — вызов инструмента, после результата — ответ"""
+    messages = body["messages"]
+    tools = [t["function"]["name"] for t in body.get("tools") or []]
+    if tools and not any(m["role"] == "tool" for m in messages):
+        text = json.dumps(messages, ensure_ascii=False)
+        hinted = [name for name in TOOL_HINT.findall(text) if name in tools]
+        found = SOURCE_ID.findall(text)
+        arguments = {"source_id": found[0] if found else ""}
+        return {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": "call_stub",
+                    "type": "function",
+                    "function": {
+                        "name": hinted[0] if hinted else tools[0],
+                        "arguments": json.dumps(arguments),
+                    },
+                }
+            ],
+        }, "tool_calls"
+    return {"role": "assistant", "content": ANSWER}, "stop"
+
+
+def _usage(messages: List[Dict[str, Any]], message: Dict[str, Any]) -> Dict[str, int]:
+    prompt = sum(len(str(m.get("content") or "")) for m in messages) // 4
+    completion = len(message.get("content") or "") // 4
+    return {
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": prompt + completion,
+    }
+
+
+async def _stream(
+    body: Dict[str, Any],
+    message: Dict[str, Any],
+    finish_reason: str,
+    usage: Dict[str, int],
+    chunk_delay_ms: float = 0.0,
+) -> AsyncIterator[str]:
+    base = {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body["model"],
+    }
+    if message.get("tool_calls"):
+        deltas = [
+            {
+                **message,
+                "tool_calls": [
+                    {**call, "index": i} for i, call in enumerate(message["tool_calls"])
+                ],
+            }
+        ]
+    else:
+        # Ответ по словам: клиент видит поток, как у настоящего провайдера
+        words = re.findall(r"\S+\s*|\s+", message["content"])
+        deltas = [{"role": "assistant", "content": words[0]}]
+        deltas.extend({"content": word} for word in words[1:])
+
+    for i, delta in enumerate(deltas):
+        if i and chunk_delay_ms:
+            await asyncio.sleep(chunk_delay_ms / 1000)
+        choice = {"index": 0, "delta": delta, "finish_reason": None}
+        yield f"data: {json.dumps({**base, 'choices': [choice]})}\n\n"
+    choice = {"index": 0, "delta": {}, "finish_reason": finish_reason}
+    yield f"data: {json.dumps({**base, 'choices': [choice]})}\n\n"
+    if (body.get("stream_options") or {}).get("include_usage"):
+        yield f"data: {json.dumps({**base, 'choices': [], 'usage': usage})}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+class StubServer:
+    """Заглушка в фоновом потоке, чтобы бенчмарк поднимал ее сам"""
+
+    def __init__(self, port: int = 8911, config: Optional[StubConfig] = None):
+        server_config = uvicorn.Config(
+            create_app(config), host="127.0.0.1", port=port, log_level="warning"
+        )
+        self._server = uvicorn.Server(server_config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self.base_url = f"http://127.0.0.1:{port}/v1"
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("заглушка OpenAI")
+    group.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="fixed")
+    group.add_argument("--latency-ms", type=float, default=0.0)
+    group.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    group.add_argument("--latency-sigma", type=float, default=0.5)
+    group.add_argument(
+        "--chunk-delay-ms",
+        type=float,
+        default=0.0,
+        help="Пауза между чанками stream-ответа",
+    )
+    group.add_argument("--error-rate-429", type=float, default=0.0)
+    group.add_argument("--error-rate-5xx", type=float, default=0.0)
+    group.add_argument("--retry-after-seconds", type=float, default=1.0)
+    group.add_argument("--seed", type=int)
+
+
+def stub_config(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(**{f.name: getattr(args, f.name) for f in fields(StubConfig)})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8911)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(stub_config(args)), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
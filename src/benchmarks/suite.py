@@ -0,0 +1,461 @@
+"""Базовый замер производительности: анализатор, инструменты, отчеты и API
+
+Анализ и отчеты меряются на синтетических корпусах от 100 до 50 000 строк,
+эндпоинты — целиком через FastAPI против локальной заглушки OpenAI.
+Результат пишется в JSON; --compare сравнивает его с замером другого коммита.
+
+Запуск: PYTHONPATH=src python -m benchmarks.suite --output bench.json
+"""
+
+import argparse
+import asyncio
+import difflib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+import httpx
+
+from benchmarks.corpus import SHAPES, SIZES, corpora, describe
+from benchmarks.openai_stub import StubConfig, StubServer
+from domain.services.code_analyzer import CodeAnalyzerService
+from infra.langchain.code_report_generator import CodeReportGenerator
+from infra.langchain.tools.full_review_code import FullReviewCodeTool
+from infra.langchain.tools.quick_check_code import QuickCheckCodeTool
+from infra.style.inprocess import InProcessStyleChecker
+
+GROUPS = ("analyzer", "tools", "report", "api")
+ANALYZER_METHODS = (
+    "analyze_syntax",
+    "check_style",
+    "detect_smells",
+    "suggest_improvements",
+)
+API_SIZES = (100, 1_000)
+STUB_PORT = 8911
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "repeats": len(samples),
+        "min_ms": round(ordered[0], 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(p95, 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+    }
+
+
+def measure(
+    fn: Callable[[Any], Any],
+    setup: Callable[[], Any],
+    repeats: int,
+    budget_seconds: float,
+) -> Dict[str, Any]:
+    """Повторяет fn(setup()) до repeats раз, пока не исчерпан бюджет времени
+
+    setup не входит в замер: так каждый повтор получает свежие данные
+    без кэшей, но их подготовка не искажает результат.
+    """
+    samples: List[float] = []
+    deadline = time.perf_counter() + budget_seconds
+    while len(samples) < repeats and (not samples or time.perf_counter() < deadline):
+        arg = setup()
+        started = time.perf_counter()
+        fn(arg)
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+
+async def ameasure(
+    fn: Callable[[int], Awaitable[Any]], repeats: int, budget_seconds: float
+) -> Dict[str, Any]:
+    samples: List[float] = []
+    deadline = time.perf_counter() + budget_seconds
+    while len(samples) < repeats and (not samples or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        await fn(len(samples))
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+
+def bench_analyzer(
+    corpus: str, code: str, repeats: int, budget: float
+) -> List[Dict[str, Any]]:
+    analyzer = CodeAnalyzerService(style_checker=InProcessStyleChecker())
+
+    def fresh_source():
+        source = analyzer.parse(code)
+        _ = source.tree  # разбор не входит в замер методов
+        return source
+
+    results = [
+        _row(
+            "analyzer",
+            "parse",
+            corpus,
+            code,
+            measure(
+                lambda src: src.tree, lambda: analyzer.parse(code), repeats, budget
+            ),
+        )
+    ]
+    for method in ANALYZER_METHODS:
+        stats = measure(getattr(analyzer, method), fresh_source, repeats, budget)
+        results.append(_row("analyzer", method, corpus, code, stats))
+    return results
+
+
+def bench_tools(
+    corpus: str, code: str, repeats: int, budget: float
+) -> List[Dict[str, Any]]:
+    analyzer = CodeAnalyzerService(style_checker=InProcessStyleChecker())
+    tools = {
+        "full_review_code.execute": FullReviewCodeTool(analyzer),
+        "quick_check_code.execute": QuickCheckCodeTool(analyzer),
+    }
+    return [
+        _row(
+            "tools",
+            name,
+            corpus,
+            code,
+            measure(tool.execute, lambda: code, repeats, budget),
+        )
+        for name, tool in tools.items()
+    ]
+
+
+def bench_report(
+    corpus: str, code: str, repeats: int, budget: float
+) -> List[Dict[str, Any]]:
+    analyzer = CodeAnalyzerService(style_checker=InProcessStyleChecker())
+    result = FullReviewCodeTool(analyzer).analyze(code)
+    source = analyzer.parse(code)
+    syntax = analyzer.analyze_syntax(source)
+    critical = [
+        i for i in analyzer.detect_smells(source) if i.severity.value == "critical"
+    ]
+
+    full = measure(
+        lambda _: CodeReportGenerator.generate_full_report(
+            result.issues, result.improvements, result.score, result.status
+        ),
+        lambda: None,
+        repeats,
+        budget,
+    )
+    quick = measure(
+        lambda _: CodeReportGenerator.generate_quick_report(syntax, critical),
+        lambda: None,
+        repeats,
+        budget,
+    )
+    return [
+        _row("report", "generate_full_report", corpus, code, full),
+        _row("report", "generate_quick_report", corpus, code, quick),
+    ]
+
+
+def bench_api(
+    cases: List[Tuple[str, str]],
+    repeats: int,
+    budget: float,
+    latency_ms: float,
+    port: int = STUB_PORT,
+) -> List[Dict[str, Any]]:
+    with stubbed_api_env(port, StubConfig(latency_ms=latency_ms)):
+        return asyncio.run(_run_api(cases, repeats, budget))
+
+
+@contextmanager
+def stubbed_api_env(port: int, config: StubConfig) -> Iterator[StubServer]:
+    """Поднимает заглушку OpenAI и настраивает окружение сервиса на нее"""
+    with StubServer(port=port, config=config) as stub:
+        with tempfile.TemporaryDirectory() as tmp:
+            _configure_api_env(stub.base_url, tmp)
+            yield stub
+
+
+def _configure_api_env(base_url: str, tmp: str) -> None:
+    """Чистый прогон: без кэшей ответов и анализа, без прокси и воркеров задач"""
+    os.environ.update(
+        {
+            "OPENAI_BASE_URL": base_url,
+            "LLM_OPENAI_API_KEY": os.environ.get("LLM_OPENAI_API_KEY", "sk-bench"),
+            "LLM_VERBOSE": "false",
+            "LLM_CACHE_BACKEND": "none",
+            "ANALYSIS_CACHE_BACKEND": "none",
+            "COALESCING_ENABLED": "false",
+            "HTTP_PROXY": "",
+            "JOBS_WORKERS": "0",
+            "JOBS_SQLITE_PATH": os.path.join(tmp, "jobs.sqlite3"),
+        }
+    )
+
+
+@asynccontextmanager
+async def api_client(timeout: float = 600) -> AsyncIterator[httpx.AsyncClient]:
+    """Клиент к приложению в этом же процессе, без сетевого слоя"""
+    from fastapi import FastAPI
+
+    from core.container import Container
+    from presentation.api.router import setup_routes
+
+    container = Container()
+    container.wire(modules=["presentation.api.v1.code_review"])
+    app = FastAPI()
+    app.include_router(setup_routes())
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://bench",
+            timeout=timeout,
+        ) as client:
+            yield client
+    finally:
+        container.analysis_executor().shutdown()
+        await container.http_client_pool().aclose()
+        container.job_store().close()
+        container.unwire()
+
+
+async def _run_api(
+    cases: List[Tuple[str, str]], repeats: int, budget: float
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    async with api_client() as client:
+        for corpus, code in cases:
+            for name, path, payload in _api_requests(code):
+
+                async def call(i: int, path=path, payload=payload) -> None:
+                    response = await client.post(path, json=unique_payload(payload, i))
+                    response.raise_for_status()
+
+                stats = await ameasure(call, repeats, budget)
+                results.append(_row("api", name, corpus, code, stats))
+    return results
+
+
+def unique_payload(payload: Dict[str, Any], i: int) -> Dict[str, Any]:
+    """Уникальный хвост кода: повторы не схлопываются и не берутся из кэша"""
+    return {
+        k: v + f"\n# run {i}\n" if k in ("code", "improved_code") else v
+        for k, v in payload.items()
+    }
+
+
+def _api_requests(code: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+    # Добавленная функция гарантирует непустой diff для любого корпуса
+    improved = (
+        code.replace("eval(", "int(") + "\n\ndef added(value):\n    return value\n"
+    )
+    diff = "".join(
+        difflib.unified_diff(
+            code.splitlines(keepends=True),
+            improved.splitlines(keepends=True),
+            "a/module.py",
+            "b/module.py",
+        )
+    )
+    prefix = "/api/v1/code-review"
+    return [
+        ("POST /review", f"{prefix}/review", {"code": code}),
+        (
+            "POST /quick-check static",
+            f"{prefix}/quick-check",
+            {"code": code, "mode": "static"},
+        ),
+        (
+            "POST /quick-check llm",
+            f"{prefix}/quick-check",
+            {"code": code, "mode": "llm"},
+        ),
+        (
+            "POST /compare static",
+            f"{prefix}/compare",
+            {"original_code": code, "improved_code": improved, "mode": "static"},
+        ),
+        (
+            "POST /review/diff static",
+            f"{prefix}/review/diff",
+            {"base_code": code, "diff": diff, "mode": "static"},
+        ),
+    ]
+
+
+def _row(
+    group: str, name: str, corpus: str, code: str, stats: Dict[str, Any]
+) -> Dict[str, Any]:
+    return {"group": group, "name": name, "corpus": corpus, **describe(code), **stats}
+
+
+def run(
+    groups: List[str],
+    sizes: Tuple[int, ...],
+    shapes: Tuple[str, ...],
+    repeats: int,
+    budget: float,
+    latency_ms: float,
+    stub_port: int = STUB_PORT,
+) -> Dict[str, Any]:
+    benches = {"analyzer": bench_analyzer, "tools": bench_tools, "report": bench_report}
+    results: List[Dict[str, Any]] = []
+    for corpus, code in corpora(sizes, shapes):
+        for group in groups:
+            if group in benches:
+                results.extend(benches[group](corpus, code, repeats, budget))
+                _progress(results)
+    if "api" in groups:
+        api_sizes = tuple(s for s in sizes if s in API_SIZES) or sizes[:1]
+        cases = list(corpora(api_sizes, shapes))
+        results.extend(bench_api(cases, repeats, budget, latency_ms, stub_port))
+        _progress(results)
+    return {"meta": _meta(repeats, budget, latency_ms), "results": results}
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    min_delta_ms: float = 0.5,
+) -> List[Dict[str, Any]]:
+    """Изменение медианы по каждому замеру, который есть в обоих файлах
+
+    Регрессией считается рост больше threshold и больше min_delta_ms:
+    у субмиллисекундных замеров относительный шум слишком велик.
+    """
+    before = {_key(r): r for r in baseline["results"]}
+    changes = []
+    for row in current["results"]:
+        old = before.get(_key(row))
+        if old is None or not old["median_ms"]:
+            continue
+        ratio = row["median_ms"] / old["median_ms"]
+        changes.append(
+            {
+                "group": row["group"],
+                "name": row["name"],
+                "corpus": row["corpus"],
+                "baseline_ms": old["median_ms"],
+                "current_ms": row["median_ms"],
+                "change": round(ratio - 1, 4),
+                "regression": ratio - 1 > threshold
+                and row["median_ms"] - old["median_ms"] > min_delta_ms,
+            }
+        )
+    return changes
+
+
+def _key(row: Dict[str, Any]) -> Tuple[str, str, str]:
+    return row["group"], row["name"], row["corpus"]
+
+
+def _meta(repeats: int, budget: float, latency_ms: float) -> Dict[str, Any]:
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeats": repeats,
+        "budget_seconds": budget,
+        "stub_latency_ms": latency_ms,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _progress(results: List[Dict[str, Any]]) -> None:
+    row = results[-1]
+    print(
+        f"{row['group']:<9} {row['name']:<28} {row['corpus']:<18} "
+        f"{row['median_ms']:>10.3f} ms",
+        file=sys.stderr,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", nargs="+", choices=GROUPS, default=list(GROUPS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=list(SHAPES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--budget-seconds",
+        type=float,
+        default=10.0,
+        help="Сколько времени тратить на один замер, минимум один повтор",
+    )
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0)
+    parser.add_argument("--stub-port", type=int, default=STUB_PORT)
+    parser.add_argument("--output", help="Куда записать JSON с результатами")
+    parser.add_argument("--compare", help="JSON прошлого замера для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    report = run(
+        args.groups,
+        tuple(args.sizes),
+        tuple(args.shapes),
+        args.repeats,
+        args.budget_seconds,
+        args.stub_latency_ms,
+        args.stub_port,
+    )
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["comparison"] = compare(
+                json.load(f), report, args.threshold, args.min_delta_ms
+            )
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    regressions = [c for c in report.get("comparison", []) if c["regression"]]
+    for change in regressions:
+        print(
+            f"Регрессия: {change['group']} {change['name']} {change['corpus']} "
+            f"{change['baseline_ms']} -> {change['current_ms']} ms",
+            file=sys.stderr,
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+from typing import Dict
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AdmissionSettings(BaseSettings):
+    enabled: bool = True
+    max_concurrency: int = 8
+    # Полные ревью не занимают весь пул: остаются слоты для быстрых проверок
+    operation_limits: Dict[str, int] = Field(
+        default_factory=lambda: {
+            "full_review": 6,
+            "review_diff": 6,
+            "compare_versions": 4,
+        }
+    )
+    # 0 — самый срочный; остальные операции получают default_priority
+    priorities: Dict[str, int] = Field(
+        default_factory=lambda: {"quick_check": 0, "explain_issue": 0}
+    )
+    default_priority: int = 1
+    max_queue: int = 64
+    max_wait_seconds: float = 10.0
+
+    model_config = SettingsConfigDict(env_prefix="ADMISSION_")
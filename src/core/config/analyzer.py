@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AnalyzerSettings(BaseSettings):
+    style_backend: str = "inprocess"
+    max_line_length: int = 88
+    style_timeout: float = 10.0
+    executor_mode: str = "thread"
+    executor_workers: int = 4
+    process_workers: Optional[int] = None
+
+    model_config = SettingsConfigDict(env_prefix="ANALYZER_")
@@ -0,0 +1,11 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class BatchSettings(BaseSettings):
+    process_workers: int = 4
+    llm_concurrency: int = 8
+    max_files: int = 500
+    # Процессы пула стартуют вместе с сервисом, а не при первом пакете
+    warm_up: bool = False
+
+    model_config = SettingsConfigDict(env_prefix="BATCH_")
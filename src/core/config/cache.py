@@ -0,0 +1,20 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AnalysisCacheSettings(BaseSettings):
+    backend: str = "memory"
+    max_size: int = 1024
+    ttl_seconds: float = 3600.0
+    unit_max_size: int = 8192
+
+    model_config = SettingsConfigDict(env_prefix="ANALYSIS_CACHE_")
+
+
+class LLMCacheSettings(BaseSettings):
+    backend: str = "memory"
+    max_size: int = 512
+    ttl_seconds: float = 86400.0
+    sqlite_path: str = ".cache/llm_responses.sqlite3"
+    max_temperature: float = 0.3
+
+    model_config = SettingsConfigDict(env_prefix="LLM_CACHE_")
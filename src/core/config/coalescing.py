@@ -0,0 +1,7 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class CoalescingSettings(BaseSettings):
+    enabled: bool = True
+
+    model_config = SettingsConfigDict(env_prefix="COALESCING_")
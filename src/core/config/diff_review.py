@@ -0,0 +1,8 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class DiffReviewSettings(BaseSettings):
+    context_lines: int = 3
+    max_diff_bytes: int = 1_000_000
+
+    model_config = SettingsConfigDict(env_prefix="DIFF_REVIEW_")
@@ -1,8 +1,17 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class HTTPSettings(BaseSettings):
-    proxy: str = "http://example_user:example_pass@ip:port"
+    proxy: Optional[str] = None
     timeout: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: Optional[float] = None
+    pool_timeout: float = 10.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0
+    http2: bool = True
 
     model_config = SettingsConfigDict(env_prefix="HTTP_")
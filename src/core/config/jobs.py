@@ -0,0 +1,25 @@
+from typing import List
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class JobSettings(BaseSettings):
+    sqlite_path: str = ".cache/review_jobs.sqlite3"
+    # 0 — узел только принимает задачи, выполняют их другие процессы
+    workers: int = 2
+    poll_interval_seconds: float = 1.0
+    max_attempts: int = 3
+    # Пауза перед повтором после сбоя удваивается с каждой попыткой
+    retry_backoff_seconds: float = 5.0
+    result_ttl_seconds: float = 86400.0
+    # Задачу с истекшей арендой забирает другой воркер; пока она выполняется,
+    # аренда продлевается каждую треть срока
+    lease_seconds: float = 60.0
+    callback_retries: int = 3
+    callback_timeout_seconds: float = 10.0
+    # Пустой список — callback_url не принимается; «*.example.com» — поддомены
+    callback_allowed_hosts: List[str] = Field(default_factory=list)
+    callback_allowed_schemes: List[str] = Field(default_factory=lambda: ["https"])
+
+    model_config = SettingsConfigDict(env_prefix="JOBS_")
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -7,6 +9,12 @@ class LLMSettings(BaseSettings):
     openai_model: str = "gpt-3.5-turbo"
     temperature: float = 0.1
     max_tokens: int = 2000
+    context_window: int = 16385
+    prompt_overhead_tokens: int = 1000
     verbose: bool = True
+    pipeline: str = "agent"
+    # Квоты провайдера; не заданы — ограничивает только планировщик
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
 
     model_config = SettingsConfigDict(env_prefix="LLM_")
@@ -0,0 +1,46 @@
+from typing import List
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class MetricsSettings(BaseSettings):
+    enabled: bool = True
+    namespace: str = "code_review"
+    # Этапы анализа укладываются в миллисекунды, запросы к модели — в секунды
+    stage_buckets: List[float] = Field(
+        default_factory=lambda: [
+            0.0005,
+            0.001,
+            0.0025,
+            0.005,
+            0.01,
+            0.025,
+            0.05,
+            0.1,
+            0.25,
+            0.5,
+            1.0,
+            2.5,
+            5.0,
+        ]
+    )
+    latency_buckets: List[float] = Field(
+        default_factory=lambda: [
+            0.01,
+            0.05,
+            0.1,
+            0.25,
+            0.5,
+            1.0,
+            2.5,
+            5.0,
+            10.0,
+            20.0,
+            30.0,
+            60.0,
+            120.0,
+        ]
+    )
+
+    model_config = SettingsConfigDict(env_prefix="METRICS_")
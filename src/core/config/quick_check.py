@@ -0,0 +1,10 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from domain.entities.code_review import AnalysisMode
+
+
+class QuickCheckSettings(BaseSettings):
+    mode: AnalysisMode = AnalysisMode.LLM
+    static_slo_ms: float = 10.0
+
+    model_config = SettingsConfigDict(env_prefix="QUICK_CHECK_")
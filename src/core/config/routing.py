@@ -0,0 +1,30 @@
+from typing import Dict, List, Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ModelRoutingSettings(BaseSettings):
+    enabled: bool = False
+    small_model: str = "gpt-4o-mini"
+    # Не задана — большой моделью служит LLM_OPENAI_MODEL
+    large_model: Optional[str] = None
+    # Стартовый уровень операции: small или large
+    operation_tiers: Dict[str, str] = Field(
+        default_factory=lambda: {
+            "quick_check": "small",
+            "full_review": "small",
+            "review_diff": "small",
+            "explain_issue": "large",
+            "compare_versions": "large",
+        }
+    )
+    # Для этих операций уровень уточняется по статическому анализу кода
+    analyzed_operations: List[str] = Field(default_factory=lambda: ["full_review"])
+    escalate_on_critical: bool = True
+    large_file_lines: int = 300
+    escalate_on_invalid_output: bool = True
+    min_answer_chars: int = 40
+    require_code_block: bool = True
+
+    model_config = SettingsConfigDict(env_prefix="LLM_ROUTING_")
@@ -0,0 +1,10 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class StyleWorkerSettings(BaseSettings):
+    size: int = 2
+    timeout: float = 10.0
+    max_tasks_per_worker: int = 1000
+    start_method: str = "spawn"
+
+    model_config = SettingsConfigDict(env_prefix="STYLE_WORKERS_")
@@ -1,56 +1,373 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
 from dependency_injector import containers, providers
 
+from application.services.job_workers import ReviewJobWorkers
+from application.services.single_flight import SingleFlight
+from application.use_cases.batch_review import BatchReviewUseCase
 from application.use_cases.compare_versions import CompareVersionsUseCase
 from application.use_cases.explain_issue import ExplainIssueUseCase
 from application.use_cases.quick_check import QuickCheckUseCase
 from application.use_cases.review_code import FullReviewCodeUseCase
+from application.use_cases.review_diff import DiffReviewUseCase
+from application.use_cases.review_jobs import ReviewJobUseCase
+from application.use_cases.stream_review_code import StreamReviewCodeUseCase
+from core.config.admission import AdmissionSettings
+from core.config.analyzer import AnalyzerSettings
+from core.config.batch import BatchSettings
+from core.config.cache import AnalysisCacheSettings, LLMCacheSettings
+from core.config.coalescing import CoalescingSettings
+from core.config.diff_review import DiffReviewSettings
+from core.config.http import HTTPSettings
+from core.config.jobs import JobSettings
 from core.config.llm import LLMSettings
+from core.config.metrics import MetricsSettings
+from core.config.quick_check import QuickCheckSettings
+from core.config.routing import ModelRoutingSettings
+from core.config.style_workers import StyleWorkerSettings
+from domain.services.cached_code_analyzer import CachedCodeAnalyzer
 from domain.services.code_analyzer import CodeAnalyzerService
+from domain.services.instrumented_code_analyzer import InstrumentedCodeAnalyzer
+from domain.services.llm_response_cache import LLMResponseCache
 from domain.services.llm_service import LLMService
-from infra.http.http_client import get_http_client
+from domain.services.model_router import ModelRouter
+from domain.services.prompt_budget import PromptBudget
+from domain.services.rules.default import build_default_registry
+from domain.services.rules.engine import RuleEngine
+from domain.services.unit_analyzer import UnitAnalyzer
+from domain.services.version_comparator import VersionComparator
+from infra.cache.memory import MemoryCache
+from infra.cache.sqlite import SQLiteCache
+from infra.concurrency.analysis_executor import AnalysisExecutor
+from infra.concurrency.llm_scheduler import LLMScheduler
+from infra.concurrency.process_analyzer import ProcessPoolCodeAnalyzer
+from infra.concurrency.static_analysis import init_worker as init_batch_worker
+from infra.http.http_client import HTTPClientPool
+from infra.jobs.sqlite_store import SQLiteJobStore
+from infra.jobs.webhook import WebhookNotifier
+from infra.langchain.agent_runtime import AgentRuntime
 from infra.langchain.llm_provider import LangChainLLMProvider
+from infra.langchain.tier_metrics import TierMetrics
+from infra.langchain.token_counter import TiktokenCounter
 from infra.langchain.tools.full_review_code import FullReviewCodeTool
 from infra.langchain.tools.quick_check_code import QuickCheckCodeTool
+from infra.metrics.prometheus import PrometheusMetrics
+from infra.style.flake8_subprocess import SubprocessStyleChecker
+from infra.style.inprocess import InProcessStyleChecker
+from infra.style.worker_pool import PooledStyleChecker, StyleWorkerPool
 
 
 class Container(containers.DeclarativeContainer):
     config = providers.Configuration()
 
-    http_client = providers.Singleton(get_http_client)
+    metrics_settings = providers.Singleton(MetricsSettings)
+    metrics = providers.Singleton(
+        PrometheusMetrics,
+        enabled=metrics_settings.provided.enabled,
+        namespace=metrics_settings.provided.namespace,
+        stage_buckets=metrics_settings.provided.stage_buckets,
+        latency_buckets=metrics_settings.provided.latency_buckets,
+    )
+
+    http_settings = providers.Singleton(HTTPSettings)
+    http_client_pool = providers.Singleton(HTTPClientPool, settings=http_settings)
+    http_client = http_client_pool.provided.client
+    async_http_client = http_client_pool.provided.async_client
 
     llm_settings = providers.Singleton(LLMSettings)
+    analyzer_settings = providers.Singleton(AnalyzerSettings)
+    style_worker_settings = providers.Singleton(StyleWorkerSettings)
+    analysis_cache_settings = providers.Singleton(AnalysisCacheSettings)
+    llm_cache_settings = providers.Singleton(LLMCacheSettings)
+    quick_check_settings = providers.Singleton(QuickCheckSettings)
+    batch_settings = providers.Singleton(BatchSettings)
+    diff_review_settings = providers.Singleton(DiffReviewSettings)
+
+    style_worker_pool = providers.Singleton(
+        StyleWorkerPool,
+        size=style_worker_settings.provided.size,
+        max_line_length=analyzer_settings.provided.max_line_length,
+        timeout=style_worker_settings.provided.timeout,
+        max_tasks_per_worker=style_worker_settings.provided.max_tasks_per_worker,
+        start_method=style_worker_settings.provided.start_method,
+    )
+
+    style_checker = providers.Selector(
+        analyzer_settings.provided.style_backend,
+        inprocess=providers.Singleton(
+            InProcessStyleChecker,
+            max_line_length=analyzer_settings.provided.max_line_length,
+        ),
+        subprocess=providers.Singleton(
+            SubprocessStyleChecker,
+            max_line_length=analyzer_settings.provided.max_line_length,
+            timeout=analyzer_settings.provided.style_timeout,
+        ),
+        pool=providers.Singleton(PooledStyleChecker, pool=style_worker_pool),
+    )
 
-    code_analyzer_service = providers.Factory(CodeAnalyzerService)
-    llm_provider = providers.Factory(
-        LangChainLLMProvider, settings=llm_settings, http_client=http_client
+    analysis_cache = providers.Singleton(
+        MemoryCache,
+        max_size=analysis_cache_settings.provided.max_size,
+        ttl_seconds=analysis_cache_settings.provided.ttl_seconds,
     )
 
-    full_review_code_tool = providers.Factory(
+    rule_engine = providers.Singleton(
+        RuleEngine, registry=providers.Singleton(build_default_registry)
+    )
+    unit_cache = providers.Selector(
+        analysis_cache_settings.provided.backend,
+        memory=providers.Singleton(
+            MemoryCache,
+            max_size=analysis_cache_settings.provided.unit_max_size,
+            ttl_seconds=analysis_cache_settings.provided.ttl_seconds,
+        ),
+        none=providers.Object(None),
+    )
+    unit_analyzer = providers.Singleton(
+        UnitAnalyzer, rule_engine=rule_engine, cache=unit_cache
+    )
+    local_code_analyzer = providers.Factory(
+        CodeAnalyzerService,
+        rule_engine=rule_engine,
+        style_checker=style_checker,
+        unit_analyzer=unit_analyzer,
+    )
+    process_code_analyzer = providers.Singleton(
+        ProcessPoolCodeAnalyzer,
+        max_workers=analyzer_settings.provided.process_workers,
+        max_line_length=analyzer_settings.provided.max_line_length,
+    )
+    instrumented_local_analyzer = providers.Factory(
+        InstrumentedCodeAnalyzer, analyzer=local_code_analyzer, metrics=metrics
+    )
+    code_analyzer = providers.Selector(
+        analyzer_settings.provided.executor_mode,
+        inline=instrumented_local_analyzer,
+        thread=instrumented_local_analyzer,
+        process=providers.Singleton(
+            InstrumentedCodeAnalyzer,
+            analyzer=process_code_analyzer,
+            metrics=metrics,
+            measure_parse=False,
+        ),
+    )
+    code_analyzer_service = providers.Selector(
+        analysis_cache_settings.provided.backend,
+        memory=providers.Singleton(
+            CachedCodeAnalyzer, analyzer=code_analyzer, cache=analysis_cache
+        ),
+        none=code_analyzer,
+    )
+    version_comparator = providers.Singleton(
+        VersionComparator, unit_analyzer=unit_analyzer
+    )
+
+    analysis_executor = providers.Singleton(
+        AnalysisExecutor,
+        max_workers=analyzer_settings.provided.executor_workers,
+        mode=analyzer_settings.provided.executor_mode,
+    )
+
+    batch_process_pool = providers.Singleton(
+        ProcessPoolExecutor,
+        max_workers=batch_settings.provided.process_workers,
+        mp_context=providers.Callable(multiprocessing.get_context, "spawn"),
+        initializer=init_batch_worker,
+        initargs=providers.List(analyzer_settings.provided.max_line_length),
+    )
+
+    routing_settings = providers.Singleton(ModelRoutingSettings)
+    tier_metrics = providers.Singleton(TierMetrics, metrics=metrics)
+    model_router = providers.Singleton(
+        ModelRouter,
+        enabled=routing_settings.provided.enabled,
+        operation_tiers=routing_settings.provided.operation_tiers,
+        analyzed_operations=routing_settings.provided.analyzed_operations,
+        escalate_on_critical=routing_settings.provided.escalate_on_critical,
+        large_file_lines=routing_settings.provided.large_file_lines,
+        escalate_on_invalid_output=routing_settings.provided.escalate_on_invalid_output,
+        min_answer_chars=routing_settings.provided.min_answer_chars,
+        require_code_block=routing_settings.provided.require_code_block,
+    )
+
+    llm_provider = providers.Singleton(
+        LangChainLLMProvider,
+        settings=llm_settings,
+        http_client=http_client,
+        http_async_client=async_http_client,
+        routing_settings=routing_settings,
+        tier_metrics=tier_metrics,
+    )
+
+    full_review_code_tool = providers.Singleton(
         FullReviewCodeTool,
         code_analyzer=code_analyzer_service,
+        metrics=metrics,
     )
-    quick_check_code_tool = providers.Factory(
+    quick_check_code_tool = providers.Singleton(
         QuickCheckCodeTool,
         code_analyzer=code_analyzer_service,
+        metrics=metrics,
     )
 
-    llm_service = providers.Factory(
-        LLMService,
+    llm_response_cache = providers.Selector(
+        llm_cache_settings.provided.backend,
+        memory=providers.Singleton(
+            LLMResponseCache,
+            cache=providers.Singleton(
+                MemoryCache,
+                max_size=llm_cache_settings.provided.max_size,
+                ttl_seconds=llm_cache_settings.provided.ttl_seconds,
+            ),
+            max_temperature=llm_cache_settings.provided.max_temperature,
+        ),
+        sqlite=providers.Singleton(
+            LLMResponseCache,
+            cache=providers.Singleton(
+                SQLiteCache,
+                path=llm_cache_settings.provided.sqlite_path,
+                max_size=llm_cache_settings.provided.max_size,
+                ttl_seconds=llm_cache_settings.provided.ttl_seconds,
+            ),
+            max_temperature=llm_cache_settings.provided.max_temperature,
+        ),
+        none=providers.Object(None),
+    )
+
+    agent_runtime = providers.Singleton(
+        AgentRuntime,
         llm_provider=llm_provider,
         full_review_code_tool=full_review_code_tool,
         quick_check_code_tool=quick_check_code_tool,
+        analysis_executor=analysis_executor,
+    )
+
+    token_counter = providers.Singleton(
+        TiktokenCounter, model_name=llm_settings.provided.openai_model
+    )
+    prompt_budget = providers.Singleton(
+        PromptBudget,
+        token_counter=token_counter,
+        context_window=llm_settings.provided.context_window,
+        max_output_tokens=llm_settings.provided.max_tokens,
+        overhead_tokens=llm_settings.provided.prompt_overhead_tokens,
+    )
+
+    admission_settings = providers.Singleton(AdmissionSettings)
+    llm_scheduler = providers.Singleton(
+        LLMScheduler,
+        enabled=admission_settings.provided.enabled,
+        max_concurrency=admission_settings.provided.max_concurrency,
+        operation_limits=admission_settings.provided.operation_limits,
+        priorities=admission_settings.provided.priorities,
+        default_priority=admission_settings.provided.default_priority,
+        max_queue=admission_settings.provided.max_queue,
+        max_wait_seconds=admission_settings.provided.max_wait_seconds,
+        requests_per_minute=llm_settings.provided.requests_per_minute,
+        tokens_per_minute=llm_settings.provided.tokens_per_minute,
+    )
+
+    llm_service = providers.Singleton(
+        LLMService,
+        agent_runtime=agent_runtime,
+        response_cache=llm_response_cache,
+        prompt_budget=prompt_budget,
+        pipeline=llm_settings.provided.pipeline,
+        scheduler=llm_scheduler,
+        model_router=model_router,
+        metrics=metrics,
     )
 
-    review_code_use_case = providers.Factory(
-        FullReviewCodeUseCase, llm_service=llm_service
+    coalescing_settings = providers.Singleton(CoalescingSettings)
+    single_flight = providers.Singleton(
+        SingleFlight, enabled=coalescing_settings.provided.enabled
     )
 
-    quick_check_use_case = providers.Factory(QuickCheckUseCase, llm_service=llm_service)
+    review_code_use_case = providers.Singleton(
+        FullReviewCodeUseCase, llm_service=llm_service, single_flight=single_flight
+    )
 
-    explain_issue_use_case = providers.Factory(
-        ExplainIssueUseCase, llm_service=llm_service
+    stream_review_code_use_case = providers.Singleton(
+        StreamReviewCodeUseCase,
+        llm_service=llm_service,
+        full_review_code_tool=full_review_code_tool,
+        analysis_executor=analysis_executor,
+    )
+
+    quick_check_use_case = providers.Singleton(
+        QuickCheckUseCase,
+        llm_service=llm_service,
+        quick_check_code_tool=quick_check_code_tool,
+        analysis_executor=analysis_executor,
+        settings=quick_check_settings,
+        single_flight=single_flight,
     )
 
-    compare_versions_use_case = providers.Factory(
-        CompareVersionsUseCase, llm_service=llm_service
+    review_diff_use_case = providers.Singleton(
+        DiffReviewUseCase,
+        llm_service=llm_service,
+        code_analyzer=code_analyzer_service,
+        analysis_executor=analysis_executor,
+        settings=diff_review_settings,
+        single_flight=single_flight,
+    )
+
+    batch_review_use_case = providers.Singleton(
+        BatchReviewUseCase,
+        llm_service=llm_service,
+        process_pool=batch_process_pool,
+        settings=batch_settings,
+    )
+
+    explain_issue_use_case = providers.Singleton(
+        ExplainIssueUseCase, llm_service=llm_service, single_flight=single_flight
+    )
+
+    compare_versions_use_case = providers.Singleton(
+        CompareVersionsUseCase,
+        llm_service=llm_service,
+        version_comparator=version_comparator,
+        analysis_executor=analysis_executor,
+        single_flight=single_flight,
+    )
+
+    job_settings = providers.Singleton(JobSettings)
+    job_store = providers.Singleton(
+        SQLiteJobStore,
+        path=job_settings.provided.sqlite_path,
+        result_ttl_seconds=job_settings.provided.result_ttl_seconds,
+        lease_seconds=job_settings.provided.lease_seconds,
+    )
+    # Свой клиент без прокси и пула LLM: callback уходят напрямую клиентам
+    webhook_http_client = providers.Singleton(
+        httpx.AsyncClient,
+        timeout=job_settings.provided.callback_timeout_seconds,
+        trust_env=False,
+    )
+    webhook_notifier = providers.Singleton(
+        WebhookNotifier,
+        http_client=webhook_http_client,
+        retries=job_settings.provided.callback_retries,
+        allowed_hosts=job_settings.provided.callback_allowed_hosts,
+        allowed_schemes=job_settings.provided.callback_allowed_schemes,
+    )
+    review_job_workers = providers.Singleton(
+        ReviewJobWorkers,
+        job_store=job_store,
+        review_code_use_case=review_code_use_case,
+        notifier=webhook_notifier,
+        workers=job_settings.provided.workers,
+        poll_interval_seconds=job_settings.provided.poll_interval_seconds,
+        max_attempts=job_settings.provided.max_attempts,
+        retry_backoff_seconds=job_settings.provided.retry_backoff_seconds,
+        lease_seconds=job_settings.provided.lease_seconds,
+    )
+    review_job_use_case = providers.Singleton(
+        ReviewJobUseCase,
+        job_store=job_store,
+        job_workers=review_job_workers,
+        notifier=webhook_notifier,
     )
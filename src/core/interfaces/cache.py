@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+
+class ICache(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        pass
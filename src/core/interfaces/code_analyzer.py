@@ -2,21 +2,30 @@ from abc import ABC, abstractmethod
 from typing import List
 
 from domain.entities.code_review import Improvement, Issue
+from domain.entities.parsed_source import CodeSource, ParsedSource
 
 
 class ICodeAnalyzer(ABC):
     @abstractmethod
-    def analyze_syntax(self, code: str) -> List[Issue]:
+    def parse(self, code: str) -> ParsedSource:
         pass
 
     @abstractmethod
-    def check_style(self, code: str) -> List[Issue]:
+    def analyze_syntax(self, code: CodeSource) -> List[Issue]:
         pass
 
     @abstractmethod
-    def detect_smells(self, code: str) -> List[Issue]:
+    def check_style(self, code: CodeSource) -> List[Issue]:
         pass
 
     @abstractmethod
-    def suggest_improvements(self, code: str) -> List[Improvement]:
+    def detect_smells(self, code: CodeSource) -> List[Issue]:
+        pass
+
+    @abstractmethod
+    def suggest_improvements(self, code: CodeSource) -> List[Improvement]:
+        pass
+
+    @abstractmethod
+    def fingerprint(self) -> str:
         pass
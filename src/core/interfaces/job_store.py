@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from domain.entities.review_job import ReviewJob
+
+
+class IJobStore(ABC):
+    @abstractmethod
+    def submit(
+        self, content_hash: str, code: str, callback_url: Optional[str] = None
+    ) -> ReviewJob:
+        """Создает задачу или возвращает уже существующую с тем же хешем
+
+        callback_url добавляется к адресам незавершенной задачи-дубликата.
+        """
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[ReviewJob]:
+        pass
+
+    @abstractmethod
+    def claim(self) -> Optional[ReviewJob]:
+        """Атомарно забирает самую старую готовую задачу и засчитывает попытку
+
+        Задача берется в аренду; задача с истекшей арендой снова доступна.
+        """
+        pass
+
+    @abstractmethod
+    def renew(self, job_id: str) -> bool:
+        """Продлевает аренду задачи; False — задача уже не за этим воркером"""
+        pass
+
+    @abstractmethod
+    def complete(self, job_id: str, result: str) -> bool:
+        """Записывает результат; False — аренда задачи ушла другому воркеру"""
+        pass
+
+    @abstractmethod
+    def fail(self, job_id: str, error: str) -> bool:
+        pass
+
+    @abstractmethod
+    def retry_later(self, job_id: str, delay_seconds: float) -> None:
+        """Возвращает задачу в очередь, не раньше чем через delay_seconds"""
+        pass
+
+    @abstractmethod
+    def defer(self, job_id: str, delay_seconds: float) -> None:
+        """Как retry_later, но попытка не засчитывается: задача не запускалась"""
+        pass
+
+    @abstractmethod
+    def recover(self) -> int:
+        """Возвращает в очередь задачи с истекшей арендой: их воркер упал
+
+        Задачи, которые еще выполняют живые узлы, не трогаются.
+        """
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        pass
@@ -1,19 +1,33 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 
 class ILLMService(ABC):
     @abstractmethod
-    def full_code_review_response(self, code: str) -> str:
+    async def afull_code_review_response(self, code: str) -> str:
         pass
 
     @abstractmethod
-    def quick_check_response(self, code: str) -> str:
+    async def afull_code_review(self, code: str) -> str:
+        """Как afull_code_review_response, но сбой LLM поднимается исключением"""
         pass
 
     @abstractmethod
-    def explain_issue_response(self, code: str, issue: str) -> str:
+    async def aquick_check_response(self, code: str) -> str:
         pass
 
     @abstractmethod
-    def compare_versions_response(self, original: str, improved: str) -> str:
+    async def aexplain_issue_response(self, code: str, issue: str) -> str:
+        pass
+
+    @abstractmethod
+    async def acompare_versions_response(self, original: str, improved: str) -> str:
+        pass
+
+    @abstractmethod
+    async def areview_diff_response(self, excerpt: str, findings: str) -> str:
+        pass
+
+    @abstractmethod
+    def astream_full_code_review(self, code: str) -> AsyncIterator[str]:
         pass
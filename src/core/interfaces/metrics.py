@@ -0,0 +1,41 @@
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class IMetrics(ABC):
+    @abstractmethod
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        pass
+
+    @abstractmethod
+    def observe_llm_call(
+        self,
+        tier: str,
+        model: str,
+        seconds: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        failed: bool = False,
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def observe_agent_iterations(self, operation: str, iterations: int) -> None:
+        pass
+
+    @abstractmethod
+    def observe_request(
+        self, method: str, route: str, status: int, seconds: float
+    ) -> None:
+        pass
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Замеряет блок кода как этап конвейера, в том числе при ошибке"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - started)
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from domain.entities.code_review import Issue
+from domain.entities.parsed_source import ParsedSource
+
+
+class IStyleChecker(ABC):
+    @abstractmethod
+    def check(self, source: ParsedSource) -> List[Issue]:
+        pass
+
+    @abstractmethod
+    def fingerprint(self) -> str:
+        pass
@@ -25,6 +25,11 @@ class Category(Enum):
     STYLE = "style"
 
 
+class AnalysisMode(Enum):
+    LLM = "llm"
+    STATIC = "static"
+
+
 class Issue(BaseModel):
     description: str
     severity: Severity
@@ -39,6 +44,26 @@ class Improvement(BaseModel):
     priority: int
 
 
+class FullReviewResult(BaseModel):
+    issues: List[Issue]
+    improvements: List[Improvement]
+    score: int
+    status: str
+
+    @property
+    def critical_issues_count(self) -> int:
+        return len([i for i in self.issues if i.severity == Severity.CRITICAL])
+
+
+class QuickCheckResult(BaseModel):
+    status: str
+    passed: bool
+    critical_count: int
+    security_count: int
+    syntax_issues: List[Issue]
+    critical_issues: List[Issue]
+
+
 class CodeReview(BaseModel):
     code: str
     context: str
@@ -0,0 +1,73 @@
+import ast
+import hashlib
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+
+@dataclass
+class ParsedSource:
+    """Исходный код, разобранный один раз и общий для всех проверок"""
+
+    code: str
+    _memo: Dict[str, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def of(cls, source: "CodeSource") -> "ParsedSource":
+        """Возвращает ParsedSource, не разбирая код повторно"""
+        if isinstance(source, ParsedSource):
+            return source
+        return cls(code=source)
+
+    @cached_property
+    def _parse_result(self) -> Tuple[Optional[ast.Module], Optional[Exception]]:
+        try:
+            return ast.parse(self.code), None
+        except (SyntaxError, ValueError) as e:
+            return None, e
+
+    @property
+    def is_parsed(self) -> bool:
+        return "_parse_result" in self.__dict__
+
+    @property
+    def tree(self) -> Optional[ast.Module]:
+        return self._parse_result[0]
+
+    @property
+    def parse_error(self) -> Optional[Exception]:
+        return self._parse_result[1]
+
+    @property
+    def syntax_error(self) -> Optional[SyntaxError]:
+        error = self.parse_error
+        return error if isinstance(error, SyntaxError) else None
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.code.splitlines(keepends=True)
+
+    @cached_property
+    def digest(self) -> str:
+        return hashlib.sha256(self.code.encode("utf-8", "surrogatepass")).hexdigest()
+
+    @property
+    def line_count(self) -> int:
+        return len(self.lines)
+
+    def segment(self, start: int, end: int) -> str:
+        """Возвращает строки с start по end включительно (нумерация с 1)"""
+        return "".join(self.lines[start - 1 : end])
+
+    def memo(self, key: str, factory: Callable[[], T]) -> T:
+        """Вычисляет производные данные один раз на весь запрос"""
+        if key not in self._memo:
+            self._memo[key] = factory()
+        return self._memo[key]
+
+
+CodeSource = Union[str, ParsedSource]
@@ -0,0 +1,30 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ReviewJob(BaseModel):
+    id: str
+    content_hash: str
+    status: JobStatus
+    code: str = Field(exclude=True)
+    # Адреса разных клиентов не раскрываются ни в ответах API, ни в callback
+    callback_urls: List[str] = Field(default_factory=list, exclude=True)
+    result: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.DONE, JobStatus.FAILED)
@@ -0,0 +1,18 @@
+from enum import Enum
+from typing import Any, Dict
+
+from pydantic import BaseModel, Field
+
+
+class ReviewStreamEventType(Enum):
+    REPORT = "report"
+    TOKEN = "token"
+    FILE = "file"
+    SUMMARY = "summary"
+    DONE = "done"
+    ERROR = "error"
+
+
+class ReviewStreamEvent(BaseModel):
+    event: ReviewStreamEventType
+    data: Dict[str, Any] = Field(default_factory=dict)
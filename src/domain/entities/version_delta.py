@@ -0,0 +1,19 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from domain.entities.code_review import Issue
+
+
+class VersionDelta(BaseModel):
+    fixed_issues: List[Issue] = Field(default_factory=list)
+    introduced_issues: List[Issue] = Field(default_factory=list)
+    unchanged_issues_count: int = 0
+    score_before: int
+    score_after: int
+    score_change: int
+    changed_units: List[str] = Field(default_factory=list)
+    added_units: List[str] = Field(default_factory=list)
+    removed_units: List[str] = Field(default_factory=list)
+    analyzed_units: int = 0
+    reused_units: int = 0
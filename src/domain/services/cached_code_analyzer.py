@@ -0,0 +1,62 @@
+import hashlib
+from typing import Any, Callable, Dict, Iterable, List, TypeVar
+
+from pydantic import BaseModel
+
+from core.interfaces.cache import ICache
+from core.interfaces.code_analyzer import ICodeAnalyzer
+from domain.entities.code_review import Improvement, Issue
+from domain.entities.parsed_source import CodeSource, ParsedSource
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class CachedCodeAnalyzer(ICodeAnalyzer):
+    """Кэширует детерминированные результаты анализа по хэшу кода и конфигурации"""
+
+    def __init__(self, analyzer: ICodeAnalyzer, cache: ICache):
+        self._analyzer = analyzer
+        self._cache = cache
+        self._fingerprint = analyzer.fingerprint()
+
+    def parse(self, code: str) -> ParsedSource:
+        return self._analyzer.parse(code)
+
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    def analyze_syntax(self, code: CodeSource) -> List[Issue]:
+        return self._cached("syntax", code, self._analyzer.analyze_syntax)
+
+    def check_style(self, code: CodeSource) -> List[Issue]:
+        return self._cached("style", code, self._analyzer.check_style)
+
+    def detect_smells(self, code: CodeSource) -> List[Issue]:
+        return self._cached("smells", code, self._analyzer.detect_smells)
+
+    def suggest_improvements(self, code: CodeSource) -> List[Improvement]:
+        return self._cached("improvements", code, self._analyzer.suggest_improvements)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    def cache_key(self, check: str, source: ParsedSource) -> str:
+        payload = f"{self._fingerprint}\0{check}\0{source.digest}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cached(
+        self, check: str, code: CodeSource, compute: Callable[[ParsedSource], List[T]]
+    ) -> List[T]:
+        source = ParsedSource.of(code)
+        key = self.cache_key(check, source)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return _copies(cached)
+        result = compute(source)
+        # Issue и Improvement изменяемы: кэш не делит объекты с вызывающим
+        self._cache.set(key, tuple(_copies(result)))
+        return result
+
+
+def _copies(items: Iterable[T]) -> List[T]:
+    return [item.model_copy(deep=True) for item in items]
@@ -0,0 +1,70 @@
+import ast
+import hashlib
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from domain.entities.parsed_source import ParsedSource
+
+MODULE_UNIT = "<module>"
+DEFINITION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+@dataclass(frozen=True)
+class DefinitionUnit:
+    """Определение верхнего уровня или остаток модуля вне определений"""
+
+    name: str
+    start: int
+    end: int
+    digest: Optional[str]
+    nodes: Tuple[ast.stmt, ...] = field(compare=False, repr=False)
+
+    @property
+    def tree(self) -> ast.Module:
+        return ast.Module(body=list(self.nodes), type_ignores=[])
+
+
+def normalize_segment(segment: str) -> str:
+    """Убирает отличия, не влияющие на результат правил: хвостовые пробелы"""
+    lines = [line.rstrip() for line in segment.splitlines()]
+    return "\n".join(lines).strip("\n")
+
+
+def segment_digest(segment: str) -> str:
+    normalized = normalize_segment(segment)
+    return hashlib.sha256(normalized.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def split_units(source: ParsedSource) -> List[DefinitionUnit]:
+    """Делит модуль на функции и классы верхнего уровня
+
+    Остальные инструкции собираются в один юнит без хэша: он зависит от
+    положения инструкций в файле и обычно невелик.
+    """
+    tree = source.tree
+    if tree is None:
+        return []
+
+    units: List[DefinitionUnit] = []
+    rest: List[ast.stmt] = []
+    seen: Counter = Counter()
+    for node in tree.body:
+        if not isinstance(node, DEFINITION_TYPES):
+            rest.append(node)
+            continue
+        start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+        end = node.end_lineno or node.lineno
+        kind = "class" if isinstance(node, ast.ClassDef) else "def"
+        base = f"{kind} {node.name}"
+        seen[base] += 1
+        name = base if seen[base] == 1 else f"{base}#{seen[base]}"
+        digest = segment_digest(source.segment(start, end))
+        units.append(DefinitionUnit(name, start, end, digest, (node,)))
+
+    if rest:
+        end = rest[-1].end_lineno or rest[-1].lineno
+        units.append(
+            DefinitionUnit(MODULE_UNIT, rest[0].lineno, end, None, tuple(rest))
+        )
+    return units
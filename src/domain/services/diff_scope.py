@@ -0,0 +1,67 @@
+import ast
+from typing import Dict, Iterable, List, Set, Tuple
+
+from domain.entities.code_review import Issue
+from domain.entities.parsed_source import ParsedSource
+
+DEFINITION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def definition_spans(source: ParsedSource) -> Dict[int, int]:
+    """Строка заголовка определения -> последняя строка его тела"""
+    tree = source.tree
+    if tree is None:
+        return {}
+    return {
+        node.lineno: node.end_lineno or node.lineno
+        for node in ast.walk(tree)
+        if isinstance(node, DEFINITION_TYPES)
+    }
+
+
+def issues_in_scope(
+    source: ParsedSource, issues: Iterable[Issue], changed_lines: Set[int]
+) -> List[Issue]:
+    """Оставляет проблемы, затронутые изменёнными строками
+
+    Проблема на заголовке функции или класса (длина, параметры) считается
+    затронутой, если изменилась любая строка этого определения.
+    """
+    spans = definition_spans(source)
+    result = []
+    for issue in issues:
+        line = issue.line_number
+        if line is None or line in changed_lines:
+            result.append(issue)
+            continue
+        end = spans.get(line)
+        if end is not None and any(line <= c <= end for c in changed_lines):
+            result.append(issue)
+    return result
+
+
+def changed_ranges(
+    changed_lines: Set[int], context: int, line_count: int
+) -> List[Tuple[int, int]]:
+    """Склеивает изменённые строки с контекстом в непересекающиеся диапазоны"""
+    ranges: List[Tuple[int, int]] = []
+    for line in sorted(changed_lines):
+        start, end = max(1, line - context), min(line_count, line + context)
+        if ranges and start <= ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+        else:
+            ranges.append((start, end))
+    return ranges
+
+
+def build_excerpt(source: ParsedSource, changed_lines: Set[int], context: int) -> str:
+    """Изменённые фрагменты с номерами строк; изменённые строки помечены «+»"""
+    blocks = []
+    for start, end in changed_ranges(changed_lines, context, source.line_count):
+        block = []
+        for number in range(start, end + 1):
+            marker = "+" if number in changed_lines else " "
+            text = source.lines[number - 1].rstrip("\r\n")
+            block.append(f"{number:>5} {marker} {text}")
+        blocks.append("\n".join(block))
+    return "\n  ...\n".join(blocks)
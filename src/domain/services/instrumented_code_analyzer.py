@@ -0,0 +1,54 @@
+from typing import Callable, List, TypeVar
+
+from core.interfaces.code_analyzer import ICodeAnalyzer
+from core.interfaces.metrics import IMetrics
+from domain.entities.code_review import Improvement, Issue
+from domain.entities.parsed_source import CodeSource, ParsedSource
+
+T = TypeVar("T")
+
+
+class InstrumentedCodeAnalyzer(ICodeAnalyzer):
+    """Замеряет этапы анализа: разбор AST отдельно от проверок
+
+    Разбор ленивый, поэтому он выполняется явно перед первой проверкой,
+    которой нужен. measure_parse=False для анализаторов, разбирающих код
+    в другом процессе: там локальный разбор был бы лишней работой.
+    """
+
+    def __init__(
+        self, analyzer: ICodeAnalyzer, metrics: IMetrics, measure_parse: bool = True
+    ):
+        self._analyzer = analyzer
+        self._metrics = metrics
+        self._measure_parse = measure_parse
+
+    def parse(self, code: str) -> ParsedSource:
+        return self._analyzer.parse(code)
+
+    def fingerprint(self) -> str:
+        return self._analyzer.fingerprint()
+
+    def analyze_syntax(self, code: CodeSource) -> List[Issue]:
+        return self._timed("analyze_syntax", code, self._analyzer.analyze_syntax)
+
+    def check_style(self, code: CodeSource) -> List[Issue]:
+        return self._timed("check_style", code, self._analyzer.check_style)
+
+    def detect_smells(self, code: CodeSource) -> List[Issue]:
+        return self._timed("detect_smells", code, self._analyzer.detect_smells)
+
+    def suggest_improvements(self, code: CodeSource) -> List[Improvement]:
+        return self._timed(
+            "suggest_improvements", code, self._analyzer.suggest_improvements
+        )
+
+    def _timed(
+        self, stage: str, code: CodeSource, check: Callable[[ParsedSource], List[T]]
+    ) -> List[T]:
+        source = ParsedSource.of(code)
+        if self._measure_parse and not source.is_parsed:
+            with self._metrics.stage("parse"):
+                _ = source.tree
+        with self._metrics.stage(stage):
+            return check(source)
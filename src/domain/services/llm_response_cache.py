@@ -0,0 +1,51 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from core.interfaces.cache import ICache
+
+
+def normalize_input(text: str) -> str:
+    """Приводит только CRLF к LF: пробелы и пустые строки анализатор учитывает"""
+    return text.replace("\r\n", "\n")
+
+
+class LLMResponseCache:
+    """Кэш ответов LLM с точным совпадением ключа"""
+
+    def __init__(self, cache: ICache, max_temperature: float = 0.3):
+        self._cache = cache
+        self._max_temperature = max_temperature
+
+    def is_cacheable(self, temperature: float) -> bool:
+        return temperature <= self._max_temperature
+
+    def key(
+        self,
+        operation: str,
+        inputs: Dict[str, str],
+        model: str,
+        temperature: float,
+        prompt_version: str,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "operation": operation,
+                "inputs": {k: normalize_input(v) for k, v in sorted(inputs.items())},
+                "model": model,
+                "temperature": temperature,
+                "prompt_version": prompt_version,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    def set(self, key: str, response: str) -> None:
+        self._cache.set(key, response)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
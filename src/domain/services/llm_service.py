@@ -1,99 +1,197 @@
-from langchain.tools import tool
+import asyncio
+import difflib
+import logging
+from contextlib import nullcontext
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Union,
+)
 
 from core.interfaces.llm_service import ILLMService
-from infra.langchain.llm_provider import LangChainLLMProvider
+from core.interfaces.metrics import IMetrics
+from domain.services.llm_response_cache import LLMResponseCache
+from domain.services.model_router import TIER_LARGE, TIER_SMALL, ModelRouter
+from domain.services.prompt_budget import PromptBudget
+from infra.concurrency.llm_scheduler import AdmissionRejected, LLMScheduler
+from infra.langchain.agent_runtime import AgentRuntime
+from infra.langchain.source_registry import SourceRegistry
 from infra.langchain.tools.full_review_code import FullReviewCodeTool
 from infra.langchain.tools.quick_check_code import QuickCheckCodeTool
 
+PROMPT_TEMPLATE_VERSION = "2"
+# Половину окна занимает отчёт анализа: в scratchpad агента или в самом запросе
+REPORT_SHARE = 2
+TRUNCATED_CODE_NOTE = "\n# ... код сокращён, чтобы поместиться в окно модели\n"
+TRUNCATED_ANSWER_NOTE = (
+    "\n[... ревью фрагмента сокращено, чтобы поместиться в окно модели]\n"
+)
+
+PIPELINE_AGENT = "agent"
+PIPELINE_DIRECT = "direct"
+PIPELINES = (PIPELINE_AGENT, PIPELINE_DIRECT)
+# Агент обращается к модели минимум дважды: за вызовом инструмента и за ответом
+AGENT_MODEL_CALLS = 2
+
+CodeMessage = Callable[[str, str], str]
+TierCall = Callable[[Optional[str]], Awaitable[str]]
+
+logger = logging.getLogger(__name__)
+
 
 class LLMService(ILLMService):
     def __init__(
         self,
-        llm_provider: LangChainLLMProvider,
-        full_review_code_tool: FullReviewCodeTool,
-        quick_check_code_tool: QuickCheckCodeTool,
+        agent_runtime: AgentRuntime,
+        response_cache: Optional[LLMResponseCache] = None,
+        prompt_budget: Optional[PromptBudget] = None,
+        pipeline: str = PIPELINE_AGENT,
+        scheduler: Optional[LLMScheduler] = None,
+        model_router: Optional[ModelRouter] = None,
+        metrics: Optional[IMetrics] = None,
     ):
-        self.llm_provider = llm_provider
-        self.full_review_code_tool = full_review_code_tool
-        self.quick_check_code_tool = quick_check_code_tool
-        self._setup_agent()
+        if pipeline not in PIPELINES:
+            raise ValueError(f"Неизвестный режим вызова LLM: {pipeline}")
+        self.agent_runtime = agent_runtime
+        self.llm_provider = agent_runtime.llm_provider
+        self.response_cache = response_cache
+        self.prompt_budget = prompt_budget
+        self.pipeline = pipeline
+        self.scheduler = scheduler
+        self.model_router = model_router
+        self.metrics = metrics
+        self._tools: Dict[str, Union[FullReviewCodeTool, QuickCheckCodeTool]] = {
+            "full_review": agent_runtime.full_review_code_tool,
+            "quick_check": agent_runtime.quick_check_code_tool,
+        }
 
-    def _setup_agent(self):
-        """Настраивает агента с инструментами"""
+    @property
+    def is_direct(self) -> bool:
+        return self.pipeline == PIPELINE_DIRECT
 
-        @tool
-        def full_review_code_tool(code: str) -> str:
-            """Проводит полное ревью Python кода и возвращает детальный анализ.
-
-            Args:
-                code: Python код для анализа
+    async def afull_code_review_response(self, code: str) -> str:
+        """Получает ответ от LLM с использованием инструментов"""
+        try:
+            return await self.afull_code_review(code)
+        except AdmissionRejected:
+            raise
+        except Exception as e:
+            return f"Ошибка при анализе кода: {str(e)}"
 
-            Returns:
-                Детальный отчет с найденными проблемами, улучшениями и рекомендациями
-            """
-            return self.full_review_code_tool.execute(code)
+    async def afull_code_review(self, code: str) -> str:
+        """Ответ LLM без перехвата ошибок: их обрабатывает вызывающий"""
+        return await self._areview_code("full_review", code, self._full_review_message)
 
-        @tool
-        def quick_check_tool(code: str) -> str:
-            """Быстрая проверка критических проблем в коде.
+    async def astream_full_code_review(self, code: str) -> AsyncIterator[str]:
+        """Отдает ответ LLM по токенам по мере генерации"""
+        if len(self._code_chunks(code, self._full_review_message)) > 1:
+            # Большой файл собирается map-reduce и отдаётся одним куском
+            yield await self.afull_code_review_response(code)
+            return
 
-            Args:
-                code: Python код для быстрой проверки
+        tier = await self._route("full_review", code)
+        operation = self._tiered(self._operation("full_review"), tier)
+        cache_key = self._cache_key(operation, {"code": code})
+        cached = self._cached(cache_key)
+        if cached is not None and self._trusted("full_review", tier, cached):
+            yield cached
+            return
 
-            Returns:
-                Краткий отчет о критических проблемах
-            """
-            return self.quick_check_code_tool.execute(code)
+        answer: List[str] = []
+        async for content in self._astream_review(code, tier, answer):
+            yield content
 
-        self.llm_provider.setup_agent([full_review_code_tool, quick_check_tool])
+        output = "".join(answer)
+        if output and self._trusted("full_review", tier, output):
+            self._store(cache_key, output)
 
-    def full_code_review_response(self, code: str) -> str:
+    async def aquick_check_response(self, code: str) -> str:
         """Получает ответ от LLM с использованием инструментов"""
+        try:
+            return await self._areview_code(
+                "quick_check", code, self._quick_check_message
+            )
+        except AdmissionRejected:
+            raise
+        except Exception as e:
+            return f"Ошибка при анализе кода: {str(e)}"
 
-        input_message = f"""
-        Пожалуйста, проанализируй следующий Python код:
+    async def aexplain_issue_response(self, code: str, issue: str) -> str:
+        """Объясняет конкретную проблему в коде"""
+        try:
+            return await self._aask(
+                "explain_issue",
+                {"code": code, "issue": issue},
+                self._explain_issue_message(self._fit_code(code, issue), issue),
+            )
+        except AdmissionRejected:
+            raise
+        except Exception as e:
+            return f"Ошибка объяснения: {str(e)}"
+
+    async def acompare_versions_response(self, original: str, improved: str) -> str:
+        """Сравнивает две версии кода"""
+        try:
+            return await self._aask(
+                "compare_versions",
+                {"original": original, "improved": improved},
+                self._compare_message(original, improved),
+            )
+        except AdmissionRejected:
+            raise
+        except Exception as e:
+            return f"Ошибка сравнения: {str(e)}"
+
+    async def areview_diff_response(self, excerpt: str, findings: str) -> str:
+        """Ревью только изменённых фрагментов файла"""
+        try:
+            return await self._aask(
+                "review_diff",
+                {"excerpt": excerpt, "findings": findings},
+                self._review_diff_message(excerpt, findings),
+            )
+        except AdmissionRejected:
+            raise
+        except Exception as e:
+            return f"Ошибка ревью изменений: {str(e)}"
+
+    @staticmethod
+    def _full_review_message(code: str, source_id: str) -> str:
+        return f"""
+        Пожалуйста, проанализируй следующий Python код (source_id: {source_id}):
         
         ```python
         {code}
         ```
         
-        1. Используй инструмент full_review_code_tool для полного анализа
+        1. Используй инструмент full_review_code_tool с source_id={source_id}
         2. На основе результата анализа предоставь исправленную версию кода
         """
 
-        try:
-            result = self.llm_provider.executor.invoke({"input": input_message})
-
-            return result["output"]
-
-        except Exception as e:
-            return f"Ошибка при анализе кода: {str(e)}"
-
-    def quick_check_response(self, code: str) -> str:
-        """Получает ответ от LLM с использованием инструментов"""
-
-        input_message = f"""
-        Пожалуйста, проанализируй следующий Python код:
+    @staticmethod
+    def _quick_check_message(code: str, source_id: str) -> str:
+        return f"""
+        Пожалуйста, проанализируй следующий Python код (source_id: {source_id}):
         
         ```python
         {code}
         ```
         
-        1. Используй инструмент quick_check_tool для быстрого анализа
+        1. Используй инструмент quick_check_tool с source_id={source_id}
         2. На основе результата анализа предоставь исправленную версию кода
         """
 
-        try:
-            result = self.llm_provider.executor.invoke({"input": input_message})
-
-            return result["output"]
-
-        except Exception as e:
-            return f"Ошибка при анализе кода: {str(e)}"
-
-    def explain_issue_response(self, code: str, issue: str) -> str:
-        """Объясняет конкретную проблему в коде"""
-        input_message = f"""
+    @staticmethod
+    def _explain_issue_message(code: str, issue: str) -> str:
+        return f"""
         Объясни следующую проблему в коде: {issue}
         
         Код:
@@ -104,15 +202,9 @@ class LLMService(ILLMService):
         Дай краткое объяснение проблемы и способ исправления.
         """
 
-        try:
-            result = self.llm_provider.executor.invoke({"input": input_message})
-            return result["output"]
-        except Exception as e:
-            return f"Ошибка объяснения: {str(e)}"
-
-    def compare_versions_response(self, original: str, improved: str) -> str:
-        """Сравнивает две версии кода"""
-        input_message = f"""
+    @staticmethod
+    def _compare_versions_message(original: str, improved: str) -> str:
+        return f"""
         Сравни две версии кода:
         
         Оригинальная версия:
@@ -128,8 +220,418 @@ class LLMService(ILLMService):
         Оцени улучшения и объясни разницу.
         """
 
+    @staticmethod
+    def _review_diff_message(excerpt: str, findings: str) -> str:
+        return f"""
+        Проведи ревью изменений в Python коде. Ниже только изменённые
+        фрагменты файла с номерами строк, изменённые строки отмечены «+»:
+
+        ```
+        {excerpt}
+        ```
+
+        Статический анализ изменённых строк уже выполнен, инструменты
+        вызывать не нужно:
+        {findings}
+
+        Оцени изменения и предложи исправления только для изменённых строк.
+        """
+
+    @staticmethod
+    def _direct_review_message(code: str, report: str) -> str:
+        return f"""
+        Пожалуйста, проанализируй следующий Python код:
+
+        ```python
+        {code}
+        ```
+
+        Результат статического анализа:
+        {report}
+
+        На основе результата анализа предоставь исправленную версию кода
+        """
+
+    @staticmethod
+    def _compare_diff_message(diff: str) -> str:
+        return f"""
+        Сравни две версии кода. Версии не помещаются в окно модели целиком,
+        поэтому ниже unified diff от оригинальной версии к улучшенной:
+
+        ```diff
+        {diff}
+        ```
+
+        Оцени улучшения и объясни разницу.
+        """
+
+    @staticmethod
+    def _reduce_message(parts: List[str]) -> str:
+        sections = "\n\n".join(
+            f"Фрагмент {i}:\n{part}" for i, part in enumerate(parts, 1)
+        )
+        return f"""
+        Ниже ревью отдельных фрагментов одного Python файла. Сведи их в единый
+        отчёт: общий список проблем без повторов, приоритетные исправления и
+        исправленный код фрагментов.
+
+        {sections}
+        """
+
+    def _code_chunks(self, code: str, build_message: CodeMessage) -> List[str]:
+        """Делит код по границам функций и классов, если он не влезает в окно"""
+        if self.prompt_budget is None:
+            return [code]
+        template = self.prompt_budget.count(
+            build_message("", SourceRegistry.source_id(""))
+        )
+        limit = (self.prompt_budget.available - template) // REPORT_SHARE
+        return self.prompt_budget.split_code(code, limit)
+
+    def _fit_code(self, code: str, issue: str) -> str:
+        """Первый кусок кода, помещающийся в окно вместе с остальным сообщением"""
+        if self.prompt_budget is None:
+            return code
+        message = self._explain_issue_message(code, issue)
+        if self.prompt_budget.fits(message):
+            return code
+        template = self.prompt_budget.count(self._explain_issue_message("", issue))
+        limit = self.prompt_budget.available - template
+        limit -= self.prompt_budget.count(TRUNCATED_CODE_NOTE)
+        return self.prompt_budget.split_code(code, limit)[0] + TRUNCATED_CODE_NOTE
+
+    def _compare_message(self, original: str, improved: str) -> str:
+        """Обе версии целиком, а если не влезают — только diff между ними"""
+        message = self._compare_versions_message(original, improved)
+        if self.prompt_budget is None or self.prompt_budget.fits(message):
+            return message
+        diff = "".join(
+            difflib.unified_diff(
+                original.splitlines(keepends=True),
+                improved.splitlines(keepends=True),
+                "original.py",
+                "improved.py",
+            )
+        )
+        limit = self.prompt_budget.available - self.prompt_budget.count(
+            self._compare_diff_message("")
+        )
+        self.prompt_budget.check_limit(limit)
+        return self._compare_diff_message(
+            self.prompt_budget.pack(diff.splitlines(keepends=True), limit)[0]
+        )
+
+    def _reduce_groups(self, answers: List[str]) -> List[List[str]]:
+        """Группы ответов фрагментов, каждая помещается в один вызов свёртки
+
+        Ответ длиннее половины окна свёртки обрезается, чтобы любые два
+        ответа поместились вместе и свёртка сходилась.
+        """
+        budget = self.prompt_budget
+        if budget is None:
+            return [answers]
+        limit = (budget.available - budget.count(self._reduce_message(["", ""]))) // 2
+        answers = [budget.truncate(a, limit, TRUNCATED_ANSWER_NOTE) for a in answers]
+        groups: List[List[str]] = []
+        for answer in answers:
+            if groups and budget.fits(self._reduce_message(groups[-1] + [answer])):
+                groups[-1].append(answer)
+            else:
+                groups.append([answer])
+        if len(groups) == len(answers):
+            # Каждый ответ крупный: сворачиваем хотя бы попарно, чтобы сойтись
+            groups = [answers[i : i + 2] for i in range(0, len(answers), 2)]
+        return groups
+
+    async def _areview_code(
+        self, operation: str, code: str, build_message: CodeMessage
+    ) -> str:
+        """Ревью кода; куски большого файла отправляются параллельно"""
+        tier = await self._route(operation, code)
+        answers = await asyncio.gather(
+            *(
+                self._ainvoke_code(operation, chunk, build_message, tier)
+                for chunk in self._code_chunks(code, build_message)
+            )
+        )
+        while len(answers) > 1:
+            answers = await asyncio.gather(
+                *(
+                    self._acomplete(
+                        f"{operation}_reduce",
+                        {"parts": "\0".join(group)},
+                        self._reduce_message(group),
+                        tier,
+                    )
+                    for group in self._reduce_groups(list(answers))
+                )
+            )
+        return answers[0]
+
+    def _operation(self, operation: str) -> str:
+        """Ответы разных режимов не смешиваются в кэше"""
+        return f"direct_{operation}" if self.is_direct else operation
+
+    async def _astream_review(
+        self, code: str, tier: Optional[str], answer: List[str]
+    ) -> AsyncIterator[str]:
+        """Токены итогового ответа; в answer копится то, что можно кэшировать"""
+        if self.is_direct:
+            report = await self.agent_runtime.analysis_executor.run(
+                self._tools["full_review"].execute, code
+            )
+            input_message = self._direct_review_message(code, report)
+            async with self._admit("full_review", input_message):
+                async for content in self.llm_provider.astream(
+                    input_message, tier=tier
+                ):
+                    answer.append(content)
+                    yield content
+            return
+
+        with self.agent_runtime.sources.registered(code) as source_id:
+            input_message = self._full_review_message(code, source_id)
+            final_turn = _FinalTurnStream()
+            async with self._admit("full_review", input_message, AGENT_MODEL_CALLS):
+                async for event in self.agent_runtime.executor_for(tier).astream_events(
+                    {"input": input_message}, version="v2"
+                ):
+                    for content in final_turn.feed(event):
+                        yield content
+            answer.extend(final_turn.answer)
+
+    async def _aask(
+        self, operation: str, inputs: Dict[str, str], input_message: str
+    ) -> str:
+        async def call(tier: Optional[str]) -> str:
+            if self.is_direct:
+                return await self._acomplete(
+                    self._operation(operation), inputs, input_message, tier
+                )
+            return await self._ainvoke(operation, inputs, input_message, tier)
+
+        return await self._acascade(operation, await self._route(operation), call)
+
+    async def _ainvoke_code(
+        self,
+        operation: str,
+        code: str,
+        build_message: CodeMessage,
+        tier: Optional[str] = None,
+    ) -> str:
+        async def call(tier: Optional[str]) -> str:
+            if self.is_direct:
+                report = await self.agent_runtime.analysis_executor.run(
+                    self._tools[operation].execute, code
+                )
+                return await self._acomplete(
+                    self._operation(operation),
+                    {"code": code},
+                    self._direct_review_message(code, report),
+                    tier,
+                )
+            with self.agent_runtime.sources.registered(code) as source_id:
+                return await self._ainvoke(
+                    operation, {"code": code}, build_message(code, source_id), tier
+                )
+
+        return await self._acascade(operation, tier, call)
+
+    async def _route(self, operation: str, code: Optional[str] = None) -> Optional[str]:
+        """Уровень модели для запроса; None — каскад выключен"""
+        router = self.model_router
+        if router is None or not router.enabled:
+            return None
+        critical_issues = 0
+        if code is not None and router.needs_analysis(operation):
+            result = await self.agent_runtime.analysis_executor.run(
+                self.agent_runtime.full_review_code_tool.analyze, code
+            )
+            critical_issues = result.critical_issues_count
+        return router.route(operation, code, critical_issues).tier
+
+    async def _acascade(
+        self, operation: str, tier: Optional[str], call: TierCall
+    ) -> str:
+        """Ответ дешевой модели, а если он не прошел проверку — большой"""
+        router = self.model_router
+        if tier != TIER_SMALL or router is None:
+            return await call(tier)
         try:
-            result = self.llm_provider.executor.invoke({"input": input_message})
-            return result["output"]
+            answer = await call(tier)
+        except AdmissionRejected:
+            raise
         except Exception as e:
-            return f"Ошибка сравнения: {str(e)}"
+            logger.warning("Дешевая модель не ответила (%s), запрос к большой", e)
+            router.escalated("error")
+            return await call(TIER_LARGE)
+        if not router.should_escalate(operation, answer):
+            return answer
+        router.escalated("invalid_output")
+        return await call(TIER_LARGE)
+
+    async def _acomplete(
+        self,
+        operation: str,
+        inputs: Dict[str, str],
+        input_message: str,
+        tier: Optional[str] = None,
+    ) -> str:
+        cache_key = self._cache_key(self._tiered(operation, tier), inputs)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+
+        async with self._admit(operation, input_message):
+            output = await self.llm_provider.acomplete(input_message, tier=tier)
+
+        self._store(cache_key, output)
+        return output
+
+    async def _ainvoke(
+        self,
+        operation: str,
+        inputs: Dict[str, str],
+        input_message: str,
+        tier: Optional[str] = None,
+    ) -> str:
+        """Асинхронный вызов агента, не занимающий поток на время ожидания LLM"""
+        cache_key = self._cache_key(self._tiered(operation, tier), inputs)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+
+        async with self._admit(operation, input_message, AGENT_MODEL_CALLS):
+            result = await self.agent_runtime.executor_for(tier).ainvoke(
+                {"input": input_message}
+            )
+        self._observe_iterations(operation, result)
+        output = result["output"]
+
+        self._store(cache_key, output)
+        return output
+
+    def _observe_iterations(self, operation: str, result: Dict[str, Any]) -> None:
+        """Ходы агента: по одному на каждый вызов инструмента и итоговый ответ"""
+        if self.metrics is not None:
+            steps = result.get("intermediate_steps") or []
+            self.metrics.observe_agent_iterations(
+                _scheduled_operation(operation), len(steps) + 1
+            )
+
+    def _trusted(self, operation: str, tier: Optional[str], answer: str) -> bool:
+        """Ответ дешевой модели, уже отданный потоком, кэшируется после проверки"""
+        router = self.model_router
+        if tier != TIER_SMALL or router is None:
+            return True
+        return not router.should_escalate(operation, answer)
+
+    def _tiered(self, operation: str, tier: Optional[str]) -> str:
+        """Ответы моделей разных уровней хранятся в кэше раздельно"""
+        if tier is None:
+            return operation
+        return f"{operation}@{self.llm_provider.model_for(tier)}"
+
+    def _admit(
+        self, operation: str, input_message: str, calls: int = 1
+    ) -> AsyncContextManager:
+        """Слот планировщика на один вызов; квота TPM считается с запасом"""
+        if self.scheduler is None:
+            return nullcontext()
+        tokens = 0
+        if self.prompt_budget is not None:
+            tokens = (
+                self.prompt_budget.count(input_message) * calls
+                + self.prompt_budget.max_output_tokens
+            )
+        return self.scheduler.admit(
+            _scheduled_operation(operation), tokens=tokens, requests=calls
+        )
+
+    def _cached(self, cache_key: Optional[str]) -> Optional[str]:
+        if cache_key is None or self.response_cache is None:
+            return None
+        return self.response_cache.get(cache_key)
+
+    def _store(self, cache_key: Optional[str], output: str) -> None:
+        if cache_key is not None and self.response_cache is not None:
+            self.response_cache.set(cache_key, output)
+
+    def _cache_key(self, operation: str, inputs: Dict[str, str]) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        temperature = self.llm_provider.temperature
+        if not self.response_cache.is_cacheable(temperature):
+            return None
+        return self.response_cache.key(
+            operation,
+            inputs,
+            model=self.llm_provider.model_name,
+            temperature=temperature,
+            prompt_version=PROMPT_TEMPLATE_VERSION,
+        )
+
+
+class _FinalTurnStream:
+    """Отделяет итоговый ответ агента от ходов, где модель вызывает инструмент
+
+    Текст хода копится по run_id и отдается, только если ход закончился без
+    вызова инструмента. Ходы после результата инструмента — ожидаемый
+    итоговый ответ — идут клиенту сразу, по токенам; если такой ход все же
+    вызовет инструмент, его поток обрывается и в кэш он не попадает.
+    """
+
+    def __init__(self) -> None:
+        self.answer: List[str] = []
+        self._tool_returned = False
+        self._live: Set[str] = set()
+        self._tool_turns: Set[str] = set()
+        self._buffers: Dict[str, List[str]] = {}
+
+    def feed(self, event: Mapping[str, Any]) -> List[str]:
+        """Возвращает куски текста, которые можно отдать клиенту сейчас"""
+        kind = event["event"]
+        run_id = str(event.get("run_id"))
+        if kind == "on_tool_end":
+            self._tool_returned = True
+        elif kind == "on_chat_model_start":
+            self._buffers[run_id] = []
+            if self._tool_returned:
+                self._live.add(run_id)
+        elif kind == "on_chat_model_stream":
+            return self._chunk(run_id, event["data"]["chunk"])
+        elif kind == "on_chat_model_end":
+            return self._end(run_id, event["data"].get("output"))
+        return []
+
+    def _chunk(self, run_id: str, chunk: Any) -> List[str]:
+        if run_id in self._tool_turns:
+            return []
+        if getattr(chunk, "tool_call_chunks", None):
+            self._tool_turn(run_id)
+            return []
+        content = chunk.content
+        if not (isinstance(content, str) and content):
+            return []
+        self._buffers.setdefault(run_id, []).append(content)
+        return [content] if run_id in self._live else []
+
+    def _end(self, run_id: str, output: Any) -> List[str]:
+        if getattr(output, "tool_calls", None):
+            self._tool_turn(run_id)
+        buffered = self._buffers.pop(run_id, None)
+        if run_id in self._tool_turns or buffered is None:
+            return []
+        self.answer.extend(buffered)
+        return [] if run_id in self._live else buffered
+
+    def _tool_turn(self, run_id: str) -> None:
+        self._tool_turns.add(run_id)
+        self._buffers.pop(run_id, None)
+        self._live.discard(run_id)
+
+
+def _scheduled_operation(operation: str) -> str:
+    """Кусок map-reduce и его свёртка делят лимит исходной операции"""
+    operation = operation.removeprefix("direct_")
+    return operation.removesuffix("_reduce")
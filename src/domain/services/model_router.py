@@ -0,0 +1,118 @@
+import ast
+import re
+import textwrap
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+TIER_SMALL = "small"
+TIER_LARGE = "large"
+TIERS = (TIER_SMALL, TIER_LARGE)
+
+# Операции, в ответе которых модель обязана вернуть исправленный код
+CODE_OPERATIONS = ("full_review", "quick_check")
+# Язык блока — первое слово после ```; проверяются только блоки Python
+CODE_BLOCK = re.compile(r"```[ \t]*([\w+-]*)[^\n]*\n(.*?)```", re.DOTALL)
+PYTHON_TAGS = ("", "python", "py", "python3")
+
+
+@dataclass(frozen=True)
+class RoutingDecision:
+    tier: str
+    reason: str
+
+
+class ModelRouter:
+    """Выбирает уровень модели: дешевая по умолчанию, большая по правилам"""
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        operation_tiers: Optional[Dict[str, str]] = None,
+        analyzed_operations: Optional[List[str]] = None,
+        escalate_on_critical: bool = True,
+        large_file_lines: int = 300,
+        escalate_on_invalid_output: bool = True,
+        min_answer_chars: int = 40,
+        require_code_block: bool = True,
+    ):
+        self.enabled = enabled
+        self.operation_tiers = operation_tiers or {}
+        for tier in self.operation_tiers.values():
+            if tier not in TIERS:
+                raise ValueError(f"Неизвестный уровень модели: {tier}")
+        self.analyzed_operations = analyzed_operations or []
+        self.escalate_on_critical = escalate_on_critical
+        self.large_file_lines = large_file_lines
+        self.escalate_on_invalid_output = escalate_on_invalid_output
+        self.min_answer_chars = min_answer_chars
+        self.require_code_block = require_code_block
+        self._lock = threading.Lock()
+        self._decisions: Dict[str, int] = {}
+
+    def needs_analysis(self, operation: str) -> bool:
+        """Нужен ли статический анализ, чтобы выбрать уровень"""
+        return (
+            self.enabled
+            and self.escalate_on_critical
+            and operation in self.analyzed_operations
+            and self._initial_tier(operation) == TIER_SMALL
+        )
+
+    def route(
+        self, operation: str, code: Optional[str] = None, critical_issues: int = 0
+    ) -> RoutingDecision:
+        tier = self._initial_tier(operation)
+        decision = RoutingDecision(tier, "operation")
+        if tier == TIER_SMALL and code is not None:
+            if operation in self.analyzed_operations:
+                if self.escalate_on_critical and critical_issues:
+                    decision = RoutingDecision(TIER_LARGE, "critical_issues")
+                elif code.count("\n") + 1 > self.large_file_lines:
+                    decision = RoutingDecision(TIER_LARGE, "large_file")
+        self._count(decision)
+        return decision
+
+    def should_escalate(self, operation: str, answer: str) -> bool:
+        """Ответ дешевой модели не прошел проверку и нужна большая"""
+        return self.escalate_on_invalid_output and not self.is_valid(operation, answer)
+
+    def is_valid(self, operation: str, answer: str) -> bool:
+        text = (answer or "").strip()
+        if len(text) < self.min_answer_chars:
+            return False
+        if operation not in CODE_OPERATIONS:
+            return True
+
+        blocks = [
+            textwrap.dedent(block)
+            for tag, block in CODE_BLOCK.findall(text)
+            if tag.lower() in PYTHON_TAGS
+        ]
+        if not blocks:
+            return not self.require_code_block
+        # Достаточно одного разбираемого блока: остальные бывают фрагментами
+        return any(_parses(block) for block in blocks)
+
+    def escalated(self, reason: str) -> None:
+        self._count(RoutingDecision(TIER_LARGE, f"escalated_{reason}"))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"enabled": self.enabled, "decisions": dict(self._decisions)}
+
+    def _initial_tier(self, operation: str) -> str:
+        return self.operation_tiers.get(operation, TIER_LARGE)
+
+    def _count(self, decision: RoutingDecision) -> None:
+        key = f"{decision.tier}:{decision.reason}"
+        with self._lock:
+            self._decisions[key] = self._decisions.get(key, 0) + 1
+
+
+def _parses(code: str) -> bool:
+    try:
+        ast.parse(code)
+    except (SyntaxError, ValueError):
+        return False
+    return True
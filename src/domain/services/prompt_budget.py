@@ -0,0 +1,113 @@
+from typing import List, Tuple
+
+from core.interfaces.token_counter import ITokenCounter
+from domain.entities.parsed_source import ParsedSource
+
+# Меньшие куски дробят код до отдельных строк и плодят вызовы модели
+MIN_CHUNK_TOKENS = 32
+
+
+class PromptBudget:
+    """Бюджет токенов запроса: окно модели минус ответ и служебная часть"""
+
+    def __init__(
+        self,
+        token_counter: ITokenCounter,
+        context_window: int,
+        max_output_tokens: int,
+        overhead_tokens: int = 0,
+    ):
+        self.token_counter = token_counter
+        self.context_window = context_window
+        self.max_output_tokens = max_output_tokens
+        self.overhead_tokens = overhead_tokens
+        if self.available <= 0:
+            raise ValueError(
+                f"Окно модели {context_window} не вмещает ответ {max_output_tokens} "
+                f"и служебную часть {overhead_tokens} токенов"
+            )
+
+    @property
+    def available(self) -> int:
+        """Сколько токенов можно отдать под сообщение пользователя"""
+        return self.context_window - self.max_output_tokens - self.overhead_tokens
+
+    def count(self, text: str) -> int:
+        return self.token_counter.count(text)
+
+    def fits(self, text: str) -> bool:
+        return self.count(text) <= self.available
+
+    def split_code(self, code: str, limit: int) -> List[str]:
+        """Режет код на непрерывные куски не больше limit токенов
+
+        Границы проходят между инструкциями верхнего уровня, поэтому каждая
+        функция и класс попадают в кусок целиком, если помещаются в лимит.
+        """
+        self.check_limit(limit)
+        if self.count(code) <= limit:
+            return [code]
+
+        source = ParsedSource(code=code)
+        pieces: List[str] = []
+        for start, end in self._statement_ranges(source):
+            segment = source.segment(start, end)
+            if self.count(segment) <= limit:
+                pieces.append(segment)
+            else:
+                pieces.extend(self.pack(source.lines[start - 1 : end], limit))
+        return self.pack(pieces, limit)
+
+    def check_limit(self, limit: int) -> None:
+        """Шаблон сообщения оставил слишком мало места под код"""
+        if limit < MIN_CHUNK_TOKENS:
+            raise ValueError(
+                f"Под код остается {limit} токенов из {self.available}, "
+                f"нужно хотя бы {MIN_CHUNK_TOKENS}"
+            )
+
+    def truncate(self, text: str, limit: int, note: str = "") -> str:
+        """Начало текста по строкам, вместе с note не больше limit токенов"""
+        if self.count(text) <= limit:
+            return text
+        limit -= self.count(note)
+        self.check_limit(limit)
+        head = self.pack(text.splitlines(keepends=True), limit)[0]
+        # Первая строка сама длиннее лимита: режем по символам пропорционально
+        while (tokens := self.count(head)) > limit:
+            head = head[: len(head) * limit // tokens]
+        return head + note
+
+    def pack(self, parts: List[str], limit: int, separator: str = "") -> List[str]:
+        """Жадно склеивает соседние части, пока сумма помещается в limit"""
+        packed: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+        separator_tokens = self.count(separator) if separator else 0
+        for part in parts:
+            tokens = self.count(part)
+            extra = separator_tokens if current else 0
+            if current and current_tokens + extra + tokens > limit:
+                packed.append(separator.join(current))
+                current, current_tokens, extra = [], 0, 0
+            current.append(part)
+            current_tokens += extra + tokens
+        if current:
+            packed.append(separator.join(current))
+        return packed
+
+    @staticmethod
+    def _statement_ranges(source: ParsedSource) -> List[Tuple[int, int]]:
+        """Диапазоны строк инструкций верхнего уровня, покрывающие весь файл"""
+        tree = source.tree
+        line_count = source.line_count
+        if tree is None or not tree.body:
+            return [(line, line) for line in range(1, line_count + 1)]
+
+        starts = []
+        for node in tree.body:
+            decorators = getattr(node, "decorator_list", [])
+            starts.append(min([node.lineno] + [d.lineno for d in decorators]))
+        starts[0] = 1
+        ends = [start - 1 for start in starts[1:]] + [line_count]
+        return list(zip(starts, ends))
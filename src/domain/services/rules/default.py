@@ -0,0 +1,20 @@
+from domain.services.rules.docs import MissingDocstringRule
+from domain.services.rules.engine import RuleRegistry
+from domain.services.rules.security import DangerousCallRule
+from domain.services.rules.smells import (
+    EmptyExceptRule,
+    LongFunctionRule,
+    TooManyParamsRule,
+)
+
+
+def build_default_registry() -> RuleRegistry:
+    return RuleRegistry(
+        [
+            LongFunctionRule(),
+            TooManyParamsRule(),
+            EmptyExceptRule(),
+            DangerousCallRule(),
+            MissingDocstringRule(),
+        ]
+    )
@@ -0,0 +1,17 @@
+import ast
+
+from domain.services.rules.engine import Rule, RuleFindings
+
+
+class MissingDocstringRule(Rule):
+    node_types = (ast.FunctionDef, ast.ClassDef)
+
+    def check(self, node: ast.AST, findings: RuleFindings) -> None:
+        if not isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            return
+        if ast.get_docstring(node):
+            return
+        if isinstance(node, ast.ClassDef):
+            findings.classes_without_docs.append(node.name)
+        else:
+            findings.functions_without_docs.append(node.name)
@@ -0,0 +1,75 @@
+import ast
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple, Type
+
+from pydantic import BaseModel, Field
+
+from domain.entities.code_review import Issue
+
+
+class RuleFindings(BaseModel):
+    issues: List[Issue] = Field(default_factory=list)
+    functions_without_docs: List[str] = Field(default_factory=list)
+    classes_without_docs: List[str] = Field(default_factory=list)
+
+
+class Rule(ABC):
+    node_types: Tuple[Type[ast.AST], ...] = ()
+
+    @abstractmethod
+    def check(self, node: ast.AST, findings: RuleFindings) -> None:
+        pass
+
+    @property
+    def signature(self) -> str:
+        """Описание правила вместе с его настройками"""
+        params = ",".join(f"{k}={v!r}" for k, v in sorted(vars(self).items()))
+        return f"{type(self).__name__}({params})"
+
+
+class RuleRegistry:
+    def __init__(self, rules: List[Rule] | None = None):
+        self._rules: List[Rule] = []
+        self._dispatch: Dict[Type[ast.AST], List[Rule]] = {}
+        for rule in rules or []:
+            self.register(rule)
+
+    @property
+    def rules(self) -> List[Rule]:
+        return list(self._rules)
+
+    def register(self, rule: Rule) -> None:
+        if not rule.node_types:
+            raise ValueError(f"Правило {type(rule).__name__} не указало типы узлов")
+        self._rules.append(rule)
+        self._dispatch.clear()
+
+    def rules_for(self, node_type: Type[ast.AST]) -> List[Rule]:
+        """Возвращает правила, которым интересен данный тип узла"""
+        rules = self._dispatch.get(node_type)
+        if rules is None:
+            rules = [r for r in self._rules if issubclass(node_type, r.node_types)]
+            self._dispatch[node_type] = rules
+        return rules
+
+    def fingerprint(self) -> str:
+        return ";".join(rule.signature for rule in self._rules)
+
+
+class RuleEngine:
+    """Запускает все правила за один обход AST"""
+
+    def __init__(self, registry: RuleRegistry):
+        self._registry = registry
+
+    @property
+    def registry(self) -> RuleRegistry:
+        return self._registry
+
+    def run(self, tree: ast.AST) -> RuleFindings:
+        findings = RuleFindings()
+        rules_for = self._registry.rules_for
+        for node in ast.walk(tree):
+            for rule in rules_for(type(node)):
+                rule.check(node, findings)
+        return findings
@@ -0,0 +1,28 @@
+import ast
+from typing import FrozenSet
+
+from domain.entities.code_review import Issue, IssueType, Severity
+from domain.services.rules.engine import Rule, RuleFindings
+
+ISSUE_SUGGEST_FIND_SOLUTION = "Найдите альтернативное решение"
+
+
+class DangerousCallRule(Rule):
+    node_types = (ast.Call,)
+
+    def __init__(self, names: FrozenSet[str] = frozenset({"eval", "exec"})):
+        self.names = names
+
+    def check(self, node: ast.AST, findings: RuleFindings) -> None:
+        if not isinstance(node, ast.Call):
+            return
+        if isinstance(node.func, ast.Name) and node.func.id in self.names:
+            findings.issues.append(
+                Issue(
+                    description=f"Использование {node.func.id}() небезопасно",
+                    severity=Severity.CRITICAL,
+                    issue_type=IssueType.SECURITY,
+                    line_number=node.lineno,
+                    suggestion=ISSUE_SUGGEST_FIND_SOLUTION,
+                )
+            )
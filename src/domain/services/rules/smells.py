@@ -0,0 +1,74 @@
+import ast
+
+from domain.entities.code_review import Issue, IssueType, Severity
+from domain.services.rules.engine import Rule, RuleFindings
+
+ISSUE_SUGGEST_SPLIT_FUNC = "Разбейте функцию на более мелкие части"
+ISSUE_SUGGEST_MANY_PARAM = "Используйте dataclass или объединяйте связанные параметры"
+ISSUE_SUGGEST_ADD_LOG = "Добавьте обработку исключения или логирование"
+
+
+class LongFunctionRule(Rule):
+    node_types = (ast.FunctionDef,)
+
+    def __init__(self, max_lines: int = 20):
+        self.max_lines = max_lines
+
+    def check(self, node: ast.AST, findings: RuleFindings) -> None:
+        if not isinstance(node, ast.FunctionDef):
+            return
+        lines_count = (node.end_lineno or 0) - node.lineno
+        if lines_count > self.max_lines:
+            findings.issues.append(
+                Issue(
+                    description=f"Функция '{node.name}' \
+                        слишком длинная ({lines_count} строк)",
+                    severity=Severity.WARNING,
+                    issue_type=IssueType.SMELL,
+                    line_number=node.lineno,
+                    suggestion=ISSUE_SUGGEST_SPLIT_FUNC,
+                )
+            )
+
+
+class TooManyParamsRule(Rule):
+    node_types = (ast.FunctionDef,)
+
+    def __init__(self, max_params: int = 5):
+        self.max_params = max_params
+
+    def check(self, node: ast.AST, findings: RuleFindings) -> None:
+        if not isinstance(node, ast.FunctionDef):
+            return
+        param_count = len(node.args.args)
+        if param_count > self.max_params:
+            findings.issues.append(
+                Issue(
+                    description=f"Функция '{node.name}' \
+                        имеет много параметров ({param_count})",
+                    severity=Severity.WARNING,
+                    issue_type=IssueType.SMELL,
+                    line_number=node.lineno,
+                    suggestion=ISSUE_SUGGEST_MANY_PARAM,
+                )
+            )
+
+
+class EmptyExceptRule(Rule):
+    node_types = (ast.ExceptHandler,)
+
+    def check(self, node: ast.AST, findings: RuleFindings) -> None:
+        if not isinstance(node, ast.ExceptHandler):
+            return
+        if not node.body or (
+            len(node.body) == 1 and isinstance(node.body[0], ast.Pass)
+        ):
+            findings.issues.append(
+                Issue(
+                    description="Пустой except блок",
+                    severity=Severity.CRITICAL,
+                    issue_type=IssueType.SMELL,
+                    line_number=node.lineno,
+                    suggestion=ISSUE_SUGGEST_ADD_LOG,
+                )
+            )
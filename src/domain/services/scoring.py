@@ -0,0 +1,24 @@
+from typing import List
+
+from domain.entities.code_review import Issue, Severity
+
+
+def calculate_score(issues: List[Issue]) -> int:
+    score = 10
+    for issue in issues:
+        if issue.severity == Severity.CRITICAL:
+            score -= 3
+        elif issue.severity == Severity.WARNING:
+            score -= 1
+    return max(0, score)
+
+
+def determine_status(score: int, issues: List[Issue]) -> str:
+    if any(issue.severity == Severity.CRITICAL for issue in issues):
+        return "КРИТИЧНО"
+    elif score >= 8:
+        return "ОТЛИЧНО"
+    elif score >= 6:
+        return "ХОРОШО"
+    else:
+        return "ТРЕБУЕТ ДОРАБОТКИ"
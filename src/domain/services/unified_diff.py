@@ -0,0 +1,129 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+NO_NEWLINE_MARKER = "\\"
+
+
+class PatchError(ValueError):
+    """Diff не разобран или не совпадает с исходным файлом"""
+
+
+@dataclass
+class Hunk:
+    old_start: int
+    old_length: int
+    new_start: int
+    new_length: int
+    lines: List[str] = field(default_factory=list)
+
+
+@dataclass
+class PatchedFile:
+    code: str
+    path: Optional[str]
+    changed_lines: Set[int]
+
+
+def parse_unified_diff(diff: str) -> Tuple[Optional[str], List[Hunk]]:
+    """Разбирает unified diff одного файла на hunk'и"""
+    path: Optional[str] = None
+    hunks: List[Hunk] = []
+    for line in diff.splitlines(keepends=True):
+        if line.startswith("+++ "):
+            if path is not None:
+                raise PatchError("Diff затрагивает больше одного файла")
+            path = _strip_prefix(line[4:].split("\t")[0].strip())
+            continue
+        if line.startswith(("--- ", "diff ", "index ")) and not hunks:
+            continue
+        match = HUNK_HEADER.match(line)
+        if match:
+            old_start, old_length, new_start, new_length = match.groups()
+            hunks.append(
+                Hunk(
+                    old_start=int(old_start),
+                    old_length=int(old_length) if old_length is not None else 1,
+                    new_start=int(new_start),
+                    new_length=int(new_length) if new_length is not None else 1,
+                )
+            )
+            continue
+        if not hunks:
+            continue
+        if line[:1] in (" ", "+", "-", NO_NEWLINE_MARKER):
+            hunks[-1].lines.append(line)
+        elif line.strip() == "":
+            # Некоторые инструменты обрезают пробел у пустых строк контекста
+            hunks[-1].lines.append(" " + line)
+        else:
+            raise PatchError(f"Неожиданная строка в diff: {line.rstrip()!r}")
+
+    if not hunks:
+        raise PatchError("В diff нет ни одного hunk'а")
+    return path, hunks
+
+
+def apply_patch(base: str, diff: str) -> PatchedFile:
+    """Применяет diff к исходному файлу в памяти
+
+    Возвращает новый код и номера изменённых строк новой версии. Для
+    удалений отмечается строка, на место которой пришлось удаление.
+    """
+    path, hunks = parse_unified_diff(diff)
+    base_lines = base.splitlines(keepends=True)
+    result: List[str] = []
+    changed: Set[int] = set()
+    position = 0
+
+    for hunk in hunks:
+        start = hunk.old_start - 1 if hunk.old_length else hunk.old_start
+        if start < position or start > len(base_lines):
+            raise PatchError(f"Hunk @@ -{hunk.old_start} не совпадает с файлом")
+        result.extend(base_lines[position:start])
+        position = start
+
+        last_side = ""
+        for line in hunk.lines:
+            marker, text = line[:1], line[1:]
+            if marker == NO_NEWLINE_MARKER:
+                if last_side in (" ", "+") and result:
+                    result[-1] = result[-1].rstrip("\r\n")
+                continue
+            if marker in (" ", "-"):
+                if position >= len(base_lines) or not _same_line(
+                    base_lines[position], text
+                ):
+                    raise PatchError(
+                        f"Строка {position + 1} исходного файла не совпадает с diff"
+                    )
+                position += 1
+            if marker in (" ", "+"):
+                result.append(text)
+            if marker == "+":
+                changed.add(len(result))
+            elif marker == "-":
+                changed.add(len(result) + 1)
+            last_side = marker
+
+    result.extend(base_lines[position:])
+    code = "".join(result)
+    line_count = len(result)
+    return PatchedFile(
+        code=code,
+        path=path,
+        changed_lines={line for line in changed if 0 < line <= max(line_count, 1)},
+    )
+
+
+def _same_line(left: str, right: str) -> bool:
+    return left.rstrip("\r\n") == right.rstrip("\r\n")
+
+
+def _strip_prefix(path: str) -> Optional[str]:
+    if path == "/dev/null":
+        return None
+    if path.startswith(("a/", "b/")):
+        return path[2:]
+    return path
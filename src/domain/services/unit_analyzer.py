@@ -0,0 +1,111 @@
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.interfaces.cache import ICache
+from domain.entities.parsed_source import ParsedSource
+from domain.services.definition_units import DefinitionUnit, split_units
+from domain.services.rules.engine import RuleEngine, RuleFindings
+
+
+@dataclass
+class UnitResult:
+    unit: DefinitionUnit
+    findings: RuleFindings
+    reused: bool
+
+
+def rebase_findings(findings: RuleFindings, offset: int) -> RuleFindings:
+    """Сдвигает номера строк находок на offset"""
+    return RuleFindings(
+        issues=[
+            issue.model_copy(update={"line_number": issue.line_number + offset})
+            if issue.line_number is not None
+            else issue.model_copy()
+            for issue in findings.issues
+        ],
+        functions_without_docs=list(findings.functions_without_docs),
+        classes_without_docs=list(findings.classes_without_docs),
+    )
+
+
+class UnitAnalyzer:
+    """Прогоняет правила по каждому определению верхнего уровня отдельно
+
+    Результат определения зависит только от его текста, поэтому хранится
+    по хэшу сегмента с относительными номерами строк и переиспользуется,
+    пока определение не меняется.
+    """
+
+    def __init__(self, rule_engine: RuleEngine, cache: Optional[ICache] = None):
+        self._rule_engine = rule_engine
+        self._cache = cache
+        self._fingerprint = rule_engine.registry.fingerprint()
+        self._lock = threading.Lock()
+        self._reused = 0
+        self._analyzed = 0
+
+    def analyze(
+        self, source: ParsedSource, memo: Optional[Dict[str, RuleFindings]] = None
+    ) -> List[UnitResult]:
+        """memo позволяет переиспользовать юниты между версиями одного запроса"""
+        results = []
+        for unit in split_units(source):
+            relative, reused = self._unit_findings(unit, memo)
+            results.append(
+                UnitResult(unit, rebase_findings(relative, unit.start - 1), reused)
+            )
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self._reused + self._analyzed
+            return {
+                "reused": self._reused,
+                "analyzed": self._analyzed,
+                "reuse_rate": round(self._reused / total, 4) if total else 0.0,
+            }
+
+    def cache_key(self, digest: str) -> str:
+        payload = f"{self._fingerprint}\0unit\0{digest}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _unit_findings(
+        self, unit: DefinitionUnit, memo: Optional[Dict[str, RuleFindings]]
+    ) -> Tuple[RuleFindings, bool]:
+        if unit.digest is None:
+            return self._analyze_unit(unit), False
+
+        key = self.cache_key(unit.digest)
+        cached = self._lookup(key, memo)
+        if cached is not None:
+            findings, reused = cached, True
+        else:
+            findings, reused = self._analyze_unit(unit), False
+            if self._cache is not None:
+                self._cache.set(key, findings)
+        if memo is not None:
+            memo[key] = findings
+        self._count(reused)
+        return findings, reused
+
+    def _lookup(
+        self, key: str, memo: Optional[Dict[str, RuleFindings]]
+    ) -> Optional[RuleFindings]:
+        """Находки из памяти запроса или общего кэша; None при промахе"""
+        if memo is not None and key in memo:
+            return memo[key]
+        if self._cache is None:
+            return None
+        return self._cache.get(key)
+
+    def _analyze_unit(self, unit: DefinitionUnit) -> RuleFindings:
+        return rebase_findings(self._rule_engine.run(unit.tree), 1 - unit.start)
+
+    def _count(self, reused: bool) -> None:
+        with self._lock:
+            if reused:
+                self._reused += 1
+            else:
+                self._analyzed += 1
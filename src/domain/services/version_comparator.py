@@ -0,0 +1,94 @@
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from domain.entities.code_review import Issue
+from domain.entities.parsed_source import CodeSource, ParsedSource
+from domain.entities.version_delta import VersionDelta
+from domain.services.code_analyzer import syntax_issue
+from domain.services.definition_units import MODULE_UNIT
+from domain.services.rules.engine import RuleFindings
+from domain.services.scoring import calculate_score
+from domain.services.unit_analyzer import UnitAnalyzer, UnitResult
+
+IssueKey = Tuple[str, str, str, str]
+
+
+class VersionComparator:
+    """Сравнивает две версии кода, анализируя заново только изменённые определения
+
+    Стилевые проверки зависят от всего файла, поэтому в дельту входят
+    синтаксис и правила; оценка считается по ним же.
+    """
+
+    def __init__(self, unit_analyzer: UnitAnalyzer):
+        self._unit_analyzer = unit_analyzer
+
+    def compare(self, original: CodeSource, improved: CodeSource) -> VersionDelta:
+        memo: Dict[str, RuleFindings] = {}
+        before = self._version_issues(ParsedSource.of(original), memo)
+        after = self._version_issues(ParsedSource.of(improved), memo)
+        before_units, before_issues = before
+        after_units, after_issues = after
+
+        fixed = self._subtract(before_issues, after_issues)
+        introduced = self._subtract(after_issues, before_issues)
+        score_before = calculate_score([issue for _, issue in before_issues])
+        score_after = calculate_score([issue for _, issue in after_issues])
+
+        before_digests = {r.unit.name: r.unit.digest for r in before_units}
+        after_digests = {r.unit.name: r.unit.digest for r in after_units}
+        return VersionDelta(
+            fixed_issues=fixed,
+            introduced_issues=introduced,
+            unchanged_issues_count=len(after_issues) - len(introduced),
+            score_before=score_before,
+            score_after=score_after,
+            score_change=score_after - score_before,
+            changed_units=[
+                name
+                for name, digest in after_digests.items()
+                if name in before_digests
+                and name != MODULE_UNIT
+                and before_digests[name] != digest
+            ],
+            added_units=[n for n in after_digests if n not in before_digests],
+            removed_units=[n for n in before_digests if n not in after_digests],
+            analyzed_units=sum(1 for r in after_units if not r.reused),
+            reused_units=sum(1 for r in after_units if r.reused),
+        )
+
+    def _version_issues(
+        self, source: ParsedSource, memo: Dict[str, RuleFindings]
+    ) -> Tuple[List[UnitResult], List[Tuple[str, Issue]]]:
+        error = source.syntax_error
+        if error is not None:
+            return [], [(MODULE_UNIT, syntax_issue(error))]
+        if source.tree is None:
+            return [], []
+
+        units = self._unit_analyzer.analyze(source, memo)
+        issues = [
+            (result.unit.name, issue)
+            for result in units
+            for issue in result.findings.issues
+        ]
+        return units, issues
+
+    @staticmethod
+    def _key(unit: str, issue: Issue) -> IssueKey:
+        # Номер строки не входит в ключ: сдвиг кода не делает проблему новой
+        return unit, issue.issue_type.value, issue.severity.value, issue.description
+
+    def _subtract(
+        self, left: List[Tuple[str, Issue]], right: List[Tuple[str, Issue]]
+    ) -> List[Issue]:
+        """Проблемы из left, которым нет пары в right"""
+        remaining = Counter(self._key(unit, issue) for unit, issue in right)
+        result = []
+        for unit, issue in left:
+            key = self._key(unit, issue)
+            if remaining[key]:
+                remaining[key] -= 1
+            else:
+                result.append(issue)
+        return result
@@ -0,0 +1,34 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+EXECUTOR_MODES = ("inline", "thread", "process")
+
+
+class AnalysisExecutor:
+    """Ограниченный пул для CPU-нагруженного анализа вне event loop"""
+
+    def __init__(self, max_workers: int = 4, mode: str = "thread"):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Неизвестный режим исполнителя анализа: {mode}")
+        self._max_workers = max_workers
+        self.mode = mode
+        # В режиме process поток только ждет пул процессов, отпуская GIL
+        self._pool: Optional[ThreadPoolExecutor] = None
+        if mode != "inline":
+            self._pool = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="analysis"
+            )
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self._pool is None:
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(fn, *args))
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
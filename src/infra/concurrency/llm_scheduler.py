@@ -0,0 +1,257 @@
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMITED = 429
+OVERLOADED = 503
+# Начальная оценка длительности вызова LLM до первых измерений
+INITIAL_HOLD_SECONDS = 5.0
+HOLD_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Запрос к LLM не допущен: квота провайдера или очередь исчерпаны"""
+
+    def __init__(self, message: str, status_code: int, retry_after: float):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Ведро токенов, пополняемое с заданной скоростью в минуту"""
+
+    def __init__(self, per_minute: int, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def delay(self, amount: float) -> float:
+        """Через сколько секунд в ведре наберется amount"""
+        self._refill()
+        missing = min(amount, self.capacity) - self._tokens
+        return max(0.0, missing / self._rate)
+
+    def take(self, amount: float) -> None:
+        """Резервирует amount; баланс может уйти в минус до пополнения"""
+        self._refill()
+        self._tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """Возвращает резерв вызова, который так и не был допущен"""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + min(amount, self.capacity))
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    operation: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class LLMScheduler:
+    """Допуск вызовов LLM: лимиты параллельности, очередь с приоритетами и квоты
+
+    Свободный слот получает ожидающий с наименьшим приоритетом (0 — самый
+    срочный), поэтому быстрые проверки обгоняют полные ревью в очереди.
+    Лимит операции не дает ей занять все слоты общего пула.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_concurrency: int = 8,
+        operation_limits: Optional[Dict[str, int]] = None,
+        priorities: Optional[Dict[str, int]] = None,
+        default_priority: int = 1,
+        max_queue: int = 64,
+        max_wait_seconds: float = 10.0,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ):
+        self._enabled = enabled
+        self.max_concurrency = max_concurrency
+        self.operation_limits = operation_limits or {}
+        self.priorities = priorities or {}
+        self.default_priority = default_priority
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self._request_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self._token_bucket = (
+            TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        )
+        self._active: Dict[str, int] = {}
+        self._active_total = 0
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._hold_seconds = INITIAL_HOLD_SECONDS
+        self._admitted = 0
+        self._queued = 0
+        self._rejected = {RATE_LIMITED: 0, OVERLOADED: 0}
+
+    @asynccontextmanager
+    async def admit(
+        self, operation: str, tokens: int = 0, requests: int = 1
+    ) -> AsyncIterator[None]:
+        """Держит слот на время вызова LLM или отклоняет запрос"""
+        if not self._enabled:
+            yield
+            return
+
+        deadline = time.monotonic() + self.max_wait_seconds
+        delay = self._reserve(requests, tokens)
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self._acquire(operation, deadline)
+        except (AdmissionRejected, asyncio.CancelledError):
+            # Вызов не состоялся: квота нужна тем, кого допустят
+            self._refund(requests, tokens)
+            raise
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(operation, time.monotonic() - started)
+
+    def priority(self, operation: str) -> int:
+        return self.priorities.get(operation, self.default_priority)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self._enabled,
+            "max_concurrency": self.max_concurrency,
+            "active": self._active_total,
+            "active_by_operation": {k: v for k, v in self._active.items() if v},
+            "queue_depth": len(self._waiters),
+            "max_queue": self.max_queue,
+            "admitted": self._admitted,
+            "queued": self._queued,
+            "rejected_rate_limited": self._rejected[RATE_LIMITED],
+            "rejected_overloaded": self._rejected[OVERLOADED],
+            "avg_hold_seconds": round(self._hold_seconds, 3),
+            "requests_available": _available(self._request_bucket),
+            "tokens_available": _available(self._token_bucket),
+        }
+
+    def _reserve(self, requests: int, tokens: int) -> float:
+        """Резервирует квоты RPM/TPM; возвращает, сколько ждать их пополнения"""
+        delay = 0.0
+        if self._request_bucket is not None:
+            delay = max(delay, self._request_bucket.delay(requests))
+        if self._token_bucket is not None and tokens:
+            delay = max(delay, self._token_bucket.delay(tokens))
+        if delay > self.max_wait_seconds:
+            self._rejected[RATE_LIMITED] += 1
+            raise AdmissionRejected(
+                "Превышена квота запросов к модели", RATE_LIMITED, delay
+            )
+
+        if self._request_bucket is not None:
+            self._request_bucket.take(requests)
+        if self._token_bucket is not None and tokens:
+            self._token_bucket.take(tokens)
+        return delay
+
+    def _refund(self, requests: int, tokens: int) -> None:
+        if self._request_bucket is not None:
+            self._request_bucket.refund(requests)
+        if self._token_bucket is not None and tokens:
+            self._token_bucket.refund(tokens)
+
+    async def _acquire(self, operation: str, deadline: float) -> None:
+        if self._can_run(operation):
+            self._grant(operation)
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._reject_overloaded("Очередь запросов к модели заполнена")
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            self.priority(operation), next(self._seq), operation, loop.create_future()
+        )
+        self._waiters.append(waiter)
+        self._queued += 1
+        try:
+            await asyncio.wait_for(
+                waiter.future, timeout=max(0.0, deadline - time.monotonic())
+            )
+        except asyncio.TimeoutError:
+            self._remove(waiter)
+            self._reject_overloaded("Истекло ожидание слота для запроса к модели")
+        except asyncio.CancelledError:
+            self._remove(waiter)
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Слот уже выдан, но ждавший ушел: возвращаем его в пул
+                self._release(operation, None)
+            raise
+
+    def _can_run(self, operation: str) -> bool:
+        if self._active_total >= self.max_concurrency:
+            return False
+        limit = self.operation_limits.get(operation)
+        return limit is None or self._active.get(operation, 0) < limit
+
+    def _grant(self, operation: str) -> None:
+        self._active_total += 1
+        self._active[operation] = self._active.get(operation, 0) + 1
+        self._admitted += 1
+
+    def _release(self, operation: str, held: Optional[float]) -> None:
+        self._active_total -= 1
+        self._active[operation] -= 1
+        if held is not None:
+            self._hold_seconds += HOLD_SMOOTHING * (held - self._hold_seconds)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Отдает освободившиеся слоты ожидающим по приоритету"""
+        for waiter in sorted(self._waiters):
+            if self._active_total >= self.max_concurrency:
+                break
+            if waiter.future.done() or not self._can_run(waiter.operation):
+                continue
+            self._waiters.remove(waiter)
+            self._grant(waiter.operation)
+            waiter.future.set_result(None)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        if waiter in self._waiters:
+            self._waiters.remove(waiter)
+
+    def _reject_overloaded(self, message: str) -> None:
+        self._rejected[OVERLOADED] += 1
+        retry_after = max(
+            1.0,
+            self._hold_seconds * (len(self._waiters) + 1) / self.max_concurrency,
+        )
+        logger.warning("%s, повтор через %.1f с", message, retry_after)
+        raise AdmissionRejected(message, OVERLOADED, retry_after)
+
+
+def _available(bucket: Optional[TokenBucket]) -> Optional[float]:
+    return round(bucket.available, 1) if bucket is not None else None
@@ -0,0 +1,131 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from core.interfaces.code_analyzer import ICodeAnalyzer
+from domain.entities.code_review import Improvement, Issue
+from domain.entities.parsed_source import CodeSource, ParsedSource
+from domain.services.code_analyzer import CodeAnalyzerService
+from domain.services.rules.default import build_default_registry
+from domain.services.rules.engine import RuleEngine
+from domain.services.unit_analyzer import UnitAnalyzer
+from infra.cache.memory import MemoryCache
+from infra.style.inprocess import InProcessStyleChecker
+
+RULE_CHECKS: FrozenSet[str] = frozenset({"syntax", "smells", "improvements"})
+STYLE_CHECKS: FrozenSet[str] = frozenset({"style"})
+PROCESS_RESULTS_KEY = "process_results"
+UNIT_CACHE_SIZE = 4096
+
+CheckResult = Union[List[Issue], List[Improvement]]
+
+_worker_analyzer: Optional[CodeAnalyzerService] = None
+
+
+def build_worker_analyzer(max_line_length: int) -> CodeAnalyzerService:
+    """Анализатор для процесса пула: стиль проверяется прямо в этом процессе"""
+    rule_engine = RuleEngine(build_default_registry())
+    return CodeAnalyzerService(
+        rule_engine=rule_engine,
+        style_checker=InProcessStyleChecker(max_line_length=max_line_length),
+        # Кэш определений свой у каждого процесса пула
+        unit_analyzer=UnitAnalyzer(rule_engine, MemoryCache(UNIT_CACHE_SIZE)),
+    )
+
+
+def _init_worker(max_line_length: int) -> None:
+    global _worker_analyzer
+    _worker_analyzer = build_worker_analyzer(max_line_length)
+
+
+def _warm_up() -> bool:
+    return _worker_analyzer is not None
+
+
+def run_checks(code: str, checks: Tuple[str, ...]) -> Dict[str, CheckResult]:
+    """Выполняет проверки в процессе пула: на входе код, на выходе результаты"""
+    analyzer = _worker_analyzer or CodeAnalyzerService()
+    source = ParsedSource(code=code)
+    handlers: Dict[str, Callable[[CodeSource], CheckResult]] = {
+        "syntax": analyzer.analyze_syntax,
+        "style": analyzer.check_style,
+        "smells": analyzer.detect_smells,
+        "improvements": analyzer.suggest_improvements,
+    }
+    return {check: handlers[check](source) for check in checks}
+
+
+class ProcessPoolCodeAnalyzer(ICodeAnalyzer):
+    """Выполняет CPU-нагруженный анализ в пуле процессов, обходя GIL
+
+    Процессы всегда используют встроенный движок стиля, поэтому и отпечаток
+    берется от такой же конфигурации.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_line_length: int = 88,
+        start_method: str = "spawn",
+    ):
+        self._fingerprint = build_worker_analyzer(max_line_length).fingerprint()
+        self._max_workers = max_workers
+        self._max_line_length = max_line_length
+        self._start_method = start_method
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def parse(self, code: str) -> ParsedSource:
+        return ParsedSource(code=code)
+
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    def analyze_syntax(self, code: CodeSource) -> List[Issue]:
+        return self._result("syntax", code)
+
+    def check_style(self, code: CodeSource) -> List[Issue]:
+        return self._result("style", code)
+
+    def detect_smells(self, code: CodeSource) -> List[Issue]:
+        return self._result("smells", code)
+
+    def suggest_improvements(self, code: CodeSource) -> List[Improvement]:
+        return self._result("improvements", code)
+
+    def warm_up(self) -> None:
+        """Запускает процессы пула заранее, чтобы первый запрос не ждал их старта"""
+        pool = self._get_pool()
+        for _ in range(self._max_workers or os.cpu_count() or 1):
+            pool.submit(_warm_up)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _result(self, check: str, code: CodeSource) -> list:
+        source = ParsedSource.of(code)
+        results: Dict[str, list] = source.memo(PROCESS_RESULTS_KEY, dict)
+        if check not in results:
+            # Правила используют один разбор AST, поэтому считаются за один вызов
+            group = RULE_CHECKS if check in RULE_CHECKS else STYLE_CHECKS
+            pending = tuple(sorted(group - results.keys()))
+            results.update(
+                self._get_pool().submit(run_checks, source.code, pending).result()
+            )
+        return results[check]
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context(self._start_method),
+                    initializer=_init_worker,
+                    initargs=(self._max_line_length,),
+                )
+            return self._pool
@@ -0,0 +1,43 @@
+from concurrent.futures import Executor
+from typing import Any, Dict, Optional
+
+from core.config.analyzer import AnalyzerSettings
+from infra.concurrency.process_analyzer import build_worker_analyzer
+from infra.langchain.tools.full_review_code import FullReviewCodeTool
+
+_full_review_code_tool: Optional[FullReviewCodeTool] = None
+
+
+def _build_tool(max_line_length: int) -> FullReviewCodeTool:
+    # Процесс пула уже вне основного процесса: вложенный пул стиля не нужен
+    return FullReviewCodeTool(code_analyzer=build_worker_analyzer(max_line_length))
+
+
+def init_worker(max_line_length: int) -> None:
+    """Инициализатор процесса пула: инструмент собирается один раз на процесс"""
+    global _full_review_code_tool
+    _full_review_code_tool = _build_tool(max_line_length)
+
+
+def _get_full_review_code_tool() -> FullReviewCodeTool:
+    global _full_review_code_tool
+    if _full_review_code_tool is None:
+        _full_review_code_tool = _build_tool(AnalyzerSettings().max_line_length)
+    return _full_review_code_tool
+
+
+def run_full_review(code: str) -> Dict[str, Any]:
+    """Точка входа для пула процессов: код на входе, компактный dict на выходе"""
+    return _get_full_review_code_tool().analyze(code).model_dump(mode="json")
+
+
+def warm_up() -> bool:
+    """Заранее загружает анализатор в процессе пула"""
+    _get_full_review_code_tool()
+    return True
+
+
+def warm_up_process_pool(pool: Executor, workers: int) -> None:
+    """Запускает процессы пула в фоне, чтобы первый запрос не ждал их старта"""
+    for _ in range(workers):
+        pool.submit(warm_up)
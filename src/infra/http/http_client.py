@@ -1,9 +1,197 @@
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
 import httpx
 
 from core.config.http import HTTPSettings
 
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_timeout(settings: HTTPSettings) -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.timeout,
+        connect=settings.connect_timeout,
+        read=settings.read_timeout or settings.timeout,
+        pool=settings.pool_timeout,
+    )
+
+
+def build_limits(settings: HTTPSettings) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.max_connections,
+        max_keepalive_connections=settings.max_keepalive_connections,
+        keepalive_expiry=settings.keepalive_expiry,
+    )
+
+
+class _PoolCounters:
+    """Счетчики запросов и соединений одного транспорта"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._seen: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.connections_opened = 0
+
+    def started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.requests += 1
+
+    def finished(self, pool: Any, failed: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if failed:
+                self.errors += 1
+            for connection in _connections(pool):
+                if connection not in self._seen:
+                    self._seen.add(connection)
+                    self.connections_opened += 1
+
+
+class _CountingTransport(httpx.HTTPTransport):
+    def __init__(self, counters: _PoolCounters, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.counters = counters
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.counters.started()
+        failed = True
+        try:
+            response = super().handle_request(request)
+            failed = False
+            return response
+        finally:
+            self.counters.finished(self._pool, failed)
+
+
+class _AsyncCountingTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, counters: _PoolCounters, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.counters = counters
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.counters.started()
+        failed = True
+        try:
+            response = await super().handle_async_request(request)
+            failed = False
+            return response
+        finally:
+            self.counters.finished(self._pool, failed)
+
+
+def _connections(pool: Any) -> list:
+    return list(getattr(pool, "connections", []))
+
+
+def _is_http2(connection: Any) -> bool:
+    return "HTTP2" in type(getattr(connection, "_connection", None)).__name__
+
+
+def _pool_stats(pool: Any, counters: _PoolCounters, limits: httpx.Limits) -> Dict:
+    connections = _connections(pool)
+    idle = sum(1 for c in connections if c.is_idle())
+    http2 = sum(1 for c in connections if _is_http2(c))
+    requests = counters.requests
+    return {
+        "max_connections": limits.max_connections,
+        "open_connections": len(connections),
+        "idle_connections": idle,
+        "http2_connections": http2,
+        "in_flight": counters.in_flight,
+        "utilization": (
+            round(counters.in_flight / limits.max_connections, 4)
+            if limits.max_connections
+            else 0.0
+        ),
+        "requests": requests,
+        "errors": counters.errors,
+        "connections_opened": counters.connections_opened,
+        # Сколько запросов в среднем приходится на одно TLS-рукопожатие
+        "requests_per_connection": (
+            round(requests / counters.connections_opened, 2)
+            if counters.connections_opened
+            else None
+        ),
+    }
+
+
+class HTTPClientPool:
+    """Общие sync и async клиенты к LLM с настроенным пулом соединений"""
+
+    def __init__(self, settings: HTTPSettings):
+        self._settings = settings
+        self._http2 = settings.http2 and http2_available()
+        if settings.http2 and not self._http2:
+            logger.warning("Пакет h2 не установлен, HTTP/2 отключен")
+        self._limits = build_limits(settings)
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._transport: Optional[_CountingTransport] = None
+        self._async_transport: Optional[_AsyncCountingTransport] = None
+
+    @property
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._transport = _CountingTransport(
+                    _PoolCounters(), **self._transport_kwargs()
+                )
+                self._client = httpx.Client(
+                    transport=self._transport, timeout=build_timeout(self._settings)
+                )
+            return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._async_client is None:
+                self._async_transport = _AsyncCountingTransport(
+                    _PoolCounters(), **self._transport_kwargs()
+                )
+                self._async_client = httpx.AsyncClient(
+                    transport=self._async_transport,
+                    timeout=build_timeout(self._settings),
+                )
+            return self._async_client
+
+    def stats(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"http2": self._http2}
+        if self._transport is not None:
+            result["sync"] = _pool_stats(
+                self._transport._pool, self._transport.counters, self._limits
+            )
+        if self._async_transport is not None:
+            result["async"] = _pool_stats(
+                self._async_transport._pool,
+                self._async_transport.counters,
+                self._limits,
+            )
+        return result
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+        if self._client is not None:
+            self._client.close()
 
-def get_http_client() -> httpx.Client:
-    http_settings = HTTPSettings()
-    http_client = httpx.Client(**http_settings.model_dump())
-    return http_client
+    def _transport_kwargs(self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {"limits": self._limits, "http2": self._http2}
+        if self._settings.proxy:
+            kwargs["proxy"] = self._settings.proxy
+        return kwargs
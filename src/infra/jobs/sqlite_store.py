@@ -0,0 +1,305 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from core.interfaces.job_store import IJobStore
+from domain.entities.review_job import JobStatus, ReviewJob
+
+COLUMNS = (
+    "id, content_hash, status, code, result, error, attempts, created_at, updated_at"
+)
+
+
+class SQLiteJobStore(IJobStore):
+    """Очередь задач ревью в SQLite: переживает перезапуск, брокер не нужен"""
+
+    def __init__(
+        self,
+        path: str,
+        result_ttl_seconds: float = 86400.0,
+        lease_seconds: float = 60.0,
+    ):
+        self._path = path
+        self._result_ttl_seconds = result_ttl_seconds
+        self._lease_seconds = lease_seconds
+        # Владелец аренды: процесс этого узла, а не файл базы, общий для узлов
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._deduplicated = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL UNIQUE,
+                status TEXT NOT NULL,
+                code TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                owner TEXT,
+                lease_expires_at REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at)"
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_callbacks (
+                job_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                PRIMARY KEY (job_id, url)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def submit(
+        self, content_hash: str, code: str, callback_url: Optional[str] = None
+    ) -> ReviewJob:
+        now = time.time()
+        with self._lock:
+            existing = self._select("content_hash = ?", (content_hash,))
+            if existing is not None and not self._expired(existing, now):
+                # Адрес нового клиента добавляется к адресам исходной задачи
+                if callback_url and not existing.finished:
+                    self._add_callback(existing.id, callback_url)
+                    self._conn.commit()
+                self._deduplicated += 1
+                return self._get(existing.id)
+
+            if existing is not None:
+                # Упавшую или устаревшую задачу перезапускаем под тем же id;
+                # прежние клиенты свой результат уже получили
+                self._conn.execute(
+                    """
+                    UPDATE jobs SET status = ?, code = ?, result = NULL,
+                        error = NULL, attempts = 0, owner = NULL,
+                        lease_expires_at = NULL, available_at = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (JobStatus.QUEUED.value, code, now, now, existing.id),
+                )
+                self._conn.execute(
+                    "DELETE FROM job_callbacks WHERE job_id = ?", (existing.id,)
+                )
+                job_id = existing.id
+            else:
+                job_id = uuid.uuid4().hex
+                self._conn.execute(
+                    f"INSERT INTO jobs ({COLUMNS}, available_at) "
+                    "VALUES (?, ?, ?, ?, NULL, NULL, 0, ?, ?, ?)",
+                    (
+                        job_id,
+                        content_hash,
+                        JobStatus.QUEUED.value,
+                        code,
+                        now,
+                        now,
+                        now,
+                    ),
+                )
+            if callback_url:
+                self._add_callback(job_id, callback_url)
+            self._conn.commit()
+            self._submitted += 1
+            return self._get(job_id)
+
+    def get(self, job_id: str) -> Optional[ReviewJob]:
+        with self._lock:
+            return self._select("id = ?", (job_id,))
+
+    def claim(self) -> Optional[ReviewJob]:
+        now = time.time()
+        with self._lock:
+            # Выбор и захват одним запросом: задачу не заберут дважды даже
+            # воркеры разных процессов над одним файлом базы. Задача с
+            # истекшей арендой осталась от упавшего узла и берется заново
+            row = self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, attempts = attempts + 1, owner = ?,
+                    lease_expires_at = ?, updated_at = ?
+                WHERE id = (
+                    SELECT id FROM jobs
+                    WHERE (status = ? AND available_at <= ?)
+                        OR (status = ? AND lease_expires_at <= ?)
+                    ORDER BY created_at LIMIT 1
+                )
+                RETURNING id
+                """,
+                (
+                    JobStatus.RUNNING.value,
+                    self._owner,
+                    now + self._lease_seconds,
+                    now,
+                    JobStatus.QUEUED.value,
+                    now,
+                    JobStatus.RUNNING.value,
+                    now,
+                ),
+            ).fetchone()
+            self._conn.commit()
+            if row is None:
+                return None
+            return self._get(row[0])
+
+    def renew(self, job_id: str) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND owner = ?",
+                (
+                    now + self._lease_seconds,
+                    now,
+                    job_id,
+                    JobStatus.RUNNING.value,
+                    self._owner,
+                ),
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, result: str) -> bool:
+        return self._finish(job_id, JobStatus.DONE, result=result)
+
+    def fail(self, job_id: str, error: str) -> bool:
+        return self._finish(job_id, JobStatus.FAILED, error=error)
+
+    def retry_later(self, job_id: str, delay_seconds: float) -> None:
+        self._requeue(job_id, delay_seconds, attempts_used=1)
+
+    def defer(self, job_id: str, delay_seconds: float) -> None:
+        self._requeue(job_id, delay_seconds, attempts_used=0)
+
+    def recover(self) -> int:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, lease_expires_at = NULL, "
+                "available_at = ?, updated_at = ? "
+                "WHERE status = ? AND lease_expires_at <= ?",
+                (JobStatus.QUEUED.value, now, now, JobStatus.RUNNING.value, now),
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(
+                self._conn.execute(
+                    "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+                ).fetchall()
+            )
+            return {
+                "backend": "sqlite",
+                "path": self._path,
+                **{status.value: counts.get(status.value, 0) for status in JobStatus},
+                "submitted": self._submitted,
+                "deduplicated": self._deduplicated,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _requeue(self, job_id: str, delay_seconds: float, attempts_used: int) -> None:
+        """claim уже засчитал попытку; неиспользованная возвращается"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, attempts = attempts - ?, owner = NULL,
+                    lease_expires_at = NULL, available_at = ?, updated_at = ?
+                WHERE id = ? AND owner = ?
+                """,
+                (
+                    JobStatus.QUEUED.value,
+                    1 - attempts_used,
+                    now + delay_seconds,
+                    now,
+                    job_id,
+                    self._owner,
+                ),
+            )
+            self._conn.commit()
+
+    def _add_callback(self, job_id: str, url: str) -> None:
+        self._conn.execute(
+            "INSERT OR IGNORE INTO job_callbacks (job_id, url) VALUES (?, ?)",
+            (job_id, url),
+        )
+
+    def _callbacks(self, job_id: str) -> List[str]:
+        rows = self._conn.execute(
+            "SELECT url FROM job_callbacks WHERE job_id = ? ORDER BY rowid", (job_id,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _get(self, job_id: str) -> ReviewJob:
+        """Задача, которая точно есть: только что записана под тем же замком"""
+        job = self._select("id = ?", (job_id,))
+        if job is None:
+            raise KeyError(job_id)
+        return job
+
+    def _finish(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        with self._lock:
+            # Аренда могла истечь и задача уйти другому воркеру: его результат
+            # не перезаписываем
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, owner = NULL, "
+                "lease_expires_at = NULL, updated_at = ? WHERE id = ? AND owner = ?",
+                (status.value, result, error, time.time(), job_id, self._owner),
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def _expired(self, job: ReviewJob, now: float) -> bool:
+        if job.status == JobStatus.FAILED:
+            return True
+        return (
+            job.status == JobStatus.DONE
+            and job.updated_at.timestamp() + self._result_ttl_seconds <= now
+        )
+
+    def _select(self, where: str, params: tuple) -> Optional[ReviewJob]:
+        row = self._conn.execute(
+            f"SELECT {COLUMNS} FROM jobs WHERE {where}", params
+        ).fetchone()
+        if row is None:
+            return None
+        return ReviewJob(
+            id=row[0],
+            content_hash=row[1],
+            status=JobStatus(row[2]),
+            code=row[3],
+            callback_urls=self._callbacks(row[0]),
+            result=row[4],
+            error=row[5],
+            attempts=row[6],
+            created_at=datetime.fromtimestamp(row[7]),
+            updated_at=datetime.fromtimestamp(row[8]),
+        )
@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRY_BACKOFF_SECONDS = 0.5
+
+
+class WebhookNotifier:
+    """Отправляет результат задачи на callback_url клиента"""
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        retries: int = 3,
+        allowed_hosts: Optional[List[str]] = None,
+        allowed_schemes: Optional[List[str]] = None,
+    ):
+        self._http_client = http_client
+        self._retries = retries
+        self._allowed_hosts = [h.lower() for h in allowed_hosts or []]
+        self._allowed_schemes = [s.lower() for s in allowed_schemes or ["https"]]
+
+    def is_allowed(self, url: str) -> bool:
+        """Адрес из списка разрешенных; «*.example.com» покрывает поддомены"""
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        if not host or parts.scheme.lower() not in self._allowed_schemes:
+            return False
+        return any(
+            host.endswith(allowed[1:]) if allowed.startswith("*.") else host == allowed
+            for allowed in self._allowed_hosts
+        )
+
+    async def notify(self, url: str, payload: Dict[str, Any]) -> bool:
+        if not self.is_allowed(url):
+            # Адрес мог быть принят до смены списка разрешенных
+            logger.warning("Callback %s не входит в список разрешенных", url)
+            return False
+        for attempt in range(self._retries + 1):
+            try:
+                response = await self._http_client.post(url, json=payload)
+                if response.status_code < 500:
+                    return response.is_success
+            except httpx.HTTPError as e:
+                logger.warning("Callback %s не доставлен: %s", url, e)
+            if attempt < self._retries:
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2**attempt)
+        return False
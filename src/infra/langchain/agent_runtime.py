@@ -0,0 +1,119 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain.agents import AgentExecutor
+from langchain.tools import BaseTool, StructuredTool
+
+from infra.concurrency.analysis_executor import AnalysisExecutor
+from infra.langchain.llm_provider import LangChainLLMProvider
+from infra.langchain.source_registry import SourceRegistry
+from infra.langchain.tools.full_review_code import FullReviewCodeTool
+from infra.langchain.tools.quick_check_code import QuickCheckCodeTool
+
+logger = logging.getLogger(__name__)
+
+
+class AgentRuntime:
+    """Долгоживущий агент: промпт, инструменты и executor собираются один раз"""
+
+    def __init__(
+        self,
+        llm_provider: LangChainLLMProvider,
+        full_review_code_tool: FullReviewCodeTool,
+        quick_check_code_tool: QuickCheckCodeTool,
+        analysis_executor: Optional[AnalysisExecutor] = None,
+        source_registry: Optional[SourceRegistry] = None,
+    ):
+        self.llm_provider = llm_provider
+        self.full_review_code_tool = full_review_code_tool
+        self.quick_check_code_tool = quick_check_code_tool
+        self.analysis_executor = analysis_executor or AnalysisExecutor()
+        self.sources = source_registry or SourceRegistry()
+        self._tools: List[BaseTool] = []
+        self._lock = threading.Lock()
+        self._build_seconds: Optional[float] = None
+
+    @property
+    def is_built(self) -> bool:
+        return self._build_seconds is not None
+
+    @property
+    def executor(self) -> AgentExecutor:
+        """Возвращает общий executor, собирая агента при первом обращении"""
+        if not self.is_built:
+            self.build()
+        return self.llm_provider.executor
+
+    def executor_for(self, tier: Optional[str]) -> AgentExecutor:
+        """Executor на модели выбранного уровня; None — модель по умолчанию"""
+        if tier is None:
+            return self.executor
+        if not self.is_built:
+            self.build()
+        return self.llm_provider.executor_for(tier)
+
+    def build(self) -> float:
+        """Собирает агента; повторные вызовы ничего не делают"""
+        with self._lock:
+            if self._build_seconds is None:
+                started = time.perf_counter()
+                self._tools = self._create_tools()
+                self.llm_provider.setup_agent(self._tools)
+                self._build_seconds = time.perf_counter() - started
+                logger.info("Агент собран за %.3f с", self._build_seconds)
+            return self._build_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "built": self.is_built,
+            "build_seconds": self._build_seconds,
+            "tools": [t.name for t in self._tools],
+        }
+
+    def _create_tools(self) -> List[BaseTool]:
+        def full_review_code_tool(source_id: str) -> str:
+            """Проводит полное ревью Python кода и возвращает детальный анализ.
+
+            Args:
+                source_id: идентификатор кода из запроса (вида src-...)
+
+            Returns:
+                Детальный отчет с найденными проблемами, улучшениями и рекомендациями
+            """
+            return self.full_review_code_tool.execute(self.sources.resolve(source_id))
+
+        async def afull_review_code_tool(source_id: str) -> str:
+            return await self.analysis_executor.run(
+                self.full_review_code_tool.execute, self.sources.resolve(source_id)
+            )
+
+        def quick_check_tool(source_id: str) -> str:
+            """Быстрая проверка критических проблем в коде.
+
+            Args:
+                source_id: идентификатор кода из запроса (вида src-...)
+
+            Returns:
+                Краткий отчет о критических проблемах
+            """
+            return self.quick_check_code_tool.execute(self.sources.resolve(source_id))
+
+        async def aquick_check_tool(source_id: str) -> str:
+            return await self.analysis_executor.run(
+                self.quick_check_code_tool.execute, self.sources.resolve(source_id)
+            )
+
+        return [
+            StructuredTool.from_function(
+                func=full_review_code_tool,
+                coroutine=afull_review_code_tool,
+                handle_tool_error=True,
+            ),
+            StructuredTool.from_function(
+                func=quick_check_tool,
+                coroutine=aquick_check_tool,
+                handle_tool_error=True,
+            ),
+        ]
@@ -1,9 +1,20 @@
+from typing import AsyncIterator, Dict, Optional
+
 import httpx
 from langchain.agents import AgentExecutor, create_openai_tools_agent
 from langchain.prompts import ChatPromptTemplate
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
 from core.config.llm import LLMSettings
+from core.config.routing import ModelRoutingSettings
+from domain.services.model_router import TIER_LARGE, TIER_SMALL
+from infra.langchain.tier_metrics import TierMetrics
+
+DIRECT_SYSTEM_PROMPT = """Ты опытный Python разработчик и ментор.
+Результаты статического анализа уже приложены к запросу, инструменты не нужны.
+На выходе ты должен выдать идеально-чистый исправленный код.
+Анализируй код конструктивно и давай полезные советы."""
 
 
 class ExecutorNotFoundError(Exception):
@@ -11,15 +22,56 @@ class ExecutorNotFoundError(Exception):
 
 
 class LangChainLLMProvider:
-    def __init__(self, settings: LLMSettings, http_client: httpx.Client):
+    def __init__(
+        self,
+        settings: LLMSettings,
+        http_client: httpx.Client,
+        http_async_client: httpx.AsyncClient | None = None,
+        routing_settings: ModelRoutingSettings | None = None,
+        tier_metrics: TierMetrics | None = None,
+    ):
         self._settings = settings
         self._executor = None
-        self._llm = ChatOpenAI(
-            model=settings.openai_model,
-            api_key=settings.openai_api_key,
-            temperature=settings.temperature,
-            http_client=http_client,
-        )
+        self._executors: Dict[str, AgentExecutor] = {}
+        self.tier_metrics = tier_metrics or TierMetrics()
+
+        self._tier_models = {
+            TIER_LARGE: settings.openai_model,
+        }
+        if routing_settings is not None and routing_settings.enabled:
+            self._tier_models = {
+                TIER_SMALL: routing_settings.small_model,
+                TIER_LARGE: routing_settings.large_model or settings.openai_model,
+            }
+        self._llms = {
+            tier: ChatOpenAI(
+                model=model,
+                api_key=settings.openai_api_key,
+                temperature=settings.temperature,
+                max_completion_tokens=settings.max_tokens,
+                http_client=http_client,
+                http_async_client=http_async_client,
+                stream_usage=True,
+                callbacks=[self.tier_metrics.handler(tier, model)],
+            )
+            for tier, model in self._tier_models.items()
+        }
+        self._llm = self._llms[TIER_LARGE]
+
+    @property
+    def model_name(self) -> str:
+        return self._tier_models[TIER_LARGE]
+
+    @property
+    def tier_models(self) -> Dict[str, str]:
+        return dict(self._tier_models)
+
+    def model_for(self, tier: Optional[str]) -> str:
+        return self._tier_models.get(tier or TIER_LARGE, self.model_name)
+
+    @property
+    def temperature(self) -> float:
+        return self._settings.temperature
 
     @property
     def executor(self) -> AgentExecutor:
@@ -30,9 +82,36 @@ class LangChainLLMProvider:
             )
         return self._executor
 
-    def get_llm(self) -> ChatOpenAI:
+    def executor_for(self, tier: Optional[str]) -> AgentExecutor:
+        """Executor агента на модели нужного уровня"""
+        executor = self.executor
+        return self._executors.get(tier or TIER_LARGE, executor)
+
+    def get_llm(self, tier: Optional[str] = None) -> ChatOpenAI:
         """Возвращает настроенную LLM модель"""
-        return self._llm
+        return self._llms.get(tier or TIER_LARGE, self._llm)
+
+    def complete(self, message: str, tier: Optional[str] = None) -> str:
+        """Один вызов модели без агента"""
+        return self.get_llm(tier).invoke(self._direct_messages(message)).text()
+
+    async def acomplete(self, message: str, tier: Optional[str] = None) -> str:
+        response = await self.get_llm(tier).ainvoke(self._direct_messages(message))
+        return response.text()
+
+    async def astream(
+        self, message: str, tier: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        async for chunk in self.get_llm(tier).astream(self._direct_messages(message)):
+            if isinstance(chunk.content, str) and chunk.content:
+                yield chunk.content
+
+    @staticmethod
+    def _direct_messages(message: str):
+        return [
+            SystemMessage(content=DIRECT_SYSTEM_PROMPT),
+            HumanMessage(content=message),
+        ]
 
     def setup_agent(self, tools):
         """Настраивает агента с переданными инструментами"""
@@ -57,10 +136,13 @@ class LangChainLLMProvider:
             ]
         )
 
-        agent = create_openai_tools_agent(self._llm, tools, prompt)
-        self._executor = AgentExecutor(
-            agent=agent,
-            tools=tools,
-            verbose=self._settings.verbose,
-            return_intermediate_steps=True,
-        )
+        self._executors = {
+            tier: AgentExecutor(
+                agent=create_openai_tools_agent(llm, tools, prompt),
+                tools=tools,
+                verbose=self._settings.verbose,
+                return_intermediate_steps=True,
+            )
+            for tier, llm in self._llms.items()
+        }
+        self._executor = self._executors[TIER_LARGE]
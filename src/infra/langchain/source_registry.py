@@ -0,0 +1,60 @@
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Tuple
+
+from langchain_core.tools import ToolException
+
+SOURCE_ID_PREFIX = "src-"
+
+
+class UnknownSourceError(ToolException):
+    """Ошибка вызова инструмента: агент получает ее текстом и может исправиться"""
+
+
+class SourceRegistry:
+    """Код запроса, на который инструменты агента ссылаются по идентификатору
+
+    Так модели не нужно повторять весь код в аргументах вызова инструмента.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, Tuple[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def source_id(code: str) -> str:
+        digest = hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+        return SOURCE_ID_PREFIX + digest[:16]
+
+    @contextmanager
+    def registered(self, code: str) -> Iterator[str]:
+        source_id = self.source_id(code)
+        with self._lock:
+            _, refs = self._sources.get(source_id, (code, 0))
+            self._sources[source_id] = (code, refs + 1)
+        try:
+            yield source_id
+        finally:
+            with self._lock:
+                _, refs = self._sources[source_id]
+                if refs <= 1:
+                    del self._sources[source_id]
+                else:
+                    self._sources[source_id] = (code, refs - 1)
+
+    def resolve(self, source_id: str) -> str:
+        """Код по идентификатору из запроса
+
+        Неизвестный идентификатор — ошибка модели: анализировать его как
+        код значит выдать отчет по чужому тексту.
+        """
+        with self._lock:
+            entry = self._sources.get(source_id.strip())
+        if entry is None:
+            raise UnknownSourceError(f"Неизвестный source_id: {source_id[:64]!r}")
+        return entry[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sources)
@@ -0,0 +1,130 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from core.interfaces.metrics import IMetrics
+
+
+class TierMetrics:
+    """Задержка и токены вызовов модели по уровням"""
+
+    def __init__(self, metrics: Optional[IMetrics] = None):
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, Dict[str, float]] = {}
+        self._models: Dict[str, str] = {}
+        self._metrics = metrics
+
+    def handler(self, tier: str, model: str) -> "TierCallbackHandler":
+        return TierCallbackHandler(self, tier, model)
+
+    def record(
+        self,
+        tier: str,
+        model: str,
+        seconds: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        failed: bool = False,
+    ) -> None:
+        with self._lock:
+            self._models[tier] = model
+            entry = self._tiers.setdefault(
+                tier,
+                {
+                    "calls": 0,
+                    "errors": 0,
+                    "total_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                },
+            )
+            entry["calls"] += 1
+            entry["errors"] += int(failed)
+            entry["total_seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+            entry["prompt_tokens"] += prompt_tokens
+            entry["completion_tokens"] += completion_tokens
+        if self._metrics is not None:
+            self._metrics.observe_llm_call(
+                tier, model, seconds, prompt_tokens, completion_tokens, failed
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                tier: {
+                    "model": self._models[tier],
+                    **{k: v for k, v in entry.items() if k != "max_seconds"},
+                    "avg_ms": round(entry["total_seconds"] / entry["calls"] * 1000, 2)
+                    if entry["calls"]
+                    else None,
+                    "max_ms": round(entry["max_seconds"] * 1000, 2),
+                    "total_seconds": round(entry["total_seconds"], 3),
+                }
+                for tier, entry in self._tiers.items()
+            }
+
+
+class TierCallbackHandler(BaseCallbackHandler):
+    """Замеряет каждый вызов модели своего уровня, в агенте и напрямую"""
+
+    def __init__(self, metrics: TierMetrics, tier: str, model: str):
+        self._metrics = metrics
+        self._tier = tier
+        self._model = model
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(
+        self, serialized: Dict[str, Any], messages: List[Any], *, run_id: UUID, **kwargs
+    ) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(
+        self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs
+    ) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs) -> None:
+        prompt_tokens, completion_tokens = _token_usage(response)
+        self._metrics.record(
+            self._tier,
+            self._model,
+            self._elapsed(run_id),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        self._metrics.record(
+            self._tier, self._model, self._elapsed(run_id), failed=True
+        )
+
+    def _elapsed(self, run_id: UUID) -> float:
+        started: Optional[float] = self._started.pop(run_id, None)
+        return time.perf_counter() - started if started is not None else 0.0
+
+
+def _token_usage(response: LLMResult) -> Tuple[int, int]:
+    """Токены из usage_metadata сообщения, иначе из llm_output провайдера"""
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(
+                getattr(generation, "message", None), "usage_metadata", None
+            )
+            if usage:
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+    if prompt_tokens or completion_tokens:
+        return prompt_tokens, completion_tokens
+
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    return (
+        token_usage.get("prompt_tokens", 0),
+        token_usage.get("completion_tokens", 0),
+    )
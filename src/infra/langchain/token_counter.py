@@ -0,0 +1,72 @@
+import logging
+import math
+import threading
+from typing import Any, Optional
+
+from core.interfaces.token_counter import ITokenCounter
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_ENCODING = "cl100k_base"
+
+
+class ApproximateTokenCounter(ITokenCounter):
+    """Оценка сверху по числу символов, когда токенизатор недоступен"""
+
+    def __init__(self, chars_per_token: float = 3.0):
+        self._chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return math.ceil(len(text) / self._chars_per_token)
+
+
+class TiktokenCounter(ITokenCounter):
+    """Считает токены локально тем же BPE, что и модель
+
+    Словари tiktoken при первом использовании скачиваются из сети; без
+    доступа к ним счетчик переходит на приблизительную оценку.
+    """
+
+    def __init__(self, model_name: str, fallback: Optional[ITokenCounter] = None):
+        self._model_name = model_name
+        self._fallback = fallback or ApproximateTokenCounter()
+        self._encoding: Any = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_exact(self) -> bool:
+        return self._get_encoding() is not None
+
+    def count(self, text: str) -> int:
+        encoding = self._get_encoding()
+        if encoding is None:
+            return self._fallback.count(text)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def _get_encoding(self) -> Any:
+        if self._loaded:
+            return self._encoding
+        with self._lock:
+            if not self._loaded:
+                self._encoding = self._load_encoding()
+                self._loaded = True
+        return self._encoding
+
+    def _load_encoding(self) -> Any:
+        try:
+            import tiktoken
+        except ImportError:
+            logger.warning("tiktoken не установлен, токены считаются приблизительно")
+            return None
+        try:
+            name = tiktoken.encoding_name_for_model(self._model_name)
+        except KeyError:
+            name = FALLBACK_ENCODING
+        try:
+            return tiktoken.get_encoding(name)
+        except Exception as e:
+            logger.warning(
+                "Словарь tiktoken недоступен (%s), оценка приблизительная", e
+            )
+            return None
@@ -1,48 +1,45 @@
-from typing import List
+from contextlib import nullcontext
+from typing import List, Optional
 
 from core.interfaces.code_analyzer import ICodeAnalyzer
+from core.interfaces.metrics import IMetrics
 from core.interfaces.tool import ITool
-from domain.entities.code_review import Issue, Severity
+from domain.entities.code_review import FullReviewResult, Issue
+from domain.entities.parsed_source import ParsedSource
+from domain.services.scoring import calculate_score, determine_status
 from infra.langchain.code_report_generator import CodeReportGenerator
 
 
 class FullReviewCodeTool(ITool):
-    def __init__(self, code_analyzer: ICodeAnalyzer):
+    def __init__(
+        self, code_analyzer: ICodeAnalyzer, metrics: Optional[IMetrics] = None
+    ):
         self._code_analyzer = code_analyzer
+        self._metrics = metrics
 
     def execute(self, code: str) -> str:
-        issues = self._collect_all_issues(code)
-        improvements = self._code_analyzer.suggest_improvements(code)
-
-        score = self._calculate_score(issues)
-        status = self._determine_status(score, issues)
-
-        return CodeReportGenerator.generate_full_report(
-            issues, improvements, score, status
+        result = self.analyze(code)
+        timer = self._metrics.stage("full_report") if self._metrics else nullcontext()
+        with timer:
+            return CodeReportGenerator.generate_full_report(
+                result.issues, result.improvements, result.score, result.status
+            )
+
+    def analyze(self, code: str) -> FullReviewResult:
+        source = self._code_analyzer.parse(code)
+        issues = self._collect_all_issues(source)
+        improvements = self._code_analyzer.suggest_improvements(source)
+
+        score = calculate_score(issues)
+        status = determine_status(score, issues)
+
+        return FullReviewResult(
+            issues=issues, improvements=improvements, score=score, status=status
         )
 
-    def _collect_all_issues(self, code: str) -> List[Issue]:
+    def _collect_all_issues(self, source: ParsedSource) -> List[Issue]:
         issues = []
-        issues.extend(self._code_analyzer.analyze_syntax(code))
-        issues.extend(self._code_analyzer.check_style(code))
-        issues.extend(self._code_analyzer.detect_smells(code))
+        issues.extend(self._code_analyzer.analyze_syntax(source))
+        issues.extend(self._code_analyzer.check_style(source))
+        issues.extend(self._code_analyzer.detect_smells(source))
         return issues
-
-    def _calculate_score(self, issues: List[Issue]) -> int:
-        score = 10
-        for issue in issues:
-            if issue.severity == Severity.CRITICAL:
-                score -= 3
-            elif issue.severity == Severity.WARNING:
-                score -= 1
-        return max(0, score)
-
-    def _determine_status(self, score: int, issues: List[Issue]) -> str:
-        if any(issue.severity == Severity.CRITICAL for issue in issues):
-            return "КРИТИЧНО"
-        elif score >= 8:
-            return "ОТЛИЧНО"
-        elif score >= 6:
-            return "ХОРОШО"
-        else:
-            return "ТРЕБУЕТ ДОРАБОТКИ"
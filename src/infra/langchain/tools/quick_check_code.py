@@ -1,19 +1,45 @@
+from contextlib import nullcontext
+from typing import Optional
+
 from core.interfaces.code_analyzer import ICodeAnalyzer
+from core.interfaces.metrics import IMetrics
 from core.interfaces.tool import ITool
-from domain.entities.code_review import Severity
+from domain.entities.code_review import IssueType, QuickCheckResult, Severity
 from infra.langchain.code_report_generator import CodeReportGenerator
 
 
 class QuickCheckCodeTool(ITool):
-    def __init__(self, code_analyzer: ICodeAnalyzer):
+    def __init__(
+        self, code_analyzer: ICodeAnalyzer, metrics: Optional[IMetrics] = None
+    ):
         self._code_analyzer = code_analyzer
+        self._metrics = metrics
 
     def execute(self, code: str) -> str:
-        syntax_issues = self._code_analyzer.analyze_syntax(code)
+        result = self.analyze(code)
+        timer = self._metrics.stage("quick_report") if self._metrics else nullcontext()
+        with timer:
+            return CodeReportGenerator.generate_quick_report(
+                result.syntax_issues, result.critical_issues
+            )
+
+    def analyze(self, code: str) -> QuickCheckResult:
+        source = self._code_analyzer.parse(code)
+        syntax_issues = self._code_analyzer.analyze_syntax(source)
         critical_smells = [
             issue
-            for issue in self._code_analyzer.detect_smells(code)
+            for issue in self._code_analyzer.detect_smells(source)
             if issue.severity == Severity.CRITICAL
         ]
 
-        return CodeReportGenerator.generate_quick_report(syntax_issues, critical_smells)
+        total_critical = len(syntax_issues) + len(critical_smells)
+        return QuickCheckResult(
+            status="ПРОВАЛ" if total_critical > 0 else "УСПЕХ",
+            passed=total_critical == 0,
+            critical_count=total_critical,
+            security_count=sum(
+                1 for i in critical_smells if i.issue_type == IssueType.SECURITY
+            ),
+            syntax_issues=syntax_issues,
+            critical_issues=critical_smells,
+        )
@@ -0,0 +1,182 @@
+import logging
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+
+from core.interfaces.metrics import IMetrics
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+AGENT_ITERATION_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10, 15)
+# Ошибки провайдера тоже занимают время: их задержка пишется с outcome="error"
+OUTCOME_OK = "ok"
+OUTCOME_ERROR = "error"
+
+# Накопленные доли не показывают текущий интервал: в PromQL их считают
+# из счетчиков, например rate(hits_total) / (rate(hits_total) + rate(misses_total))
+CUMULATIVE_RATIOS: FrozenSet[str] = frozenset(
+    {"hit_rate", "reuse_rate", "requests_per_connection"}
+)
+
+StatsSource = Callable[[], Optional[Dict[str, Any]]]
+
+
+class PrometheusMetrics(IMetrics):
+    """Гистограммы этапов, запросов и вызовов LLM в формате Prometheus
+
+    Счетчики кэшей, очередей и пулов не дублируются: они читаются из stats()
+    компонентов в момент опроса /metrics. Накопительные поля отдаются как
+    counter, остальные числа — как gauge.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        namespace: str = "code_review",
+        stage_buckets: Optional[Sequence[float]] = None,
+        latency_buckets: Optional[Sequence[float]] = None,
+    ):
+        self.enabled = enabled
+        self.namespace = namespace
+        self._stats_sources: Dict[str, Tuple[StatsSource, FrozenSet[str]]] = {}
+        self.registry = CollectorRegistry()
+        latency = latency_buckets or Histogram.DEFAULT_BUCKETS
+        self._requests = Histogram(
+            "http_request_duration_seconds",
+            "Время обработки HTTP запроса",
+            ["method", "route", "status"],
+            namespace=namespace,
+            registry=self.registry,
+            buckets=latency,
+        )
+        self._stages = Histogram(
+            "stage_duration_seconds",
+            "Время этапа анализа: parse, check_style, detect_smells, отчеты",
+            ["stage"],
+            namespace=namespace,
+            registry=self.registry,
+            buckets=stage_buckets or Histogram.DEFAULT_BUCKETS,
+        )
+        self._llm_calls = Histogram(
+            "llm_call_duration_seconds",
+            "Время одного вызова модели",
+            ["tier", "model", "outcome"],
+            namespace=namespace,
+            registry=self.registry,
+            buckets=latency,
+        )
+        self._llm_tokens = Counter(
+            "llm_tokens",
+            "Токены вызовов модели по данным провайдера",
+            ["tier", "model", "kind"],
+            namespace=namespace,
+            registry=self.registry,
+        )
+        self._agent_iterations = Histogram(
+            "agent_iterations",
+            "Число ходов агента на запрос, включая итоговый ответ",
+            ["operation"],
+            namespace=namespace,
+            registry=self.registry,
+            buckets=AGENT_ITERATION_BUCKETS,
+        )
+        self.registry.register(_StatsCollector(namespace, self._stats_sources))
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        if self.enabled:
+            self._stages.labels(stage).observe(seconds)
+
+    def observe_llm_call(
+        self,
+        tier: str,
+        model: str,
+        seconds: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        failed: bool = False,
+    ) -> None:
+        if not self.enabled:
+            return
+        outcome = OUTCOME_ERROR if failed else OUTCOME_OK
+        self._llm_calls.labels(tier, model, outcome).observe(seconds)
+        if prompt_tokens:
+            self._llm_tokens.labels(tier, model, "prompt").inc(prompt_tokens)
+        if completion_tokens:
+            self._llm_tokens.labels(tier, model, "completion").inc(completion_tokens)
+
+    def observe_agent_iterations(self, operation: str, iterations: int) -> None:
+        if self.enabled:
+            self._agent_iterations.labels(operation).observe(iterations)
+
+    def observe_request(
+        self, method: str, route: str, status: int, seconds: float
+    ) -> None:
+        if self.enabled:
+            self._requests.labels(method, route, str(status)).observe(seconds)
+
+    def register_stats(
+        self, subsystem: str, source: StatsSource, counters: Iterable[str] = ()
+    ) -> None:
+        """Отдает числовые поля source() как <namespace>_<subsystem>_<поле>
+
+        Поля из counters только растут и становятся counter с суффиксом _total.
+        """
+        self._stats_sources[subsystem] = (source, frozenset(counters))
+
+    def render(self) -> bytes:
+        return generate_latest(self.registry)
+
+
+class _StatsCollector(Collector):
+    def __init__(
+        self,
+        namespace: str,
+        sources: Dict[str, Tuple[StatsSource, FrozenSet[str]]],
+    ):
+        self._namespace = namespace
+        self._sources = sources
+
+    def collect(self) -> Iterator[Metric]:
+        for subsystem, (source, counters) in list(self._sources.items()):
+            try:
+                stats = source()
+            except Exception:
+                logger.exception("Не удалось собрать метрики %s", subsystem)
+                continue
+            for name, value in _numeric_fields(stats or {}):
+                family = CounterMetricFamily if name in counters else GaugeMetricFamily
+                yield family(
+                    f"{self._namespace}_{subsystem}_{name}",
+                    f"{subsystem}: {name}",
+                    value=value,
+                )
+
+
+def _numeric_fields(stats: Dict[str, Any]) -> List[Tuple[str, float]]:
+    """Числа и флаги верхнего уровня; строки, вложенные словари и
+    накопленные доли пропускаются"""
+    return [
+        (name, float(value))
+        for name, value in stats.items()
+        if isinstance(value, (int, float)) and name not in CUMULATIVE_RATIOS
+    ]
@@ -0,0 +1,46 @@
+import re
+from typing import Iterable, List, NamedTuple, Sequence
+
+from flake8.defaults import IGNORE, NOQA_INLINE_REGEXP
+
+from domain.entities.code_review import Issue, IssueType, Severity
+
+
+def flake8_fingerprint(max_line_length: int) -> str:
+    return f"flake8:max-line-length={max_line_length}:ignore={','.join(IGNORE)}"
+
+
+class Diagnostic(NamedTuple):
+    line_number: int
+    column: int
+    code: str
+    text: str
+
+
+def is_noqa(diagnostic: Diagnostic, lines: Sequence[str]) -> bool:
+    """Повторяет обработку комментариев '# noqa' из flake8"""
+    if not 0 < diagnostic.line_number <= len(lines):
+        return False
+    match = NOQA_INLINE_REGEXP.search(lines[diagnostic.line_number - 1])
+    if match is None:
+        return False
+    codes = match.group("codes")
+    if not codes:
+        return True
+    return any(
+        diagnostic.code.startswith(code.strip())
+        for code in re.split(r"[,\s]+", codes)
+        if code.strip()
+    )
+
+
+def to_issues(diagnostics: Iterable[Diagnostic]) -> List[Issue]:
+    return [
+        Issue(
+            description=f"{d.code}: {d.code} {d.text}",
+            severity=Severity.WARNING,
+            issue_type=IssueType.STYLE,
+            line_number=d.line_number,
+        )
+        for d in diagnostics
+    ]
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import tempfile
+from typing import List
+
+from core.interfaces.style_checker import IStyleChecker
+from domain.entities.code_review import Issue, IssueType, Severity
+from domain.entities.parsed_source import ParsedSource
+from infra.style.diagnostics import flake8_fingerprint
+
+
+class SubprocessStyleChecker(IStyleChecker):
+    """Запускает flake8 отдельным процессом через временный файл"""
+
+    def __init__(self, max_line_length: int = 88, timeout: float = 10.0):
+        self._max_line_length = max_line_length
+        self._timeout = timeout
+
+    def fingerprint(self) -> str:
+        return flake8_fingerprint(self._max_line_length)
+
+    def check(self, source: ParsedSource) -> List[Issue]:
+        issues = []
+        try:
+            with tempfile.NamedTemporaryFile(
+                mode="w", suffix=".py", delete=False
+            ) as temp_file:
+                temp_file.write(source.code)
+                temp_file_path = temp_file.name
+
+            try:
+                result = self._run_flake(temp_file_path)
+                if result.returncode != 0:
+                    for line in result.stdout.strip().split("\n"):
+                        if line.strip():
+                            parts = line.split(":", 3)
+                            if len(parts) >= 4:
+                                line_num = int(parts[1])
+                                error_code = parts[3].split()[0]
+                                description = parts[3].strip()
+
+                                issues.append(
+                                    Issue(
+                                        description=f"{error_code}: {description}",
+                                        severity=Severity.WARNING,
+                                        issue_type=IssueType.STYLE,
+                                        line_number=line_num,
+                                    )
+                                )
+            finally:
+                os.unlink(temp_file_path)
+
+        except Exception:
+            pass
+
+        return issues
+
+    def _run_flake(self, temp_file_path):
+        return subprocess.run(
+            [
+                "flake8",
+                f"--max-line-length={self._max_line_length}",
+                temp_file_path,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=self._timeout,
+        )
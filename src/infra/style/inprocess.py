@@ -0,0 +1,104 @@
+import ast
+from typing import List, Optional, Sequence
+
+import pycodestyle
+from flake8.defaults import IGNORE
+from flake8.plugins.pyflakes import FlakesChecker
+
+from core.interfaces.style_checker import IStyleChecker
+from domain.entities.code_review import Issue
+from domain.entities.parsed_source import ParsedSource
+from infra.style.diagnostics import (
+    Diagnostic,
+    flake8_fingerprint,
+    is_noqa,
+    to_issues,
+)
+
+STYLE_FILENAME = "stdin.py"
+
+
+class _CollectingReport(pycodestyle.BaseReport):
+    def init_file(self, filename, lines, expected, line_offset):
+        self.diagnostics: List[Diagnostic] = []
+        return super().init_file(filename, lines, expected, line_offset)
+
+    def error(self, line_number, offset, text, check):
+        code = super().error(line_number, offset, text, check)
+        if code:
+            self.diagnostics.append(Diagnostic(line_number, offset + 1, code, text[5:]))
+        return code
+
+
+class StyleEngine:
+    """flake8 (pycodestyle + pyflakes) как библиотека, без файлов и процессов"""
+
+    def __init__(self, max_line_length: int = 88):
+        self._max_line_length = max_line_length
+        self._style_guide = pycodestyle.StyleGuide(
+            quiet=True,
+            ignore=list(IGNORE),
+            max_line_length=max_line_length,
+            reporter=_CollectingReport,
+        )
+
+    def run(
+        self,
+        code: str,
+        lines: Optional[Sequence[str]] = None,
+        tree: Optional[ast.AST] = None,
+    ) -> List[Diagnostic]:
+        lines = list(lines if lines is not None else code.splitlines(keepends=True))
+        if tree is None:
+            try:
+                tree = ast.parse(code)
+            except (SyntaxError, ValueError) as e:
+                return [self._syntax_diagnostic(e)]
+
+        diagnostics = self._run_pyflakes(tree)
+        diagnostics.extend(self._run_pycodestyle(lines))
+        diagnostics.sort(key=lambda d: (d.line_number, d.column))
+        return [d for d in diagnostics if not is_noqa(d, lines)]
+
+    def _run_pyflakes(self, tree: ast.AST) -> List[Diagnostic]:
+        diagnostics = []
+        for line_number, column, text, _ in FlakesChecker(tree, STYLE_FILENAME).run():
+            code, _, message = text.partition(" ")
+            diagnostics.append(Diagnostic(line_number, column + 1, code, message))
+        return diagnostics
+
+    def _run_pycodestyle(self, lines: List[str]) -> List[Diagnostic]:
+        report = self._style_guide.init_report()
+        checker = pycodestyle.Checker(
+            STYLE_FILENAME,
+            lines=lines,
+            options=self._style_guide.options,
+            report=report,
+        )
+        checker.check_all()
+        return report.diagnostics
+
+    @staticmethod
+    def _syntax_diagnostic(error: Exception) -> Diagnostic:
+        row, column = 1, 0
+        if len(error.args) > 1 and error.args[1] and len(error.args[1]) > 2:
+            row, column = error.args[1][1:3]
+        return Diagnostic(
+            row, (column or 0) + 1, "E999", f"{type(error).__name__}: {error.args[0]}"
+        )
+
+
+class InProcessStyleChecker(IStyleChecker):
+    def __init__(self, max_line_length: int = 88):
+        self._max_line_length = max_line_length
+        self._engine = StyleEngine(max_line_length=max_line_length)
+
+    def fingerprint(self) -> str:
+        return flake8_fingerprint(self._max_line_length)
+
+    def check(self, source: ParsedSource) -> List[Issue]:
+        if source.parse_error is not None:
+            return to_issues(self._engine.run(source.code))
+        return to_issues(
+            self._engine.run(source.code, lines=source.lines, tree=source.tree)
+        )
@@ -0,0 +1,186 @@
+import logging
+import multiprocessing
+import queue
+import threading
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List
+
+from core.interfaces.style_checker import IStyleChecker
+from domain.entities.code_review import Issue
+from domain.entities.parsed_source import ParsedSource
+from infra.style.diagnostics import Diagnostic, flake8_fingerprint, to_issues
+
+logger = logging.getLogger(__name__)
+
+
+class StyleWorkerError(Exception):
+    pass
+
+
+def _worker_main(conn: Connection, max_line_length: int) -> None:
+    """Цикл воркера: плагины flake8 загружаются один раз на весь процесс"""
+    from infra.style.inprocess import StyleEngine
+
+    engine = StyleEngine(max_line_length=max_line_length)
+    while True:
+        try:
+            code = conn.recv()
+        except (EOFError, OSError):
+            break
+        if code is None:
+            break
+        try:
+            conn.send([tuple(d) for d in engine.run(code)])
+        except Exception as e:
+            conn.send(StyleWorkerError(f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, context: Any, max_line_length: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, max_line_length),
+            daemon=True,
+            name="style-worker",
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=1)
+        self.conn.close()
+
+
+class StyleWorkerPool:
+    """Пул долгоживущих процессов flake8 с перезапуском упавших и зависших"""
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_line_length: int = 88,
+        timeout: float = 10.0,
+        max_tasks_per_worker: int = 1000,
+        start_method: str = "spawn",
+    ):
+        self._size = size
+        self._max_line_length = max_line_length
+        self._timeout = timeout
+        self._max_tasks_per_worker = max_tasks_per_worker
+        self._context = multiprocessing.get_context(start_method)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self._recycled = 0
+        self._tasks = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self._size):
+                self._idle.put(self._add_worker())
+            self._started = True
+
+    def run(self, code: str) -> List[Diagnostic]:
+        if self._closed:
+            raise StyleWorkerError("Пул style-воркеров остановлен")
+        self.start()
+
+        try:
+            worker = self._idle.get(timeout=self._timeout)
+        except queue.Empty:
+            raise StyleWorkerError("Нет свободных style-воркеров")
+
+        try:
+            try:
+                result = self._submit(worker, code)
+            except EOFError:
+                worker = self._recycle(worker, "упал")
+                result = self._submit(worker, code)
+        except TimeoutError:
+            worker = self._recycle(worker, "завис")
+            raise StyleWorkerError(f"Проверка стиля не уложилась в {self._timeout} с")
+        except EOFError:
+            worker = self._recycle(worker, "упал повторно")
+            raise StyleWorkerError("style-воркер аварийно завершился")
+        finally:
+            if worker.tasks >= self._max_tasks_per_worker:
+                worker = self._recycle(worker, "исчерпал лимит задач")
+            self._idle.put(worker)
+
+        if isinstance(result, Exception):
+            raise result
+        return [Diagnostic(*item) for item in result]
+
+    @property
+    def max_line_length(self) -> int:
+        return self._max_line_length
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            alive = sum(1 for w in self._workers if w.process.is_alive())
+            return {
+                "size": self._size,
+                "alive": alive,
+                "idle": self._idle.qsize(),
+                "tasks": self._tasks,
+                "recycled": self._recycled,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            for worker in self._workers:
+                worker.stop()
+            self._workers.clear()
+
+    def _submit(self, worker: _Worker, code: str) -> Any:
+        try:
+            worker.conn.send(code)
+            if not worker.conn.poll(self._timeout):
+                raise TimeoutError
+            result = worker.conn.recv()
+        except (OSError, BrokenPipeError):
+            raise EOFError
+        worker.tasks += 1
+        with self._lock:
+            self._tasks += 1
+        return result
+
+    def _recycle(self, worker: _Worker, reason: str) -> _Worker:
+        logger.warning("style-воркер %s %s, перезапуск", worker.process.pid, reason)
+        worker.kill()
+        with self._lock:
+            self._workers.remove(worker)
+            self._recycled += 1
+            return self._add_worker()
+
+    def _add_worker(self) -> _Worker:
+        worker = _Worker(self._context, self._max_line_length)
+        self._workers.append(worker)
+        return worker
+
+
+class PooledStyleChecker(IStyleChecker):
+    def __init__(self, pool: StyleWorkerPool):
+        self._pool = pool
+
+    def fingerprint(self) -> str:
+        return flake8_fingerprint(self._pool.max_line_length)
+
+    def check(self, source: ParsedSource) -> List[Issue]:
+        return to_issues(self._pool.run(source.code))
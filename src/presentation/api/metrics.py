@@ -0,0 +1,84 @@
+import time
+from typing import Awaitable, Callable
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from core.container import Container
+from infra.metrics.prometheus import CONTENT_TYPE, PrometheusMetrics
+
+# Запросы мимо маршрутов пишутся одной меткой, чтобы не раздувать кардинальность
+UNMATCHED_ROUTE = "unmatched"
+# Накопительные поля stats(), отдаваемые как counter
+CACHE_COUNTERS = ("hits", "misses", "evictions")
+UNIT_COUNTERS = ("reused", "analyzed")
+ADMISSION_COUNTERS = (
+    "admitted",
+    "queued",
+    "rejected_rate_limited",
+    "rejected_overloaded",
+)
+COALESCING_COUNTERS = ("leaders", "joined")
+JOB_STORE_COUNTERS = ("submitted", "deduplicated")
+JOB_WORKER_COUNTERS = ("processed", "failed", "deferred")
+HTTP_COUNTERS = ("requests", "errors", "connections_opened")
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+@inject
+def prometheus_metrics(
+    metrics: PrometheusMetrics = Depends(Provide[Container.metrics]),
+) -> Response:
+    """Метрики сервиса в текстовом формате Prometheus"""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Метрики отключены")
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
+
+async def record_request_time(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Время до начала ответа по шаблону маршрута, а не по фактическому пути"""
+    started = time.perf_counter()
+    response = await call_next(request)
+    container = getattr(request.app.state, "container", None)
+    if container is not None:
+        route = request.scope.get("route")
+        container.metrics().observe_request(
+            request.method,
+            getattr(route, "path", UNMATCHED_ROUTE),
+            response.status_code,
+            time.perf_counter() - started,
+        )
+    return response
+
+
+def register_service_stats(container: Container) -> None:
+    """Кэши, очереди и пулы отдаются в /metrics по их stats() на момент опроса"""
+    metrics = container.metrics()
+    llm_response_cache = container.llm_response_cache()
+    http_client_pool = container.http_client_pool()
+
+    metrics.register_stats(
+        "analysis_cache", container.analysis_cache().stats, CACHE_COUNTERS
+    )
+    metrics.register_stats(
+        "definition_units", container.unit_analyzer().stats, UNIT_COUNTERS
+    )
+    if llm_response_cache is not None:
+        metrics.register_stats("llm_cache", llm_response_cache.stats, CACHE_COUNTERS)
+    metrics.register_stats(
+        "admission", container.llm_scheduler().stats, ADMISSION_COUNTERS
+    )
+    metrics.register_stats(
+        "coalescing", container.single_flight().stats, COALESCING_COUNTERS
+    )
+    metrics.register_stats("jobs", container.job_store().stats, JOB_STORE_COUNTERS)
+    metrics.register_stats(
+        "job_workers", container.review_job_workers().stats, JOB_WORKER_COUNTERS
+    )
+    metrics.register_stats(
+        "http", lambda: http_client_pool.stats().get("async"), HTTP_COUNTERS
+    )
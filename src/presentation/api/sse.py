@@ -0,0 +1,23 @@
+import json
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+from domain.entities.review_stream import ReviewStreamEvent
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def format_sse(event: ReviewStreamEvent) -> str:
+    data = json.dumps(event.data, ensure_ascii=False)
+    return f"event: {event.event.value}\ndata: {data}\n\n"
+
+
+def sse_response(events: AsyncIterator[ReviewStreamEvent]) -> StreamingResponse:
+    async def body() -> AsyncIterator[str]:
+        async for event in events:
+            yield format_sse(event)
+
+    return StreamingResponse(
+        body(), media_type="text/event-stream", headers=SSE_HEADERS
+    )
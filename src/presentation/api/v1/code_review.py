@@ -1,21 +1,51 @@
+import math
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, Field
-
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, HttpUrl
+
+from application.services.job_workers import ReviewJobWorkers
+from application.services.single_flight import SingleFlight
+from application.use_cases.batch_review import (
+    BatchFile,
+    BatchReviewCommand,
+    BatchReviewUseCase,
+)
 from application.use_cases.compare_versions import (
     CompareVersionsCommand,
     CompareVersionsUseCase,
 )
 from application.use_cases.explain_issue import ExplainIssueCommand, ExplainIssueUseCase
-from application.use_cases.quick_check import QuickCheckCommand, QuickCheckUseCase
+from application.use_cases.quick_check import (
+    QuickCheckCommand,
+    QuickCheckUseCase,
+    StaticQuickCheckResult,
+)
 from application.use_cases.review_code import (
     FullReviewCodeCommand,
     FullReviewCodeUseCase,
 )
+from application.use_cases.review_diff import DiffReviewCommand, DiffReviewUseCase
+from application.use_cases.review_jobs import ReviewJobUseCase, SubmitReviewJobCommand
+from application.use_cases.stream_review_code import (
+    StreamReviewCodeCommand,
+    StreamReviewCodeUseCase,
+)
 from core.container import Container
+from core.interfaces.cache import ICache
+from core.interfaces.job_store import IJobStore
+from domain.entities.code_review import AnalysisMode
+from domain.services.llm_response_cache import LLMResponseCache
+from domain.services.model_router import ModelRouter
+from domain.services.unit_analyzer import UnitAnalyzer
+from infra.concurrency.llm_scheduler import AdmissionRejected, LLMScheduler
+from infra.http.http_client import HTTPClientPool
+from infra.langchain.agent_runtime import AgentRuntime
+from infra.langchain.llm_provider import LangChainLLMProvider
+from presentation.api.sse import sse_response
 
 router = APIRouter(prefix="/v1/code-review", tags=["code-review"])
 
@@ -26,8 +56,28 @@ class ReviewRequest(BaseModel):
     format: str = Field("detailed", description="Формат отчета")
 
 
+class ReviewJobRequest(BaseModel):
+    code: str = Field(..., min_length=1, description="Python код для анализа")
+    callback_url: HttpUrl | None = Field(
+        None, description="Куда отправить результат после завершения задачи"
+    )
+
+
 class QuickCheckRequest(BaseModel):
     code: str = Field(..., min_length=1, description="Python код для быстрой проверки")
+    mode: AnalysisMode | None = Field(
+        None, description="static — без LLM, llm — с исправлением от модели"
+    )
+
+
+class DiffReviewRequest(BaseModel):
+    diff: str = Field(..., min_length=1, description="Unified diff одного файла")
+    base_code: str = Field(
+        "", description="Исходная версия файла; пустая для нового файла"
+    )
+    mode: AnalysisMode = Field(
+        AnalysisMode.LLM, description="static — без LLM, llm — с ревью изменений"
+    )
 
 
 class ExplainIssueRequest(BaseModel):
@@ -40,6 +90,24 @@ class CompareVersionsRequest(BaseModel):
         ..., min_length=1, description="Оригинальная версия кода"
     )
     improved_code: str = Field(..., min_length=1, description="Улучшенная версия кода")
+    mode: AnalysisMode = Field(
+        AnalysisMode.LLM, description="static — только дельта анализа, llm — и LLM"
+    )
+
+
+class BatchFileRequest(BaseModel):
+    path: str = Field(..., min_length=1, description="Путь к файлу")
+    code: str = Field(..., description="Python код файла")
+
+
+class BatchReviewRequest(BaseModel):
+    files: List[BatchFileRequest] = Field(..., min_length=1, description="Файлы")
+    mode: AnalysisMode = Field(
+        AnalysisMode.STATIC, description="static — без LLM, llm — с ревью от модели"
+    )
+    llm_concurrency: int | None = Field(
+        None, ge=1, description="Максимум одновременных вызовов LLM"
+    )
 
 
 class LLMResponse(BaseModel):
@@ -55,7 +123,7 @@ class ApiResponse(BaseModel):
 
 @router.post("/review", response_model=ApiResponse)
 @inject
-def review_code(
+async def review_code(
     request: ReviewRequest,
     use_case: FullReviewCodeUseCase = Depends(Provide[Container.review_code_use_case]),
 ) -> ApiResponse:
@@ -63,41 +131,172 @@ def review_code(
     try:
         command = FullReviewCodeCommand(code=request.code)
 
-        result = use_case.execute(command)
+        result = await use_case.execute(command)
 
         return ApiResponse(
             success=True,
             data=LLMResponse(answer=result).model_dump(),
         )
 
+    except AdmissionRejected as e:
+        raise _admission_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка анализа: {str(e)}")
 
 
+@router.post("/jobs", response_model=ApiResponse, status_code=202)
+@inject
+async def submit_review_job(
+    request: ReviewJobRequest,
+    use_case: ReviewJobUseCase = Depends(Provide[Container.review_job_use_case]),
+) -> ApiResponse:
+    """Ставит полное ревью в очередь и сразу возвращает id задачи"""
+    try:
+        command = SubmitReviewJobCommand(
+            code=request.code,
+            callback_url=str(request.callback_url) if request.callback_url else None,
+        )
+
+        job = await use_case.submit(command)
+
+        return ApiResponse(success=True, data=job.model_dump(mode="json"))
+
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Ошибка постановки задачи: {str(e)}"
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=ApiResponse)
+@inject
+async def get_review_job(
+    job_id: str,
+    use_case: ReviewJobUseCase = Depends(Provide[Container.review_job_use_case]),
+) -> ApiResponse:
+    """Статус и результат задачи ревью"""
+    job = await use_case.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+    return ApiResponse(success=True, data=job.model_dump(mode="json"))
+
+
+@router.post("/review/stream")
+@inject
+async def review_code_stream(
+    request: ReviewRequest,
+    use_case: StreamReviewCodeUseCase = Depends(
+        Provide[Container.stream_review_code_use_case]
+    ),
+) -> StreamingResponse:
+    """Ревью кода потоком SSE: сначала статический отчет, затем токены LLM"""
+    command = StreamReviewCodeCommand(code=request.code)
+    return sse_response(use_case.execute(command))
+
+
 @router.post("/quick-check", response_model=ApiResponse)
 @inject
-def quick_check(
+async def quick_check(
     request: QuickCheckRequest,
     use_case: QuickCheckUseCase = Depends(Provide[Container.quick_check_use_case]),
 ) -> ApiResponse:
     """Быстрая проверка кода на критичные проблемы"""
     try:
-        command = QuickCheckCommand(code=request.code)
-        result = use_case.execute(command)
-
+        command = QuickCheckCommand(code=request.code, mode=request.mode)
+        result = await use_case.execute(command)
+
+        if isinstance(result, StaticQuickCheckResult):
+            return ApiResponse(
+                success=True,
+                data={
+                    "mode": AnalysisMode.STATIC.value,
+                    **result.model_dump(mode="json"),
+                },
+            )
         return ApiResponse(
             success=True,
             data=LLMResponse(answer=result).model_dump(),
         )
+    except AdmissionRejected as e:
+        raise _admission_error(e)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Ошибка быстрой проверки: {str(e)}"
         )
 
 
+@router.post("/review/diff", response_model=ApiResponse)
+@inject
+async def review_diff(
+    request: DiffReviewRequest,
+    use_case: DiffReviewUseCase = Depends(Provide[Container.review_diff_use_case]),
+) -> ApiResponse:
+    """Ревью только изменённых строк по unified diff"""
+    try:
+        command = DiffReviewCommand(
+            diff=request.diff, base_code=request.base_code, mode=request.mode
+        )
+
+        result = await use_case.execute(command)
+
+        return ApiResponse(success=True, data=result.model_dump(mode="json"))
+
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except AdmissionRejected as e:
+        raise _admission_error(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка ревью изменений: {str(e)}")
+
+
+@router.post("/batch", response_model=ApiResponse)
+@inject
+async def batch_review(
+    request: BatchReviewRequest,
+    use_case: BatchReviewUseCase = Depends(Provide[Container.batch_review_use_case]),
+) -> ApiResponse:
+    """Пакетное ревью множества файлов с параллельной обработкой"""
+    try:
+        result = await use_case.execute(_batch_command(request))
+
+        return ApiResponse(success=True, data=result.model_dump(mode="json"))
+
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка пакетного ревью: {str(e)}")
+
+
+@router.post("/batch/stream")
+@inject
+async def batch_review_stream(
+    request: BatchReviewRequest,
+    use_case: BatchReviewUseCase = Depends(Provide[Container.batch_review_use_case]),
+) -> StreamingResponse:
+    """Пакетное ревью потоком SSE: событие на каждый готовый файл и итог"""
+    return sse_response(use_case.stream_events(_batch_command(request)))
+
+
+def _admission_error(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=e.status_code,
+        detail=str(e),
+        headers={"Retry-After": str(math.ceil(e.retry_after))},
+    )
+
+
+def _batch_command(request: BatchReviewRequest) -> BatchReviewCommand:
+    return BatchReviewCommand(
+        files=[BatchFile(path=f.path, code=f.code) for f in request.files],
+        mode=request.mode,
+        llm_concurrency=request.llm_concurrency,
+    )
+
+
 @router.post("/explain", response_model=ApiResponse)
 @inject
-def explain_issue(
+async def explain_issue(
     request: ExplainIssueRequest,
     use_case: ExplainIssueUseCase = Depends(Provide[Container.explain_issue_use_case]),
 ) -> ApiResponse:
@@ -107,17 +306,19 @@ def explain_issue(
             code=request.code, issue_description=request.issue_description
         )
 
-        result = use_case.execute(command)
+        result = await use_case.execute(command)
 
         return ApiResponse(success=True, data={"explanation": result})
 
+    except AdmissionRejected as e:
+        raise _admission_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка объяснения: {str(e)}")
 
 
 @router.post("/compare", response_model=ApiResponse)
 @inject
-def compare_versions(
+async def compare_versions(
     request: CompareVersionsRequest,
     use_case: CompareVersionsUseCase = Depends(
         Provide[Container.compare_versions_use_case]
@@ -126,17 +327,59 @@ def compare_versions(
     """Сравнение двух версий кода"""
     try:
         command = CompareVersionsCommand(
-            original_code=request.original_code, improved_code=request.improved_code
+            original_code=request.original_code,
+            improved_code=request.improved_code,
+            mode=request.mode,
         )
 
-        result = use_case.execute(command)
+        result = await use_case.execute(command)
 
-        return ApiResponse(success=True, data={"comparison": result})
+        return ApiResponse(success=True, data=result.model_dump(mode="json"))
 
+    except AdmissionRejected as e:
+        raise _admission_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка сравнения: {str(e)}")
 
 
+@router.get("/stats")
+@inject
+def service_stats(
+    analysis_cache: ICache = Depends(Provide[Container.analysis_cache]),
+    llm_response_cache: LLMResponseCache | None = Depends(
+        Provide[Container.llm_response_cache]
+    ),
+    agent_runtime: AgentRuntime = Depends(Provide[Container.agent_runtime]),
+    unit_analyzer: UnitAnalyzer = Depends(Provide[Container.unit_analyzer]),
+    http_client_pool: HTTPClientPool = Depends(Provide[Container.http_client_pool]),
+    single_flight: SingleFlight = Depends(Provide[Container.single_flight]),
+    llm_scheduler: LLMScheduler = Depends(Provide[Container.llm_scheduler]),
+    job_store: IJobStore = Depends(Provide[Container.job_store]),
+    model_router: ModelRouter = Depends(Provide[Container.model_router]),
+    llm_provider: LangChainLLMProvider = Depends(Provide[Container.llm_provider]),
+    review_job_workers: ReviewJobWorkers = Depends(
+        Provide[Container.review_job_workers]
+    ),
+) -> Dict[str, Any]:
+    """Счетчики кэшей и пулов сервиса"""
+    return {
+        "analysis_cache": analysis_cache.stats(),
+        "definition_units": unit_analyzer.stats(),
+        "llm_cache": llm_response_cache.stats() if llm_response_cache else None,
+        "agent": agent_runtime.stats(),
+        "http": http_client_pool.stats(),
+        "coalescing": single_flight.stats(),
+        "admission": llm_scheduler.stats(),
+        "jobs": {**job_store.stats(), **review_job_workers.stats()},
+        "routing": {
+            **model_router.stats(),
+            "models": llm_provider.tier_models,
+            "tiers": llm_provider.tier_metrics.stats(),
+        },
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
 @router.get("/health")
 def health_check() -> Dict[str, Any]:
     """Проверка состояния сервиса ревью кода"""
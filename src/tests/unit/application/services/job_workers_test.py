@@ -0,0 +1,187 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from application.services.job_workers import ReviewJobWorkers
+from application.use_cases.review_jobs import ReviewJobUseCase, SubmitReviewJobCommand
+from domain.entities.review_job import JobStatus
+from infra.concurrency.llm_scheduler import AdmissionRejected
+from infra.jobs.sqlite_store import SQLiteJobStore
+from infra.jobs.webhook import WebhookNotifier
+
+
+def make_notifier():
+    return Mock(notify=AsyncMock(return_value=True), is_allowed=Mock(return_value=True))
+
+
+def make_workers(store, review_code_use_case, notifier=None, max_attempts=3):
+    return ReviewJobWorkers(
+        job_store=store,
+        review_code_use_case=review_code_use_case,
+        notifier=notifier or make_notifier(),
+        workers=2,
+        poll_interval_seconds=0.01,
+        max_attempts=max_attempts,
+        retry_backoff_seconds=0.01,
+    )
+
+
+async def wait_finished(store, job_id):
+    for _ in range(200):
+        job = store.get(job_id)
+        if job.finished:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("задача не завершилась")
+
+
+def test_submitted_job_is_reviewed_and_callback_is_sent(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    review = Mock(review=AsyncMock(return_value="review"))
+    notifier = make_notifier()
+    workers = make_workers(store, review, notifier)
+    use_case = ReviewJobUseCase(store, workers, notifier)
+
+    async def scenario():
+        workers.start()
+        command = SubmitReviewJobCommand(code="x = 1", callback_url="http://ci/hook")
+        job = await use_case.submit(command)
+        duplicate = await use_case.submit(command)
+        finished = await wait_finished(store, job.id)
+        await workers.stop()
+        return job, duplicate, finished
+
+    job, duplicate, finished = asyncio.run(scenario())
+
+    assert duplicate.id == job.id
+    assert finished.status == JobStatus.DONE
+    assert finished.result == "review"
+    review.review.assert_awaited_once()
+    url, payload = notifier.notify.await_args.args
+    assert url == "http://ci/hook"
+    assert payload["status"] == "done"
+    assert "code" not in payload
+
+
+def test_rejected_admission_defers_job_instead_of_failing(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    review = Mock(
+        review=AsyncMock(side_effect=[AdmissionRejected("занято", 503, 0.01), "review"])
+    )
+    notifier = make_notifier()
+    workers = make_workers(store, review, notifier)
+    use_case = ReviewJobUseCase(store, workers, notifier)
+
+    async def scenario():
+        workers.start()
+        job = await use_case.submit(SubmitReviewJobCommand(code="x = 1"))
+        finished = await wait_finished(store, job.id)
+        await workers.stop()
+        return finished
+
+    finished = asyncio.run(scenario())
+
+    assert finished.status == JobStatus.DONE
+    assert finished.attempts == 1
+    assert workers.stats()["deferred"] == 1
+
+
+def test_llm_failure_is_retried_then_job_fails(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    review = Mock(review=AsyncMock(side_effect=RuntimeError("провайдер недоступен")))
+    notifier = make_notifier()
+    workers = make_workers(store, review, notifier, max_attempts=2)
+    use_case = ReviewJobUseCase(store, workers, notifier)
+
+    async def scenario():
+        workers.start()
+        command = SubmitReviewJobCommand(code="x = 1", callback_url="http://ci/hook")
+        job = await use_case.submit(command)
+        finished = await wait_finished(store, job.id)
+        await workers.stop()
+        return finished
+
+    finished = asyncio.run(scenario())
+
+    assert finished.status == JobStatus.FAILED
+    assert "провайдер недоступен" in finished.error
+    assert finished.attempts == 2
+    assert review.review.await_count == 2
+    assert workers.stats()["failed"] == 1
+    assert notifier.notify.await_args.args[1]["status"] == "failed"
+
+
+def test_every_deduplicated_caller_gets_callback(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    review = Mock(review=AsyncMock(return_value="review"))
+    notifier = make_notifier()
+    workers = make_workers(store, review, notifier)
+    use_case = ReviewJobUseCase(store, workers, notifier)
+
+    async def scenario():
+        first = await use_case.submit(
+            SubmitReviewJobCommand(code="x = 1", callback_url="a")
+        )
+        await use_case.submit(SubmitReviewJobCommand(code="x = 1", callback_url="b"))
+        workers.start()
+        await wait_finished(store, first.id)
+        await workers.stop()
+        # Готовая задача: адрес позднего клиента оповещается сразу
+        await use_case.submit(SubmitReviewJobCommand(code="x = 1", callback_url="c"))
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+
+    urls = [call.args[0] for call in notifier.notify.await_args_list]
+    assert sorted(urls) == ["a", "b", "c"]
+    assert all(
+        "callback_urls" not in c.args[1] for c in notifier.notify.await_args_list
+    )
+
+
+def test_callback_outside_allowlist_is_rejected(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    notifier = WebhookNotifier(Mock(), allowed_hosts=["ci.example.com"])
+    workers = make_workers(store, Mock(), notifier)
+    use_case = ReviewJobUseCase(store, workers, notifier)
+
+    command = SubmitReviewJobCommand(code="x = 1", callback_url="http://10.0.0.1/hook")
+    with pytest.raises(ValueError):
+        asyncio.run(use_case.submit(command))
+
+    assert store.stats()["queued"] == 0
+
+
+def test_heartbeat_keeps_long_job_from_being_reclaimed(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = SQLiteJobStore(path, lease_seconds=0.3)
+
+    async def slow_review(command):
+        await asyncio.sleep(0.6)
+        return "review"
+
+    review = Mock(review=AsyncMock(side_effect=slow_review))
+    workers = ReviewJobWorkers(
+        job_store=store,
+        review_code_use_case=review,
+        notifier=make_notifier(),
+        workers=1,
+        poll_interval_seconds=0.01,
+        lease_seconds=0.3,
+    )
+
+    async def scenario():
+        job = store.submit("hash", "x = 1")
+        workers.start()
+        await asyncio.sleep(0.45)
+        reclaimed = SQLiteJobStore(path).claim()
+        finished = await wait_finished(store, job.id)
+        await workers.stop()
+        return reclaimed, finished
+
+    reclaimed, finished = asyncio.run(scenario())
+
+    assert reclaimed is None
+    assert finished.status == JobStatus.DONE
+    assert finished.attempts == 1
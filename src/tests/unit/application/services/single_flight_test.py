@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from application.services.single_flight import SingleFlight, flight_key
+
+
+def test_concurrent_calls_with_same_key_share_one_computation():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def burst():
+        key = flight_key("full_review", "x = 1\n")
+        return await asyncio.gather(
+            *(single_flight.run(key, compute) for _ in range(5))
+        )
+
+    assert asyncio.run(burst()) == ["result"] * 5
+    assert len(calls) == 1
+    assert single_flight.stats() == {
+        "enabled": True,
+        "in_flight": 0,
+        "leaders": 1,
+        "joined": 4,
+    }
+
+
+def test_different_operations_do_not_share_results():
+    assert flight_key("quick_check", "x") != flight_key("full_review", "x")
+    assert flight_key("compare", "ab", "c") != flight_key("compare", "a", "bc")
+
+
+def test_error_reaches_every_waiter_and_next_call_recomputes():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def burst():
+        return await asyncio.gather(
+            *(single_flight.run("key", failing) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    outcomes = asyncio.run(burst())
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert len(calls) == 1
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(single_flight.run("key", failing))
+    assert len(calls) == 2
+
+
+def test_cancelled_waiter_does_not_cancel_shared_computation():
+    single_flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def scenario():
+        first = asyncio.ensure_future(single_flight.run("key", compute))
+        second = asyncio.ensure_future(single_flight.run("key", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "result"
+
+
+def test_disabled_single_flight_runs_every_call():
+    single_flight = SingleFlight(enabled=False)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def burst():
+        return await asyncio.gather(
+            *(single_flight.run("key", compute) for _ in range(3))
+        )
+
+    asyncio.run(burst())
+    assert len(calls) == 3
@@ -0,0 +1,122 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from application.use_cases.batch_review import (
+    BatchFile,
+    BatchReviewCommand,
+    BatchReviewUseCase,
+)
+from core.config.batch import BatchSettings
+from domain.entities.code_review import AnalysisMode
+from domain.entities.review_stream import ReviewStreamEventType
+
+FILES = [
+    BatchFile(path="a.py", code="def f(x):\n    return eval(x)\n"),
+    BatchFile(path="b.py", code='def g():\n    """Doc"""\n    return 1\n'),
+    BatchFile(path="broken.py", code="def h(:\n"),
+]
+
+
+@pytest.fixture
+def llm_service() -> Mock:
+    service = Mock()
+    service.afull_code_review_response = AsyncMock(return_value="llm answer")
+    return service
+
+
+@pytest.fixture
+def pool():
+    executor = ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+def make_use_case(llm_service, pool, **settings) -> BatchReviewUseCase:
+    return BatchReviewUseCase(
+        llm_service=llm_service, process_pool=pool, settings=BatchSettings(**settings)
+    )
+
+
+def test_static_batch_keeps_order_and_aggregates(llm_service, pool):
+    use_case = make_use_case(llm_service, pool)
+
+    result = asyncio.run(use_case.execute(BatchReviewCommand(files=FILES)))
+
+    assert [f.path for f in result.files] == ["a.py", "b.py", "broken.py"]
+    assert result.files[0].critical_issues_count == 1
+    assert result.summary.files == 3
+    assert result.summary.failed == 0
+    assert result.summary.critical_issues >= 1
+    llm_service.afull_code_review_response.assert_not_awaited()
+
+
+def test_duplicate_paths_keep_their_positions(llm_service, pool):
+    use_case = make_use_case(llm_service, pool)
+    files = [FILES[1].model_copy(update={"path": "a.py"}), FILES[0]]
+
+    result = asyncio.run(use_case.execute(BatchReviewCommand(files=files)))
+
+    assert [f.index for f in result.files] == [0, 1]
+    assert [f.path for f in result.files] == ["a.py", "a.py"]
+    assert result.files[0].critical_issues_count == 0
+    assert result.files[1].critical_issues_count == 1
+
+
+def test_llm_concurrency_is_shared_across_batches(llm_service, pool):
+    use_case = make_use_case(llm_service, pool, llm_concurrency=1)
+    active = peak = 0
+
+    async def review(code):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return "llm answer"
+
+    llm_service.afull_code_review_response = AsyncMock(side_effect=review)
+
+    async def two_batches():
+        command = BatchReviewCommand(files=FILES[:2], mode=AnalysisMode.LLM)
+        await asyncio.gather(use_case.execute(command), use_case.execute(command))
+
+    asyncio.run(two_batches())
+
+    assert peak == 1
+    assert llm_service.afull_code_review_response.await_count == 4
+
+
+def test_llm_mode_calls_llm_per_file(llm_service, pool):
+    use_case = make_use_case(llm_service, pool)
+    command = BatchReviewCommand(files=FILES[:2], mode=AnalysisMode.LLM)
+
+    result = asyncio.run(use_case.execute(command))
+
+    assert [f.answer for f in result.files] == ["llm answer", "llm answer"]
+    assert llm_service.afull_code_review_response.await_count == 2
+
+
+def test_stream_events_end_with_summary(llm_service, pool):
+    use_case = make_use_case(llm_service, pool)
+
+    async def collect():
+        command = BatchReviewCommand(files=FILES[:2])
+        return [event async for event in use_case.stream_events(command)]
+
+    events = asyncio.run(collect())
+
+    assert [e.event for e in events] == [
+        ReviewStreamEventType.FILE,
+        ReviewStreamEventType.FILE,
+        ReviewStreamEventType.SUMMARY,
+    ]
+
+
+def test_too_many_files_rejected(llm_service, pool):
+    use_case = make_use_case(llm_service, pool, max_files=1)
+
+    with pytest.raises(ValueError):
+        asyncio.run(use_case.execute(BatchReviewCommand(files=FILES)))
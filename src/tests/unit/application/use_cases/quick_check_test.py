@@ -0,0 +1,69 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from application.use_cases.quick_check import (
+    QuickCheckCommand,
+    QuickCheckUseCase,
+    StaticQuickCheckResult,
+)
+from core.config.quick_check import QuickCheckSettings
+from domain.entities.code_review import AnalysisMode
+from infra.concurrency.analysis_executor import AnalysisExecutor
+from infra.langchain.tools.quick_check_code import QuickCheckCodeTool
+
+CODE_WITH_EVAL = "def f(x):\n    return eval(x)\n"
+
+
+@pytest.fixture
+def llm_service() -> Mock:
+    service = Mock()
+    service.aquick_check_response = AsyncMock(return_value="llm answer")
+    return service
+
+
+def make_use_case(llm_service, code_analyzer_service, mode: AnalysisMode):
+    return QuickCheckUseCase(
+        llm_service=llm_service,
+        quick_check_code_tool=QuickCheckCodeTool(code_analyzer_service),
+        analysis_executor=AnalysisExecutor(1),
+        settings=QuickCheckSettings(mode=mode, static_slo_ms=1000),
+    )
+
+
+def test_static_mode_skips_llm(llm_service, code_analyzer_service):
+    use_case = make_use_case(llm_service, code_analyzer_service, AnalysisMode.STATIC)
+
+    outcome = asyncio.run(use_case.execute(QuickCheckCommand(code=CODE_WITH_EVAL)))
+
+    assert isinstance(outcome, StaticQuickCheckResult)
+    assert outcome.result.passed is False
+    assert outcome.result.security_count == 1
+    assert outcome.within_slo is True
+    llm_service.aquick_check_response.assert_not_awaited()
+
+
+def test_request_mode_overrides_global_setting(llm_service, code_analyzer_service):
+    use_case = make_use_case(llm_service, code_analyzer_service, AnalysisMode.STATIC)
+    command = QuickCheckCommand(code=CODE_WITH_EVAL, mode=AnalysisMode.LLM)
+
+    assert asyncio.run(use_case.execute(command)) == "llm answer"
+
+
+def test_identical_concurrent_llm_checks_share_one_call(
+    llm_service, code_analyzer_service
+):
+    async def slow_answer(code):
+        await asyncio.sleep(0.01)
+        return "llm answer"
+
+    llm_service.aquick_check_response = AsyncMock(side_effect=slow_answer)
+    use_case = make_use_case(llm_service, code_analyzer_service, AnalysisMode.LLM)
+    command = QuickCheckCommand(code=CODE_WITH_EVAL)
+
+    async def burst():
+        return await asyncio.gather(*(use_case.execute(command) for _ in range(4)))
+
+    assert asyncio.run(burst()) == ["llm answer"] * 4
+    llm_service.aquick_check_response.assert_awaited_once()
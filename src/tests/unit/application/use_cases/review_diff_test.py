@@ -0,0 +1,75 @@
+import asyncio
+import difflib
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from application.use_cases.review_diff import DiffReviewCommand, DiffReviewUseCase
+from core.config.diff_review import DiffReviewSettings
+from domain.entities.code_review import AnalysisMode
+from infra.concurrency.analysis_executor import AnalysisExecutor
+
+BASE = (
+    "def legacy(x):\n"
+    "    return eval(x)\n"
+    "\n"
+    "\n" + "".join(f"VALUE_{i} = {i}\n" for i in range(40)) + "\n"
+    "\n"
+    "def handler(a):\n"
+    '    """Обработчик"""\n'
+    "    return a\n"
+)
+
+NEW = BASE.replace(
+    "    return a\n", "    try:\n        return a\n    except:\n        pass\n"
+)
+
+
+@pytest.fixture
+def llm_service() -> Mock:
+    service = Mock()
+    service.areview_diff_response = AsyncMock(return_value="llm answer")
+    return service
+
+
+def make_command(mode: AnalysisMode) -> DiffReviewCommand:
+    diff = "".join(
+        difflib.unified_diff(
+            BASE.splitlines(keepends=True), NEW.splitlines(keepends=True)
+        )
+    )
+    return DiffReviewCommand(diff=diff, base_code=BASE, mode=mode)
+
+
+def make_use_case(llm_service, code_analyzer_service) -> DiffReviewUseCase:
+    return DiffReviewUseCase(
+        llm_service=llm_service,
+        code_analyzer=code_analyzer_service,
+        analysis_executor=AnalysisExecutor(mode="inline"),
+        settings=DiffReviewSettings(context_lines=1),
+    )
+
+
+def test_only_issues_on_changed_lines_reported(llm_service, code_analyzer_service):
+    use_case = make_use_case(llm_service, code_analyzer_service)
+
+    result = asyncio.run(use_case.execute(make_command(AnalysisMode.STATIC)))
+
+    assert [issue.description for issue in result.issues] == [
+        "E722: E722 do not use bare 'except'",
+        "Пустой except блок",
+    ]
+    assert "eval" not in result.excerpt
+    assert "except:" in result.excerpt
+    llm_service.areview_diff_response.assert_not_awaited()
+
+
+def test_llm_receives_only_excerpt(llm_service, code_analyzer_service):
+    use_case = make_use_case(llm_service, code_analyzer_service)
+
+    result = asyncio.run(use_case.execute(make_command(AnalysisMode.LLM)))
+
+    assert result.answer == "llm answer"
+    excerpt = llm_service.areview_diff_response.await_args.kwargs["excerpt"]
+    assert excerpt == result.excerpt
+    assert len(excerpt.splitlines()) < len(NEW.splitlines()) // 4
@@ -0,0 +1,61 @@
+import asyncio
+from typing import AsyncIterator
+from unittest.mock import Mock
+
+from application.use_cases.stream_review_code import (
+    StreamReviewCodeCommand,
+    StreamReviewCodeUseCase,
+)
+from core.interfaces.llm_service import ILLMService
+from domain.entities.review_stream import ReviewStreamEventType
+from infra.concurrency.analysis_executor import AnalysisExecutor
+
+
+def stream_llm_service(tokens) -> ILLMService:
+    """Отдает заданные токены потоком; остальные ответы в тестах не нужны"""
+
+    async def astream_full_code_review(code: str) -> AsyncIterator[str]:
+        for token in tokens:
+            if isinstance(token, Exception):
+                raise token
+            yield token
+
+    llm_service = Mock(spec=ILLMService)
+    llm_service.astream_full_code_review = astream_full_code_review
+    return llm_service
+
+
+def collect(use_case: StreamReviewCodeUseCase):
+    async def run():
+        command = StreamReviewCodeCommand(code="x = 1\n")
+        return [event async for event in use_case.execute(command)]
+
+    return asyncio.run(run())
+
+
+def make_use_case(tokens) -> StreamReviewCodeUseCase:
+    tool = Mock()
+    tool.execute.return_value = "REPORT"
+    return StreamReviewCodeUseCase(
+        stream_llm_service(tokens), tool, AnalysisExecutor(1)
+    )
+
+
+def test_static_report_is_sent_before_llm_tokens():
+    events = collect(make_use_case(["def ", "f(): ..."]))
+
+    assert [e.event for e in events] == [
+        ReviewStreamEventType.REPORT,
+        ReviewStreamEventType.TOKEN,
+        ReviewStreamEventType.TOKEN,
+        ReviewStreamEventType.DONE,
+    ]
+    assert events[0].data["report"] == "REPORT"
+    assert "".join(e.data["text"] for e in events[1:3]) == "def f(): ..."
+
+
+def test_llm_failure_ends_stream_with_error_event():
+    events = collect(make_use_case(["partial", RuntimeError("boom")]))
+
+    assert events[-1].event == ReviewStreamEventType.ERROR
+    assert "boom" in events[-1].data["error"]
@@ -0,0 +1,30 @@
+import httpx
+
+from benchmarks.load import Sample, is_error_answer, summarize
+
+
+def api_response(answer: str, success: bool = True) -> httpx.Response:
+    body = {"success": success, "data": {"answer": answer}}
+    return httpx.Response(200, json=body)
+
+
+def test_error_text_in_successful_response_is_an_error():
+    assert is_error_answer(api_response("Ошибка при анализе кода: timeout"))
+    assert is_error_answer(api_response("ok", success=False))
+    assert not is_error_answer(api_response("Ревью готово"))
+
+
+def test_summary_counts_error_answers_as_errors():
+    samples = [
+        Sample("review", 200, 10.0, 0.0),
+        Sample("review", 200, 5.0, 0.0, answer_error=True),
+        Sample("review", 503, 1.0, 0.0),
+    ]
+
+    summary = summarize(samples, elapsed=1.0)
+
+    assert summary["ok"] == 1
+    assert summary["errors"] == 2
+    assert summary["answer_errors"] == 1
+    assert summary["statuses"] == {"200": 2, "503": 1}
+    assert summary["p50_ms"] == 10.0
@@ -0,0 +1,75 @@
+from unittest.mock import patch
+
+from core.interfaces.style_checker import IStyleChecker
+from domain.services.cached_code_analyzer import CachedCodeAnalyzer
+from domain.services.code_analyzer import CodeAnalyzerService
+from infra.cache.memory import MemoryCache
+
+CODE = "def f():\n    try:\n        eval('1')\n    except Exception:\n        pass\n"
+
+
+def test_cache_hit_skips_analysis(code_analyzer_service: CodeAnalyzerService):
+    cache = MemoryCache(max_size=16)
+    analyzer = CachedCodeAnalyzer(code_analyzer_service, cache)
+    expected = analyzer.detect_smells(analyzer.parse(CODE))
+
+    with patch("ast.parse") as parse:
+        assert analyzer.detect_smells(analyzer.parse(CODE)) == expected
+        parse.assert_not_called()
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cached_issues_are_not_shared_with_callers(
+    code_analyzer_service: CodeAnalyzerService,
+):
+    analyzer = CachedCodeAnalyzer(code_analyzer_service, MemoryCache(max_size=16))
+    first = analyzer.detect_smells(CODE)
+    first[0].description = "изменено вызывающим"
+
+    second = analyzer.detect_smells(CODE)
+    second[0].suggestion = "тоже изменено"
+
+    third = analyzer.detect_smells(CODE)
+    assert third[0].description != "изменено вызывающим"
+    assert third[0].suggestion != "тоже изменено"
+
+
+def test_cache_key_depends_on_configuration(
+    code_analyzer_service: CodeAnalyzerService,
+):
+    source = code_analyzer_service.parse(CODE)
+    first = CachedCodeAnalyzer(code_analyzer_service, MemoryCache())
+    second = CachedCodeAnalyzer(
+        CodeAnalyzerService(style_checker=_StyleChecker()), MemoryCache()
+    )
+
+    assert first.cache_key("style", source) != second.cache_key("style", source)
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_memory_cache_expires_entries():
+    cache = MemoryCache(max_size=2, ttl_seconds=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+
+
+class _StyleChecker(IStyleChecker):
+    def check(self, source):
+        return []
+
+    def fingerprint(self) -> str:
+        return "flake8:max-line-length=120"
@@ -1,9 +1,15 @@
+import ast
 from typing import List
 
 import pytest
 
 from core.interfaces.code_analyzer import ICodeAnalyzer
 from domain.entities.code_review import Issue, IssueType, Severity
+from domain.services.code_analyzer import CodeAnalyzerService
+from domain.services.rules.default import build_default_registry
+from domain.services.rules.engine import RuleEngine
+from domain.services.unit_analyzer import UnitAnalyzer
+from infra.cache.memory import MemoryCache
 
 SIMPLE_CODE_WITHOUT_EXC = "print('hello world')"
 CODE_WITH_EXC = "print(/'hello world')"
@@ -48,3 +54,64 @@ def test_check_style_without_issues(
     issues = code_analyzer_service.check_style(code)
 
     assert issues == expected
+
+
+def test_parsed_source_is_parsed_once(
+    code_analyzer_service: ICodeAnalyzer, monkeypatch: pytest.MonkeyPatch
+):
+    calls = []
+    original_parse = ast.parse
+
+    def counting_parse(*args, **kwargs):
+        calls.append(args)
+        return original_parse(*args, **kwargs)
+
+    monkeypatch.setattr(ast, "parse", counting_parse)
+    source = code_analyzer_service.parse(SIMPLE_CODE_WITHOUT_EXC)
+
+    code_analyzer_service.analyze_syntax(source)
+    code_analyzer_service.detect_smells(source)
+    code_analyzer_service.suggest_improvements(source)
+
+    assert len(calls) == 1
+
+
+def test_analyze_syntax_accepts_parsed_source(code_analyzer_service: ICodeAnalyzer):
+    source = code_analyzer_service.parse(CODE_WITH_EXC)
+
+    issues = code_analyzer_service.analyze_syntax(source)
+
+    assert source.tree is None
+    assert [issue.line_number for issue in issues] == [1]
+
+
+MODULE_V1 = """def load(path):
+    return eval(open(path).read())
+
+
+def save(a, b, c, d, e, f):
+    return a
+"""
+
+MODULE_V2 = """def load(path):
+    return open(path).read()
+
+
+def save(a, b, c, d, e, f):
+    return a
+"""
+
+
+def test_unchanged_definitions_served_from_unit_cache():
+    rule_engine = RuleEngine(build_default_registry())
+    unit_analyzer = UnitAnalyzer(rule_engine, MemoryCache(max_size=16))
+    analyzer = CodeAnalyzerService(rule_engine=rule_engine, unit_analyzer=unit_analyzer)
+    analyzer.detect_smells(MODULE_V1)
+
+    smells = analyzer.detect_smells(MODULE_V2)
+
+    assert smells == CodeAnalyzerService(rule_engine=rule_engine).detect_smells(
+        MODULE_V2
+    )
+    assert [issue.line_number for issue in smells] == [5]
+    assert unit_analyzer.stats()["reused"] == 1
@@ -0,0 +1,53 @@
+from typing import Dict, List
+
+from core.interfaces.metrics import IMetrics
+from domain.services.code_analyzer import CodeAnalyzerService
+from domain.services.instrumented_code_analyzer import InstrumentedCodeAnalyzer
+
+CODE = "def f(x):\n    return eval(x)\n"
+
+
+class _Metrics(IMetrics):
+    def __init__(self):
+        self.stages: Dict[str, List[float]] = {}
+
+    def observe_stage(self, stage, seconds):
+        self.stages.setdefault(stage, []).append(seconds)
+
+    def observe_llm_call(self, *args, **kwargs):
+        pass
+
+    def observe_agent_iterations(self, operation, iterations):
+        pass
+
+    def observe_request(self, method, route, status, seconds):
+        pass
+
+
+def test_parse_is_measured_once_per_source(
+    code_analyzer_service: CodeAnalyzerService,
+):
+    metrics = _Metrics()
+    analyzer = InstrumentedCodeAnalyzer(code_analyzer_service, metrics)
+    source = analyzer.parse(CODE)
+
+    analyzer.analyze_syntax(source)
+    smells = analyzer.detect_smells(source)
+
+    assert len(metrics.stages["parse"]) == 1
+    assert set(metrics.stages) == {"parse", "analyze_syntax", "detect_smells"}
+    assert smells == code_analyzer_service.detect_smells(CODE)
+
+
+def test_parse_is_not_forced_when_disabled(
+    code_analyzer_service: CodeAnalyzerService,
+):
+    metrics = _Metrics()
+    analyzer = InstrumentedCodeAnalyzer(
+        code_analyzer_service, metrics, measure_parse=False
+    )
+
+    analyzer.suggest_improvements(CODE)
+
+    assert "parse" not in metrics.stages
+    assert len(metrics.stages["suggest_improvements"]) == 1
@@ -0,0 +1,332 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from domain.services.llm_response_cache import LLMResponseCache
+from domain.services.llm_service import LLMService
+from domain.services.model_router import TIER_LARGE, TIER_SMALL, ModelRouter
+from domain.services.prompt_budget import PromptBudget
+from infra.cache.memory import MemoryCache
+from infra.concurrency.llm_scheduler import AdmissionRejected, LLMScheduler
+from infra.langchain.agent_runtime import AgentRuntime
+from infra.langchain.llm_provider import LangChainLLMProvider
+from infra.langchain.token_counter import ApproximateTokenCounter
+
+
+@pytest.fixture
+def llm_provider() -> LangChainLLMProvider:
+    provider = Mock(spec=LangChainLLMProvider)
+    provider.model_name = "gpt-3.5-turbo"
+    provider.temperature = 0.1
+    provider.executor.ainvoke = AsyncMock(return_value={"output": "ok"})
+    provider.acomplete = AsyncMock(return_value="ok")
+    return provider
+
+
+def make_service(provider, cache) -> LLMService:
+    return LLMService(
+        agent_runtime=AgentRuntime(provider, Mock(), Mock()),
+        response_cache=cache,
+    )
+
+
+def test_identical_requests_hit_response_cache(llm_provider):
+    service = make_service(llm_provider, LLMResponseCache(MemoryCache()))
+
+    first = asyncio.run(service.afull_code_review_response("x = 1\n"))
+    second = asyncio.run(service.afull_code_review_response("x = 1\r\n"))
+
+    assert first == second == "ok"
+    llm_provider.executor.ainvoke.assert_awaited_once()
+
+
+def test_whitespace_different_inputs_miss_response_cache(llm_provider):
+    service = make_service(llm_provider, LLMResponseCache(MemoryCache()))
+
+    for code in ("x = 1\n", "x = 1   \n", "\n\nx = 1\n", "x = 1"):
+        asyncio.run(service.afull_code_review_response(code))
+
+    assert llm_provider.executor.ainvoke.await_count == 4
+
+
+def test_operations_do_not_share_cache_entries(llm_provider):
+    service = make_service(llm_provider, LLMResponseCache(MemoryCache()))
+
+    asyncio.run(service.afull_code_review_response("x = 1"))
+    asyncio.run(service.aquick_check_response("x = 1"))
+
+    assert llm_provider.executor.ainvoke.await_count == 2
+
+
+def test_hot_temperature_bypasses_cache(llm_provider):
+    llm_provider.temperature = 0.9
+    service = make_service(
+        llm_provider, LLMResponseCache(MemoryCache(), max_temperature=0.3)
+    )
+
+    asyncio.run(service.aexplain_issue_response("x = 1", "issue"))
+    asyncio.run(service.aexplain_issue_response("x = 1", "issue"))
+
+    assert llm_provider.executor.ainvoke.await_count == 2
+
+
+def test_errors_are_not_cached(llm_provider):
+    llm_provider.executor.ainvoke.side_effect = [
+        RuntimeError("boom"),
+        {"output": "ok"},
+    ]
+    service = make_service(llm_provider, LLMResponseCache(MemoryCache()))
+
+    first = asyncio.run(service.acompare_versions_response("a", "b"))
+    assert first.startswith("Ошибка")
+    assert asyncio.run(service.acompare_versions_response("a", "b")) == "ok"
+
+
+def test_agent_is_built_once_across_requests(llm_provider):
+    runtime = AgentRuntime(llm_provider, Mock(), Mock())
+    service = LLMService(agent_runtime=runtime)
+
+    asyncio.run(service.afull_code_review_response("x = 1"))
+    asyncio.run(service.aquick_check_response("y = 2"))
+
+    llm_provider.setup_agent.assert_called_once()
+    assert runtime.stats()["build_seconds"] is not None
+
+
+def test_async_response_uses_ainvoke_and_cache(llm_provider):
+    llm_provider.executor.ainvoke = AsyncMock(return_value={"output": "async ok"})
+    service = make_service(llm_provider, LLMResponseCache(MemoryCache()))
+
+    async def review_twice():
+        return [await service.afull_code_review_response("x = 1") for _ in range(2)]
+
+    assert asyncio.run(review_twice()) == ["async ok", "async ok"]
+    llm_provider.executor.ainvoke.assert_awaited_once()
+
+
+def agent_events(*events):
+    async def astream_events(payload, version):
+        for event in events:
+            yield event
+
+    return astream_events
+
+
+def chat_event(kind: str, run_id: str, **data):
+    return {"event": f"on_chat_model_{kind}", "run_id": run_id, "data": data}
+
+
+def test_stream_yields_and_caches_only_final_agent_turn(llm_provider):
+    tool_call = {"name": "full_review", "args": "{}", "id": "call_1", "index": 0}
+    llm_provider.executor.astream_events = agent_events(
+        chat_event("start", "tool-turn"),
+        chat_event("stream", "tool-turn", chunk=AIMessageChunk(content="Сейчас ")),
+        chat_event(
+            "stream",
+            "tool-turn",
+            chunk=AIMessageChunk(content="", tool_call_chunks=[tool_call]),
+        ),
+        chat_event("end", "tool-turn", output=AIMessage(content="Сейчас ")),
+        {"event": "on_tool_end", "run_id": "tool", "data": {}},
+        chat_event("start", "answer"),
+        chat_event("stream", "answer", chunk=AIMessageChunk(content="Итог: ")),
+        chat_event("stream", "answer", chunk=AIMessageChunk(content="ok")),
+        chat_event("end", "answer", output=AIMessage(content="Итог: ok")),
+    )
+    cache = LLMResponseCache(MemoryCache())
+    service = make_service(llm_provider, cache)
+
+    async def stream():
+        return [t async for t in service.astream_full_code_review("x = 1\n")]
+
+    assert asyncio.run(stream()) == ["Итог: ", "ok"]
+    assert asyncio.run(stream()) == ["Итог: ok"]
+
+
+def make_budget(context_window: int) -> PromptBudget:
+    return PromptBudget(
+        ApproximateTokenCounter(chars_per_token=1),
+        context_window=context_window,
+        max_output_tokens=0,
+    )
+
+
+BIG_CODE = "".join(f"def f{i}(x):\n    return x + {i}\n\n\n" for i in range(60))
+
+
+def test_prompt_references_source_id_instead_of_repeating_code(llm_provider):
+    service = make_service(llm_provider, None)
+
+    asyncio.run(service.afull_code_review_response("x = 1\n"))
+
+    message = llm_provider.executor.ainvoke.call_args.args[0]["input"]
+    source_id = service.agent_runtime.sources.source_id("x = 1\n")
+    assert f"source_id={source_id}" in message
+    assert len(service.agent_runtime.sources) == 0
+
+
+def test_oversized_code_is_reviewed_by_map_reduce(llm_provider):
+    llm_provider.acomplete.return_value = "merged"
+    service = LLMService(
+        agent_runtime=AgentRuntime(llm_provider, Mock(), Mock()),
+        prompt_budget=make_budget(context_window=2000),
+    )
+
+    answer = asyncio.run(service.afull_code_review_response(BIG_CODE))
+
+    assert answer == "merged"
+    chunks = [
+        call.args[0]["input"] for call in llm_provider.executor.ainvoke.call_args_list
+    ]
+    assert len(chunks) > 1
+    assert all("def f0(" not in chunk for chunk in chunks[1:])
+    llm_provider.acomplete.assert_awaited()
+
+
+def test_long_partial_reviews_are_trimmed_to_fit_reduce(llm_provider):
+    llm_provider.executor.ainvoke.return_value = {"output": "проблема\n" * 300}
+    llm_provider.acomplete.return_value = "merged"
+    service = LLMService(
+        agent_runtime=AgentRuntime(llm_provider, Mock(), Mock()),
+        prompt_budget=make_budget(context_window=2000),
+    )
+
+    assert asyncio.run(service.afull_code_review_response(BIG_CODE)) == "merged"
+    reduce_messages = [call.args[0] for call in llm_provider.acomplete.call_args_list]
+    assert reduce_messages
+    assert all(len(message) <= 2000 for message in reduce_messages)
+
+
+def test_oversized_compare_sends_diff(llm_provider):
+    service = LLMService(
+        agent_runtime=AgentRuntime(llm_provider, Mock(), Mock()),
+        prompt_budget=make_budget(context_window=2000),
+    )
+
+    asyncio.run(
+        service.acompare_versions_response(BIG_CODE, BIG_CODE.replace("x + 7", "x - 7"))
+    )
+
+    message = llm_provider.executor.ainvoke.call_args.args[0]["input"]
+    assert "```diff" in message
+    assert len(message) <= 2000
+
+
+def test_direct_pipeline_makes_single_completion_with_local_report(llm_provider):
+    llm_provider.acomplete.return_value = "direct answer"
+    full_review_code_tool = Mock()
+    full_review_code_tool.execute.return_value = "ОТЧЕТ"
+    service = LLMService(
+        agent_runtime=AgentRuntime(llm_provider, full_review_code_tool, Mock()),
+        pipeline="direct",
+    )
+
+    answer = asyncio.run(service.afull_code_review_response("x = 1\n"))
+
+    assert answer == "direct answer"
+    full_review_code_tool.execute.assert_called_once_with("x = 1\n")
+    assert "ОТЧЕТ" in llm_provider.acomplete.call_args.args[0]
+    llm_provider.executor.ainvoke.assert_not_called()
+    llm_provider.setup_agent.assert_not_called()
+
+
+def test_direct_pipeline_explain_skips_agent(llm_provider):
+    llm_provider.acomplete = AsyncMock(return_value="explained")
+    service = LLMService(
+        agent_runtime=AgentRuntime(llm_provider, Mock(), Mock()), pipeline="direct"
+    )
+
+    answer = asyncio.run(service.aexplain_issue_response("x = 1", "issue"))
+
+    assert answer == "explained"
+    llm_provider.setup_agent.assert_not_called()
+
+
+def test_admission_rejection_is_not_swallowed(llm_provider):
+    llm_provider.executor.ainvoke = AsyncMock(return_value={"output": "ok"})
+    service = LLMService(
+        agent_runtime=AgentRuntime(llm_provider, Mock(), Mock()),
+        prompt_budget=make_budget(16385),
+        scheduler=LLMScheduler(requests_per_minute=2, max_wait_seconds=0.01),
+    )
+
+    assert asyncio.run(service.aquick_check_response("x = 1")) == "ok"
+    with pytest.raises(AdmissionRejected) as rejected:
+        asyncio.run(service.aquick_check_response("y = 2"))
+
+    assert rejected.value.status_code == 429
+    assert rejected.value.retry_after > 0
+
+
+def make_cascade_service(llm_provider, tool_result):
+    full_review_code_tool = Mock()
+    full_review_code_tool.execute.return_value = "ОТЧЕТ"
+    full_review_code_tool.analyze.return_value = tool_result
+    llm_provider.model_for.side_effect = lambda tier: f"model-{tier}"
+    return LLMService(
+        agent_runtime=AgentRuntime(llm_provider, full_review_code_tool, Mock()),
+        pipeline="direct",
+        model_router=ModelRouter(
+            enabled=True,
+            operation_tiers={"full_review": "small"},
+            analyzed_operations=["full_review"],
+            min_answer_chars=10,
+        ),
+    )
+
+
+def test_cascade_keeps_valid_small_model_answer(llm_provider):
+    llm_provider.acomplete = AsyncMock(
+        return_value="Исправлено:\n```python\nx = 1\n```"
+    )
+    service = make_cascade_service(llm_provider, Mock(critical_issues_count=0))
+
+    asyncio.run(service.afull_code_review_response("x = 1\n"))
+
+    assert [c.kwargs["tier"] for c in llm_provider.acomplete.await_args_list] == [
+        TIER_SMALL
+    ]
+
+
+def test_cascade_escalates_invalid_small_answer_and_critical_code(llm_provider):
+    llm_provider.acomplete = AsyncMock(
+        side_effect=["без кода", "Исправлено:\n```python\nx = 1\n```"]
+    )
+    service = make_cascade_service(llm_provider, Mock(critical_issues_count=0))
+
+    answer = asyncio.run(service.afull_code_review_response("x = 1\n"))
+
+    assert "```python" in answer
+    assert [c.kwargs["tier"] for c in llm_provider.acomplete.await_args_list] == [
+        TIER_SMALL,
+        TIER_LARGE,
+    ]
+
+    llm_provider.acomplete.reset_mock(side_effect=True)
+    llm_provider.acomplete.return_value = "ответ большой модели"
+    critical = make_cascade_service(llm_provider, Mock(critical_issues_count=2))
+    asyncio.run(critical.afull_code_review_response("eval(x)\n"))
+    assert llm_provider.acomplete.await_args.kwargs["tier"] == TIER_LARGE
+
+
+def test_stream_caches_small_model_answer_only_if_it_passes_check(llm_provider):
+    answers = iter(["без кода", "Исправлено:\n```python\nx = 1\n```"])
+    streamed_tiers = []
+
+    async def astream(message, tier=None):
+        streamed_tiers.append(tier)
+        yield next(answers)
+
+    llm_provider.astream = astream
+    service = make_cascade_service(llm_provider, Mock(critical_issues_count=0))
+    service.response_cache = LLMResponseCache(MemoryCache())
+
+    async def stream():
+        return "".join([t async for t in service.astream_full_code_review("x = 1\n")])
+
+    assert asyncio.run(stream()) == "без кода"
+    assert "```python" in asyncio.run(stream())
+    assert "```python" in asyncio.run(stream())
+    assert streamed_tiers == [TIER_SMALL, TIER_SMALL]
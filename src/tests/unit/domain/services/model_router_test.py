@@ -0,0 +1,61 @@
+import pytest
+
+from domain.services.model_router import TIER_LARGE, TIER_SMALL, ModelRouter
+
+VALID_ANSWER = (
+    "Код в порядке, мелкие правки:\n```python\ndef f(x):\n    return x\n```\n"
+)
+
+
+def make_router(**kwargs) -> ModelRouter:
+    return ModelRouter(
+        enabled=True,
+        operation_tiers={"full_review": "small", "explain_issue": "large"},
+        analyzed_operations=["full_review"],
+        **kwargs,
+    )
+
+
+def test_clean_small_file_stays_on_small_model():
+    decision = make_router().route("full_review", "x = 1\n", critical_issues=0)
+
+    assert decision.tier == TIER_SMALL
+
+
+def test_critical_issues_and_large_files_escalate():
+    router = make_router(large_file_lines=10)
+
+    assert router.route("full_review", "x = 1\n", 1).reason == "critical_issues"
+    assert router.route("full_review", "x = 1\n" * 20).reason == "large_file"
+    assert router.route("explain_issue").tier == TIER_LARGE
+    assert router.stats()["decisions"] == {
+        "large:critical_issues": 1,
+        "large:large_file": 1,
+        "large:operation": 1,
+    }
+
+
+def test_review_answer_must_contain_parsable_code():
+    router = make_router(min_answer_chars=10)
+
+    assert router.is_valid("full_review", VALID_ANSWER)
+    assert not router.is_valid("full_review", "Все хорошо, исправлений нет.")
+    assert not router.is_valid("full_review", "Исправлено:\n```python\ndef f(:\n```")
+    assert router.is_valid("explain_issue", "Проблема в том, что eval небезопасен.")
+
+
+def test_only_python_blocks_are_parsed():
+    router = make_router(min_answer_chars=10)
+    shell = "Установите:\n```bash\npip install -U requests\n```\n"
+    indented = "Метод класса:\n```py\n    def f(self):\n        return 1\n```\n"
+
+    assert router.is_valid("full_review", shell + VALID_ANSWER)
+    assert router.is_valid("full_review", '```json\n{"a": [1,}\n```\n' + VALID_ANSWER)
+    assert router.is_valid("full_review", indented)
+    assert router.is_valid("full_review", "```\nx = 1\n```\n```python\ndef f(:\n```")
+    assert not router.is_valid("full_review", shell)
+
+
+def test_unknown_tier_in_settings_is_rejected():
+    with pytest.raises(ValueError):
+        ModelRouter(enabled=True, operation_tiers={"full_review": "medium"})
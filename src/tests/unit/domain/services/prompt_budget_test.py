@@ -0,0 +1,65 @@
+import pytest
+
+from domain.services.prompt_budget import MIN_CHUNK_TOKENS, PromptBudget
+from infra.langchain.token_counter import ApproximateTokenCounter
+
+FUNCTION = '''def handler_{i}(value):
+    """Обработчик {i}"""
+    return value * {i}
+
+'''
+CODE = "import os\n\n\n" + "".join(FUNCTION.format(i=i) for i in range(10))
+
+
+def make_budget(context_window: int = 10_000) -> PromptBudget:
+    return PromptBudget(
+        ApproximateTokenCounter(chars_per_token=1),
+        context_window=context_window,
+        max_output_tokens=1000,
+        overhead_tokens=500,
+    )
+
+
+def test_available_excludes_output_and_overhead():
+    assert make_budget().available == 8500
+
+
+def test_window_without_room_for_prompt_is_rejected():
+    with pytest.raises(ValueError):
+        make_budget(context_window=1500)
+
+
+def test_limit_below_minimum_chunk_is_rejected():
+    with pytest.raises(ValueError):
+        make_budget().split_code(CODE, limit=MIN_CHUNK_TOKENS - 1)
+
+
+def test_truncate_keeps_leading_lines_and_note():
+    text = make_budget().truncate(CODE, limit=100, note="...")
+
+    assert CODE.startswith(text[:-3])
+    assert text.endswith("...")
+    assert len(text) <= 100
+
+
+def test_small_code_is_not_split():
+    assert make_budget().split_code(CODE, limit=len(CODE)) == [CODE]
+
+
+def test_split_at_definition_boundaries():
+    limit = len(FUNCTION.format(i=0)) * 3
+
+    chunks = make_budget().split_code(CODE, limit)
+
+    assert "".join(chunks) == CODE
+    assert len(chunks) > 1
+    assert all(len(chunk) <= limit for chunk in chunks)
+    for chunk in chunks[1:]:
+        assert chunk.startswith("def handler_")
+
+
+def test_oversized_definition_split_by_lines():
+    chunks = make_budget().split_code(CODE, limit=40)
+
+    assert "".join(chunks) == CODE
+    assert all(len(chunk) <= 40 for chunk in chunks)
@@ -0,0 +1,45 @@
+import ast
+
+from domain.entities.code_review import IssueType
+from domain.services.rules.default import build_default_registry
+from domain.services.rules.engine import Rule, RuleEngine, RuleFindings
+
+CODE_WITH_SMELLS = """
+class Service:
+    def run(self, a, b, c, d, e, f):
+        try:
+            eval("1 + 1")
+        except Exception:
+            pass
+"""
+
+
+class CountingRule(Rule):
+    node_types = (ast.Call,)
+
+    def __init__(self):
+        self.seen = []
+
+    def check(self, node: ast.AST, findings: RuleFindings) -> None:
+        self.seen.append(type(node))
+
+
+def test_rules_receive_only_registered_node_types():
+    rule = CountingRule()
+    registry = build_default_registry()
+    registry.register(rule)
+
+    RuleEngine(registry).run(ast.parse("print(len([1]))\nx = 1"))
+
+    assert rule.seen == [ast.Call, ast.Call]
+
+
+def test_single_pass_collects_smells_security_and_docs():
+    findings = RuleEngine(build_default_registry()).run(ast.parse(CODE_WITH_SMELLS))
+
+    issue_types = sorted(issue.issue_type.value for issue in findings.issues)
+    assert issue_types == sorted(
+        [IssueType.SMELL.value, IssueType.SMELL.value, IssueType.SECURITY.value]
+    )
+    assert findings.functions_without_docs == ["run"]
+    assert findings.classes_without_docs == ["Service"]
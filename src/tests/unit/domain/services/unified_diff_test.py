@@ -0,0 +1,51 @@
+import difflib
+
+import pytest
+
+from domain.services.unified_diff import PatchError, apply_patch
+
+BASE = "".join(f"x{i} = {i}\n" for i in range(1, 21))
+
+
+def make_diff(old: str, new: str) -> str:
+    return "".join(
+        difflib.unified_diff(
+            old.splitlines(keepends=True),
+            new.splitlines(keepends=True),
+            "a/mod.py",
+            "b/mod.py",
+        )
+    )
+
+
+def test_patch_round_trip_and_changed_lines():
+    new = BASE.replace("x5 = 5\n", "x5 = 50\nx5b = 51\n").replace("x15 = 15\n", "")
+
+    patched = apply_patch(BASE, make_diff(BASE, new))
+
+    assert patched.code == new
+    assert patched.path == "mod.py"
+    assert patched.changed_lines == {5, 6, 16}
+
+
+def test_new_file_from_empty_base():
+    new = "def f():\n    return 1\n"
+
+    patched = apply_patch("", make_diff("", new))
+
+    assert patched.code == new
+    assert patched.changed_lines == {1, 2}
+
+
+def test_missing_newline_at_end_of_file():
+    new = BASE + "tail = 1"
+    diff = make_diff(BASE, new + "\n") + "\\ No newline at end of file\n"
+
+    assert apply_patch(BASE, diff).code == new
+
+
+def test_mismatched_context_rejected():
+    diff = make_diff(BASE, BASE.replace("x3 = 3", "x3 = 30"))
+
+    with pytest.raises(PatchError):
+        apply_patch(BASE.replace("x2 = 2", "x2 = 20"), diff)
@@ -0,0 +1,98 @@
+from domain.entities.code_review import IssueType
+from domain.entities.parsed_source import ParsedSource
+from domain.services.rules.default import build_default_registry
+from domain.services.rules.engine import RuleEngine
+from domain.services.unit_analyzer import UnitAnalyzer
+from domain.services.version_comparator import VersionComparator
+from infra.cache.memory import MemoryCache
+
+ORIGINAL = """import os
+
+
+def load(path):
+    return eval(open(path).read())
+
+
+def save(a, b, c, d, e, f):
+    return a
+
+
+class Store:
+    pass
+"""
+
+IMPROVED = """import os
+
+# загрузка без eval
+
+
+def load(path):
+    import json
+
+    return json.loads(open(path).read())
+
+
+def save(a, b, c, d, e, f):
+    return a
+
+
+class Store:
+    pass
+
+
+def run(cmd):
+    exec(cmd)
+"""
+
+
+def make_comparator() -> VersionComparator:
+    engine = RuleEngine(build_default_registry())
+    return VersionComparator(UnitAnalyzer(engine, MemoryCache(max_size=64)))
+
+
+def test_delta_reports_fixed_and_introduced_issues():
+    delta = make_comparator().compare(ORIGINAL, IMPROVED)
+
+    assert [i.description for i in delta.fixed_issues] == [
+        "Использование eval() небезопасно"
+    ]
+    assert [i.description for i in delta.introduced_issues] == [
+        "Использование exec() небезопасно"
+    ]
+    assert delta.unchanged_issues_count == 1
+    assert delta.score_change == 0
+    assert delta.changed_units == ["def load"]
+    assert delta.added_units == ["def run"]
+    assert delta.removed_units == []
+
+
+def test_unchanged_definitions_are_reused_with_rebased_lines():
+    analyzer = UnitAnalyzer(RuleEngine(build_default_registry()))
+    memo = {}
+    analyzer.analyze(ParsedSource(ORIGINAL), memo)
+
+    results = {r.unit.name: r for r in analyzer.analyze(ParsedSource(IMPROVED), memo)}
+
+    save = results["def save"]
+    assert save.reused is True
+    assert save.findings.issues[0].line_number == (
+        IMPROVED.splitlines().index("def save(a, b, c, d, e, f):") + 1
+    )
+    assert results["def load"].reused is False
+
+
+def test_second_comparison_served_from_cache():
+    comparator = make_comparator()
+    comparator.compare(ORIGINAL, IMPROVED)
+
+    delta = comparator.compare(ORIGINAL, IMPROVED)
+
+    assert delta.analyzed_units == 1
+    assert delta.reused_units == 4
+
+
+def test_syntax_error_in_improved_version_is_introduced():
+    delta = make_comparator().compare(ORIGINAL, "def broken(:\n")
+
+    assert [i.issue_type for i in delta.introduced_issues] == [IssueType.SYNTAX]
+    assert delta.removed_units == ["def load", "def save", "class Store", "<module>"]
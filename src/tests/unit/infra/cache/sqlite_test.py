@@ -0,0 +1,22 @@
+from infra.cache.sqlite import SQLiteCache
+
+
+def test_entries_survive_reopen(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path)
+    cache.set("key", "response")
+    cache.close()
+
+    assert SQLiteCache(path).get("key") == "response"
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_size=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from infra.concurrency.llm_scheduler import (
+    OVERLOADED,
+    RATE_LIMITED,
+    AdmissionRejected,
+    LLMScheduler,
+    TokenBucket,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_at_per_minute_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock)
+
+    bucket.take(60)
+    assert bucket.delay(1) == pytest.approx(1.0)
+
+    clock.now = 30.0
+    assert bucket.available == pytest.approx(30.0)
+    assert bucket.delay(10) == 0.0
+
+
+def test_higher_priority_waiter_gets_freed_slot_first():
+    scheduler = LLMScheduler(
+        max_concurrency=1, priorities={"quick_check": 0}, default_priority=1
+    )
+    order = []
+
+    async def call(operation: str, hold: float):
+        async with scheduler.admit(operation):
+            order.append(operation)
+            await asyncio.sleep(hold)
+
+    async def scenario():
+        running = asyncio.ensure_future(call("full_review", 0.02))
+        await asyncio.sleep(0)
+        queued_review = asyncio.ensure_future(call("full_review", 0))
+        await asyncio.sleep(0)
+        queued_check = asyncio.ensure_future(call("quick_check", 0))
+        await asyncio.gather(running, queued_review, queued_check)
+
+    asyncio.run(scenario())
+    assert order == ["full_review", "quick_check", "full_review"]
+
+
+def test_operation_limit_leaves_slots_for_other_operations():
+    scheduler = LLMScheduler(max_concurrency=3, operation_limits={"full_review": 1})
+
+    async def scenario():
+        async with scheduler.admit("full_review"):
+            second_review = asyncio.ensure_future(
+                _enter(scheduler, "full_review", hold=0)
+            )
+            await asyncio.sleep(0)
+            async with scheduler.admit("quick_check"):
+                stats = scheduler.stats()
+        await second_review
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats["active_by_operation"] == {"full_review": 1, "quick_check": 1}
+    assert stats["queue_depth"] == 1
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=1, max_wait_seconds=1)
+
+    async def scenario():
+        async with scheduler.admit("full_review"):
+            queued = asyncio.ensure_future(_enter(scheduler, "full_review", hold=0))
+            await asyncio.sleep(0)
+            with pytest.raises(AdmissionRejected) as rejected:
+                async with scheduler.admit("full_review"):
+                    pass
+        await queued
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == OVERLOADED
+    assert rejected.retry_after >= 1
+    assert scheduler.stats()["rejected_overloaded"] == 1
+
+
+def test_wait_longer_than_max_wait_is_rejected():
+    scheduler = LLMScheduler(max_concurrency=1, max_wait_seconds=0.01)
+
+    async def scenario():
+        async with scheduler.admit("full_review"):
+            with pytest.raises(AdmissionRejected):
+                async with scheduler.admit("full_review"):
+                    pass
+        # Слот освобождается, а ушедший по таймауту не остается в очереди
+        async with scheduler.admit("full_review"):
+            return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["queue_depth"] == 0
+    assert stats["active"] == 1
+
+
+def test_token_quota_rejects_request_that_cannot_fit_in_max_wait():
+    scheduler = LLMScheduler(tokens_per_minute=1000, max_wait_seconds=1)
+
+    async def scenario():
+        async with scheduler.admit("full_review", tokens=1000):
+            pass
+        async with scheduler.admit("full_review", tokens=500):
+            pass
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        asyncio.run(scenario())
+    assert rejected.value.status_code == RATE_LIMITED
+    assert rejected.value.retry_after == pytest.approx(30, abs=1)
+
+
+def test_overloaded_rejection_refunds_rate_quota():
+    scheduler = LLMScheduler(
+        max_concurrency=1,
+        max_queue=0,
+        requests_per_minute=10,
+        tokens_per_minute=1000,
+    )
+
+    async def scenario():
+        async with scheduler.admit("full_review", tokens=100):
+            with pytest.raises(AdmissionRejected) as rejected:
+                async with scheduler.admit("full_review", tokens=400):
+                    pass
+            assert rejected.value.status_code == OVERLOADED
+            return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["requests_available"] == pytest.approx(9, abs=0.1)
+    assert stats["tokens_available"] == pytest.approx(900, abs=1)
+
+
+async def _enter(scheduler: LLMScheduler, operation: str, hold: float) -> None:
+    async with scheduler.admit(operation):
+        await asyncio.sleep(hold)
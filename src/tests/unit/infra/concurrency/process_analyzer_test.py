@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from domain.entities.parsed_source import ParsedSource
+from infra.concurrency.analysis_executor import AnalysisExecutor
+from infra.concurrency.process_analyzer import (
+    ProcessPoolCodeAnalyzer,
+    build_worker_analyzer,
+)
+
+CODE = (
+    "import os\n"
+    "def f(x):\n"
+    "    try:\n"
+    "        return eval(x)\n"
+    "    except:\n"
+    "        pass\n"
+)
+
+
+@pytest.fixture(scope="module")
+def process_analyzer():
+    analyzer = ProcessPoolCodeAnalyzer(max_workers=1)
+    yield analyzer
+    analyzer.close()
+
+
+def test_results_match_inline_analyzer(process_analyzer: ProcessPoolCodeAnalyzer):
+    local = build_worker_analyzer(88)
+    source = process_analyzer.parse(CODE)
+
+    assert process_analyzer.analyze_syntax(source) == local.analyze_syntax(CODE)
+    assert process_analyzer.check_style(source) == local.check_style(CODE)
+    assert process_analyzer.detect_smells(source) == local.detect_smells(CODE)
+    assert process_analyzer.suggest_improvements(source) == (
+        local.suggest_improvements(CODE)
+    )
+    assert process_analyzer.fingerprint() == local.fingerprint()
+
+
+def test_rule_checks_share_one_round_trip(process_analyzer: ProcessPoolCodeAnalyzer):
+    source = ParsedSource(CODE)
+
+    process_analyzer.detect_smells(source)
+
+    assert set(source.memo("process_results", dict)) == {
+        "syntax",
+        "smells",
+        "improvements",
+    }
+    assert "_parse_result" not in source.__dict__
+
+
+def test_inline_executor_runs_in_caller():
+    executor = AnalysisExecutor(mode="inline")
+
+    assert asyncio.run(executor.run(len, "abc")) == 3
+
+
+def test_unknown_executor_mode_rejected():
+    with pytest.raises(ValueError):
+        AnalysisExecutor(mode="gpu")
@@ -0,0 +1,18 @@
+from infra.concurrency import static_analysis
+from infra.style.inprocess import InProcessStyleChecker
+
+LONG_LINE = "value = compute_something(1, 2)\n"
+
+
+def test_batch_worker_checks_style_in_process_with_configured_line_length(
+    monkeypatch,
+):
+    monkeypatch.setenv("ANALYZER_STYLE_BACKEND", "pool")
+    monkeypatch.setattr(static_analysis, "_full_review_code_tool", None)
+
+    static_analysis.init_worker(20)
+    issues = static_analysis.run_full_review(LONG_LINE)["issues"]
+
+    analyzer = static_analysis._get_full_review_code_tool()._code_analyzer
+    assert isinstance(analyzer._style_checker, InProcessStyleChecker)
+    assert any("E501" in issue["description"] for issue in issues)
@@ -0,0 +1,55 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.config.http import HTTPSettings
+from infra.http.http_client import HTTPClientPool, http2_available
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_reuse_pooled_connection(server_url):
+    pool = HTTPClientPool(HTTPSettings(http2=False, max_connections=4))
+    for _ in range(3):
+        assert pool.client.get(server_url).text == "ok"
+
+    stats = pool.stats()["sync"]
+    assert stats["requests"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["idle_connections"] == 1
+    assert stats["max_connections"] == 4
+    pool.client.close()
+
+
+def test_limits_and_timeouts_come_from_settings():
+    settings = HTTPSettings(
+        max_connections=7, max_keepalive_connections=3, connect_timeout=1.5
+    )
+    client = HTTPClientPool(settings).client
+
+    assert client.timeout.connect == 1.5
+    assert client.timeout.read == settings.timeout
+    assert HTTPClientPool(settings).stats()["http2"] is http2_available()
+    client.close()
@@ -0,0 +1,112 @@
+from domain.entities.review_job import JobStatus
+from infra.jobs.sqlite_store import SQLiteJobStore
+
+
+def test_same_content_hash_returns_existing_job(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+
+    first = store.submit("hash", "x = 1")
+    second = store.submit("hash", "x = 1")
+
+    assert first.id == second.id
+    assert store.stats()["deduplicated"] == 1
+
+
+def test_claim_complete_and_failed_job_is_resubmitted(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    done = store.submit("a", "x = 1")
+    failed = store.submit("b", "y = 2")
+
+    assert store.claim().id == done.id
+    store.complete(done.id, "ok")
+    assert store.claim().id == failed.id
+    store.fail(failed.id, "boom")
+    assert store.claim() is None
+
+    assert store.get(done.id).result == "ok"
+    retried = store.submit("b", "y = 2")
+    assert retried.id == failed.id
+    assert retried.status == JobStatus.QUEUED
+    assert retried.error is None
+
+
+def test_running_jobs_are_recovered_after_lease_expires(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = SQLiteJobStore(path, lease_seconds=0)
+    job = store.submit("hash", "x = 1")
+    store.claim()
+    store.close()
+
+    reopened = SQLiteJobStore(path)
+    assert reopened.recover() == 1
+    claimed = reopened.claim()
+    assert claimed.id == job.id
+    assert claimed.attempts == 2
+
+
+def test_running_job_with_live_lease_is_not_recovered(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    running, restarted = SQLiteJobStore(path), SQLiteJobStore(path)
+    job = running.submit("hash", "x = 1")
+    running.claim()
+
+    assert restarted.recover() == 0
+    assert restarted.claim() is None
+    assert running.renew(job.id)
+    assert not restarted.renew(job.id)
+
+
+def test_expired_lease_moves_job_to_another_worker(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    stalled = SQLiteJobStore(path, lease_seconds=0)
+    other = SQLiteJobStore(path)
+    job = stalled.submit("hash", "x = 1")
+    stalled.claim()
+
+    assert other.claim().id == job.id
+    assert not stalled.complete(job.id, "stale")
+    assert other.complete(job.id, "ok")
+    assert other.get(job.id).result == "ok"
+
+
+def test_deferred_job_waits_until_available(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    job = store.submit("hash", "x = 1")
+    store.claim()
+
+    store.retry_later(job.id, 60)
+
+    assert store.claim() is None
+    assert store.get(job.id).status == JobStatus.QUEUED
+    assert store.get(job.id).attempts == 1
+
+
+def test_defer_does_not_count_attempt(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    job = store.submit("hash", "x = 1")
+    store.claim()
+
+    store.defer(job.id, 0)
+
+    assert store.get(job.id).attempts == 0
+    assert store.claim().attempts == 1
+
+
+def test_job_is_claimed_once_across_connections(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    first, second = SQLiteJobStore(path), SQLiteJobStore(path)
+    first.submit("hash", "x = 1")
+
+    claimed = [first.claim(), second.claim()]
+
+    assert sum(job is not None for job in claimed) == 1
+
+
+def test_duplicate_submit_keeps_every_callback(tmp_path):
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+
+    job = store.submit("hash", "x = 1", callback_url="http://a")
+    store.submit("hash", "x = 1", callback_url="http://b")
+    store.submit("hash", "x = 1", callback_url="http://a")
+
+    assert store.get(job.id).callback_urls == ["http://a", "http://b"]
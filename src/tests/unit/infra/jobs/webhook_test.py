@@ -0,0 +1,41 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from infra.jobs.webhook import WebhookNotifier
+
+
+@pytest.mark.parametrize(
+    ("url", "allowed"),
+    [
+        ("https://ci.example.com/hook", True),
+        ("https://build.ci.example.com/hook", True),
+        ("https://hooks.example.org/review", True),
+        ("http://ci.example.com/hook", False),
+        ("https://evil-ci.example.com.attacker.io/hook", False),
+        ("https://169.254.169.254/latest", False),
+        ("https://example.org/hook", False),
+    ],
+)
+def test_callback_url_must_match_allowlist(url, allowed):
+    notifier = WebhookNotifier(
+        Mock(),
+        allowed_hosts=["*.ci.example.com", "ci.example.com", "hooks.example.org"],
+    )
+
+    assert notifier.is_allowed(url) is allowed
+
+
+def test_empty_allowlist_rejects_every_callback():
+    assert not WebhookNotifier(Mock()).is_allowed("https://ci.example.com/hook")
+
+
+def test_disallowed_url_is_not_requested():
+    http_client = Mock(post=AsyncMock())
+    notifier = WebhookNotifier(http_client, allowed_hosts=["ci.example.com"])
+
+    delivered = asyncio.run(notifier.notify("https://10.0.0.1/hook", {"id": "1"}))
+
+    assert delivered is False
+    http_client.post.assert_not_called()
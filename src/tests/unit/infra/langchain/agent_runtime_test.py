@@ -0,0 +1,38 @@
+import asyncio
+from unittest.mock import Mock
+
+from infra.langchain.agent_runtime import AgentRuntime
+from infra.langchain.llm_provider import LangChainLLMProvider
+
+
+def built_tools(full_review_code_tool: Mock):
+    llm_provider = Mock(spec=LangChainLLMProvider)
+    runtime = AgentRuntime(llm_provider, full_review_code_tool, Mock())
+    runtime.build()
+    (tools,) = llm_provider.setup_agent.call_args.args
+    return runtime, {tool.name: tool for tool in tools}
+
+
+def test_unknown_source_id_is_returned_to_agent_as_tool_error():
+    full_review_code_tool = Mock()
+    _, tools = built_tools(full_review_code_tool)
+    tool = tools["full_review_code_tool"]
+
+    answer = tool.invoke({"source_id": "def f(): pass"})
+    async_answer = asyncio.run(tool.ainvoke({"source_id": "def f(): pass"}))
+
+    assert answer.startswith("Неизвестный source_id")
+    assert async_answer == answer
+    full_review_code_tool.execute.assert_not_called()
+
+
+def test_registered_source_id_is_analyzed():
+    full_review_code_tool = Mock()
+    full_review_code_tool.execute.return_value = "ОТЧЕТ"
+    runtime, tools = built_tools(full_review_code_tool)
+
+    with runtime.sources.registered("x = 1\n") as source_id:
+        answer = tools["full_review_code_tool"].invoke({"source_id": source_id})
+
+    assert answer == "ОТЧЕТ"
+    full_review_code_tool.execute.assert_called_once_with("x = 1\n")
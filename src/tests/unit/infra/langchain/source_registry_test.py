@@ -0,0 +1,19 @@
+import pytest
+
+from infra.langchain.source_registry import SourceRegistry, UnknownSourceError
+
+
+def test_registered_source_resolves_to_code():
+    registry = SourceRegistry()
+
+    with registry.registered("x = 1\n") as source_id:
+        assert registry.resolve(f" {source_id}\n") == "x = 1\n"
+
+    assert len(registry) == 0
+
+
+def test_unknown_source_id_is_rejected():
+    registry = SourceRegistry()
+
+    with pytest.raises(UnknownSourceError):
+        registry.resolve("def f(): pass")
@@ -0,0 +1,69 @@
+from infra.langchain.tier_metrics import TierMetrics
+from infra.metrics.prometheus import PrometheusMetrics
+
+
+def _render(metrics: PrometheusMetrics) -> str:
+    return metrics.render().decode("utf-8")
+
+
+def test_stage_and_request_histograms():
+    metrics = PrometheusMetrics()
+    with metrics.stage("check_style"):
+        pass
+    metrics.observe_request("POST", "/api/v1/code-review/review", 200, 0.3)
+
+    text = _render(metrics)
+    assert 'code_review_stage_duration_seconds_count{stage="check_style"} 1.0' in text
+    assert (
+        'code_review_http_request_duration_seconds_count{method="POST",'
+        'route="/api/v1/code-review/review",status="200"} 1.0'
+    ) in text
+
+
+def test_llm_calls_and_tokens_come_from_tier_metrics():
+    metrics = PrometheusMetrics()
+    tiers = TierMetrics(metrics=metrics)
+    tiers.record("small", "gpt-4o-mini", 0.5, prompt_tokens=120, completion_tokens=30)
+    tiers.record("small", "gpt-4o-mini", 0.1, failed=True)
+
+    text = _render(metrics)
+    assert (
+        'code_review_llm_tokens_total{kind="prompt",model="gpt-4o-mini",'
+        'tier="small"} 120.0'
+    ) in text
+    assert 'outcome="error",tier="small"} 1.0' in text
+    assert tiers.stats()["small"]["calls"] == 2
+
+
+def test_registered_stats_become_counters_and_gauges():
+    metrics = PrometheusMetrics()
+    metrics.register_stats(
+        "analysis_cache",
+        lambda: {
+            "backend": "memory",
+            "size": 2,
+            "hits": 3,
+            "hit_rate": 0.75,
+            "nested": {},
+        },
+        counters=("hits",),
+    )
+    metrics.register_stats("broken", lambda: 1 / 0)
+
+    text = _render(metrics)
+    assert "# TYPE code_review_analysis_cache_hits_total counter" in text
+    assert "code_review_analysis_cache_hits_total 3.0" in text
+    assert "# TYPE code_review_analysis_cache_size gauge" in text
+    assert "hit_rate" not in text
+    assert "backend" not in text
+    assert "code_review_broken" not in text
+
+
+def test_disabled_metrics_ignore_observations():
+    metrics = PrometheusMetrics(enabled=False)
+    metrics.observe_stage("parse", 0.1)
+    metrics.observe_agent_iterations("full_review", 2)
+
+    text = _render(metrics)
+    assert 'stage="parse"' not in text
+    assert 'operation="full_review"' not in text
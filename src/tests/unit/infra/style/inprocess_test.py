@@ -0,0 +1,34 @@
+import pytest
+
+from domain.entities.parsed_source import ParsedSource
+from infra.style.inprocess import InProcessStyleChecker
+
+
+@pytest.fixture
+def style_checker() -> InProcessStyleChecker:
+    return InProcessStyleChecker(max_line_length=88)
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        ("print('hello world')", ["W292: W292 no newline at end of file"]),
+        ("import os\n", ["F401: F401 'os' imported but unused"]),
+        ("import os  # noqa: F401\n", []),
+        ("x=1  # noqa\n", []),
+    ],
+)
+def test_check_matches_flake8_output(
+    style_checker: InProcessStyleChecker, code: str, expected: list
+):
+    issues = style_checker.check(ParsedSource(code))
+
+    assert [issue.description for issue in issues] == expected
+
+
+def test_check_reports_only_syntax_error(style_checker: InProcessStyleChecker):
+    issues = style_checker.check(ParsedSource("print(/'hello world')\nx=1"))
+
+    assert len(issues) == 1
+    assert issues[0].description.startswith("E999: E999 SyntaxError")
+    assert issues[0].line_number == 1
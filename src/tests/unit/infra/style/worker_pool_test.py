@@ -0,0 +1,31 @@
+import pytest
+
+from domain.entities.parsed_source import ParsedSource
+from infra.style.worker_pool import PooledStyleChecker, StyleWorkerPool
+
+
+@pytest.fixture(scope="module")
+def style_worker_pool():
+    pool = StyleWorkerPool(size=1, timeout=30.0)
+    yield pool
+    pool.close()
+
+
+def test_pooled_checker_returns_flake8_issues(style_worker_pool: StyleWorkerPool):
+    issues = PooledStyleChecker(style_worker_pool).check(ParsedSource("x=1\n"))
+
+    assert [issue.description for issue in issues] == [
+        "E225: E225 missing whitespace around operator"
+    ]
+
+
+def test_crashed_worker_is_recycled(style_worker_pool: StyleWorkerPool):
+    style_worker_pool.run("x = 1\n")
+    style_worker_pool._workers[0].process.kill()
+    style_worker_pool._workers[0].process.join()
+
+    diagnostics = style_worker_pool.run("import os\n")
+
+    assert [d.code for d in diagnostics] == ["F401"]
+    assert style_worker_pool.stats()["recycled"] == 1
+    assert style_worker_pool.stats()["alive"] == 1